@@ -2,15 +2,15 @@
  * ResourceOptimizer.jsx
  *
  * Resource Allocation Optimizer — generates 6 scenario variants from a
- * budget + policy focus, simulates each via /abm/simulate, ranks by
- * user-defined priority weights, and surfaces the top pick with a
- * ReportExporter for one-click PDF/markdown export.
+ * budget + policy focus, simulates them as one /abm/sweep job that the
+ * service ranks by the user-defined priority weights, and surfaces the top
+ * pick with a ReportExporter for one-click PDF/markdown export.
  *
  * Props: n (agents), steps — shared with parent Simulation.jsx
  */
 import React, { useState, useRef, useCallback, useEffect } from 'react';
 import { toast } from 'react-hot-toast';
-import { runABMSimulation, getABMProgress, fetchStepResults } from '../../services/simulationApi';
+import { runABMSweep, streamABMSimulation, cancelABMSimulation } from '../../services/simulationApi';
 import ReportExporter from './ReportExporter';
 import ErrorCard from './ErrorCard';
 
@@ -65,54 +65,10 @@ function buildScenarioString(focus, budget, split, splitDef) {
   );
 }
 
-// ─── Metric extraction ────────────────────────────────────────────────────────
-function extractDeltas(mbs) {
-  const unemp = mbs?.unemployment_rate || [];
-  const welf  = mbs?.avg_welfare       || [];
-  const infra = mbs?.infrastructure_score || [];
-  const env   = mbs?.env_score         || [];
-  const first = (a) => a.length ? a[0] : 0;
-  const last  = (a) => a.length ? a[a.length - 1] : 0;
-  return {
-    empDelta:  (1 - last(unemp)) * 100 - (1 - first(unemp)) * 100,
-    welDelta:  last(welf)  - first(welf),
-    infDelta:  last(infra) - first(infra),
-    envDelta:  last(env)   - first(env),
-    empStart:  (1 - first(unemp)) * 100,
-    empFinal:  (1 - last(unemp))  * 100,
-    welStart:  first(welf),  welFinal: last(welf),
-    infStart:  first(infra), infFinal: last(infra),
-    envStart:  first(env),   envFinal: last(env),
-  };
-}
-
-// ─── Composite score ──────────────────────────────────────────────────────────
-// Normalisation rationale (empirical ranges, 120 agents, 20 steps):
-//
-//   empDelta  — already in percentage points          → typical range  10–22 pp
-//   welDelta  — raw 0–1 index delta, × 200            → typical range  19–43 pp
-//               (× 100 gave 9–21 pp — welfare was structurally half the scale
-//                of infra/env, so × 200 corrects the imbalance)
-//   infDelta  — 0–100 score delta, unscaled           → typical range -12 to +17 pp
-//   envDelta  — 0–100 score delta, unscaled           → typical range  -7 to  +8 pp
-//
-// All four normalised values now sit in a broadly comparable range so the
-// user's weight sliders (employment/welfare/infra/env %) are the primary
-// determinant of variant ranking rather than raw metric scale differences.
-function compositeScore(deltas, weights) {
-  const empNorm = deltas.empDelta;           // pp — no rescaling needed
-  const welNorm = deltas.welDelta * 200;     // 0-1 index → comparable pp scale
-  const infNorm = deltas.infDelta;           // 0-100 score — comparable to emp pp
-  const envNorm = deltas.envDelta;           // 0-100 score — comparable to emp pp
-
-  const w = weights;
-  return (
-    (empNorm * w.employment +
-     welNorm * w.welfare    +
-     infNorm * w.infrastructure +
-     envNorm * w.environment) / 100
-  );
-}
+// ─── Scoring ──────────────────────────────────────────────────────────────────
+// Metric deltas and the composite score are computed by the simulation
+// service (simulation_service/abm_sweep.py): employment in pp, welfare
+// delta × 200, infra / env score deltas unscaled, weighted by the sliders.
 
 // ─── Small sub-components ─────────────────────────────────────────────────────
 function WeightSlider({ label, color, value, onChange, disabled }) {
@@ -276,7 +232,8 @@ const ResourceOptimizer = ({ n, steps }) => {
   const [progress,  setProgress]  = useState([]);   // per-variant progress text
   const [error,     setError]     = useState('');
 
-  const pollRefs = useRef([]);
+  const closeStreamRef = useRef(null);
+  const sweepIdRef     = useRef(null);
 
   // Clamp all weights so they sum to 100 when one slider moves
   const handleWeightChange = (key, val) => {
@@ -300,14 +257,14 @@ const ResourceOptimizer = ({ n, steps }) => {
 
   // ── Unmount cleanup ────────────────────────────────────────────────────────
   // Runs once on mount; the returned function fires on unmount.
-  // Clears every active polling interval so navigating away mid-run
-  // does not leave ghost polls continuing to hit the backend.
+  // Closes the sweep's progress stream and cancels the sweep itself so
+  // navigating away mid-run does not leave the backend computing for nobody.
   useEffect(() => {
     return () => {
-      pollRefs.current.forEach(id => {
-        if (id != null) clearInterval(id);
-      });
-      pollRefs.current = [];
+      closeStreamRef.current?.();
+      closeStreamRef.current = null;
+      if (sweepIdRef.current) cancelABMSimulation(sweepIdRef.current).catch(() => {});
+      sweepIdRef.current = null;
     };
   }, []);
 
@@ -318,82 +275,76 @@ const ResourceOptimizer = ({ n, steps }) => {
     setRunning(true);
     setProgress(SPLITS.map((s, i) => ({ idx: i, status: 'queued', pct: 0, name: s.name })));
 
-    // Stop any lingering polls
-    pollRefs.current.forEach(id => clearInterval(id));
-    pollRefs.current = [];
-
-    const results = await Promise.allSettled(
-      SPLITS.map(async (splitDef, idx) => {
-        const scenario = buildScenarioString(focus, budget, splitDef.ratio, splitDef);
-
-        // Update progress: launching
-        setProgress(prev => {
-          const next = [...prev];
-          next[idx] = { ...next[idx], status: 'running', pct: 0 };
-          return next;
-        });
-
-        // Start ABM run
-        const data = await runABMSimulation(n, scenario, steps, 1);
-        const simId = data.simulation_id;
-
-        // Poll to completion
-        const mbs = await new Promise((resolve, reject) => {
-          const interval = setInterval(async () => {
-            try {
-              const prog = await getABMProgress(simId);
-              setProgress(prev => {
-                const next = [...prev];
-                next[idx] = { ...next[idx], status: prog.status, pct: prog.pct };
-                return next;
-              });
-              if (prog.status === 'complete') {
-                clearInterval(interval);
-                // Null the slot so it doesn't accumulate across re-runs.
-                pollRefs.current[idx] = null;
-                const raw = await fetchStepResults(simId);
-                const m   = raw?.results?.mean_by_step || raw?.mean_by_step;
-                resolve(m);
-              } else if (prog.status === 'error') {
-                clearInterval(interval);
-                // Null the slot so it doesn't accumulate across re-runs.
-                pollRefs.current[idx] = null;
-                reject(new Error('Simulation error'));
-              }
-            } catch (e) { /* transient, keep polling */ }
-          }, 900);
-          pollRefs.current[idx] = interval;
+    // Stop any lingering stream (and the sweep behind it)
+    closeStreamRef.current?.();
+    closeStreamRef.current = null;
+    if (sweepIdRef.current) cancelABMSimulation(sweepIdRef.current).catch(() => {});
+    sweepIdRef.current = null;
+
+    const scenarios = SPLITS.map(splitDef =>
+      buildScenarioString(focus, budget, splitDef.ratio, splitDef));
+
+    try {
+      // One sweep job for all variants; identical configs are run once
+      const sweep = await runABMSweep(
+        n,
+        SPLITS.map((splitDef, idx) => ({ name: splitDef.name, scenario: scenarios[idx] })),
+        steps,
+        weights,
+        1,
+      );
+
+      sweepIdRef.current = sweep.simulation_id;
+
+      // Unique runs execute in order, so each variant's share of the
+      // overall progress is the block of steps_per_run steps for its run.
+      const runOf = sweep.variants.map(v => v.run);
+      const showProgress = (prog) => {
+        setProgress(prev => prev.map((p, idx) => {
+          const done = prog.steps_done - runOf[idx] * sweep.steps_per_run;
+          const pct  = Math.min(100, Math.max(0, done / sweep.steps_per_run * 100));
+          const status = pct >= 100 ? 'complete' : pct > 0 ? 'running' : 'queued';
+          return { ...p, status, pct };
+        }));
+      };
+
+      const results = await new Promise((resolve, reject) => {
+        closeStreamRef.current = streamABMSimulation(sweep.simulation_id, {
+          onProgress: showProgress,
+          onComplete: (payload) => {
+            closeStreamRef.current = null;
+            showProgress(payload);
+            resolve(payload.results);
+          },
+          onError: (err) => {
+            closeStreamRef.current = null;
+            reject(new Error(err?.error || err?.message || 'Simulation error'));
+          },
         });
+      });
 
-        const deltas = extractDeltas(mbs);
-        const score  = compositeScore(deltas, weights);
+      // Ranked server-side by composite score, best first
+      const ranked = results.ranked.map(v => {
+        const idx = SPLITS.findIndex(s => s.name === v.name);
         return {
           idx,
-          name:     splitDef.name,
-          split:    splitDef.ratio,
-          scenario,
-          mbs,
-          deltas,
-          score,
+          name:     v.name,
+          split:    SPLITS[idx].ratio,
+          scenario: scenarios[idx],
+          mbs:      v.mean_by_step,
+          deltas:   v.deltas,
+          score:    v.score,
         };
-      })
-    );
-
-    // Collect successful variants, rank by score desc
-    const ranked = results
-      .filter(r => r.status === 'fulfilled')
-      .map(r => r.value)
-      .sort((a, b) => b.score - a.score);
-
-    if (ranked.length === 0) {
-      setError('All variant simulations failed. Check that the simulation service is running on port 8003.');
-    } else {
-      if (ranked.length < SPLITS.length) {
-        toast(`${SPLITS.length - ranked.length} variant(s) failed — showing ${ranked.length} results.`);
-      } else {
-        toast.success('Optimization complete! Results ranked below.');
-      }
+      });
+      sweepIdRef.current = null;
+      toast.success('Optimization complete! Results ranked below.');
       setVariants(ranked);
+    } catch (e) {
+      sweepIdRef.current = null;
+      setError(
+        `Optimizer sweep failed (${e.message}). ` +
+        'Check that the simulation service is running on port 8003.'
+      );
     }
     setRunning(false);
   }, [budget, focus, weights, n, steps]);
@@ -502,7 +453,7 @@ const ResourceOptimizer = ({ n, steps }) => {
           ? (
             <span style={{ display: 'flex', alignItems: 'center', justifyContent: 'center', gap: '0.6rem' }}>
               <span className="spinner" style={{ width: 18, height: 18, borderTopColor: 'white' }} />
-              Running {SPLITS.length} variants in parallel…
+              Running {SPLITS.length} variants as one sweep…
             </span>
           )
           : `⚡ Run optimizer — ${SPLITS.length} variants`}
@@ -7,7 +7,7 @@ import {
 } from 'chart.js';
 import { Line } from 'react-chartjs-2';
 import {
-  runABMSimulation, getABMProgress, fetchStepResults,
+  runABMSimulation, streamABMSimulation,
   getSimulationHistory,
 } from '../../services/simulationApi';
 import SimulationCompare from './SimulationCompare';
@@ -307,8 +307,8 @@ const Simulation = () => {
   // Chart refs — one per metric, used for imperative updates
   const chartRefs = useRef(METRICS.map(() => React.createRef()));
 
-  // Polling interval ref
-  const pollRef = useRef(null);
+  // Close function of the live SSE stream
+  const closeStreamRef = useRef(null);
 
   // Abort controller ref for the in-flight consequence fetch.
   // Stored in a ref (not state) so the cleanup closure always sees the latest value.
@@ -386,94 +386,93 @@ const Simulation = () => {
     setPrevValues(METRICS.map(() => null));
   }, []);
 
-  // ── Polling loop ──────────────────────────────────────────────────────────
+  // ── Live stream ───────────────────────────────────────────────────────────
   // Starts when simulationId is set and loading=true.
-  // Polls every 800ms. On each tick:
-  //   - checks steps_done > renderedSteps
-  //   - fetches partial results
-  //   - pushes only new points via pushNewSteps()
+  // Subscribes to the run's SSE stream. Each `frames` event carries only the
+  // steps produced since the previous one; they are appended to a local
+  // per-metric series and pushed onto the charts via pushNewSteps(), so the
+  // payload per update stays the size of the new steps, not of the run.
   useEffect(() => {
     if (!simulationId || !loading) return;
-    clearInterval(pollRef.current);
-
-    pollRef.current = setInterval(async () => {
-      try {
-        const prog = await getABMProgress(simulationId);
-        setProgress(prog);
-
-        // V3: only fetch results if new steps have arrived
-        if (prog.steps_done > renderedStepsRef.current) {
-          const raw = await fetchStepResults(simulationId);
-          // Handle both shapes: { results: { mean_by_step } } or { mean_by_step }
-          const mbs = raw?.results?.mean_by_step || raw?.mean_by_step;
-          if (mbs) pushNewSteps(mbs, prog.steps_done);
-        }
-
-        if (prog.status === 'complete') {
-          clearInterval(pollRef.current);
-          // Final sweep — ensure all steps are rendered
-          const finalRaw = await fetchStepResults(simulationId);
-          const mbs = finalRaw?.results?.mean_by_step || finalRaw?.mean_by_step;
-          if (mbs) {
-            pushNewSteps(mbs, prog.total_steps);
-            setMeanByStep(mbs);
-
-            // V8: consequence fetch — parent-owned, AbortController-guarded
-            // Abort any previous in-flight request before starting a new one.
-            if (consequenceAbortRef.current) consequenceAbortRef.current.abort();
-            const controller = new AbortController();
-            consequenceAbortRef.current = controller;
-
-            // 25-second hard timeout: abort the fetch if Gemini hangs.
-            const abortTimer = setTimeout(() => controller.abort(), 25_000);
-
-            setConsequenceLoading(true);
-            setConsequenceError('');
-            fetch(`${SIM_API}/analyse/consequences`, {
-              method:  'POST',
-              headers: { 'Content-Type': 'application/json' },
-              signal:  controller.signal,
-              body: JSON.stringify({
-                scenario:     runScenarioRef.current || '',
-                n_steps:      prog.total_steps,
-                n_agents:     nRef.current || 120,
-                mean_by_step: mbs,
-              }),
+    closeStreamRef.current?.();
+
+    const series = {};
+    const progressOf = ({ status, steps_done, total_steps, pct }) => ({ status, steps_done, total_steps, pct });
+
+    closeStreamRef.current = streamABMSimulation(simulationId, {
+      onFrames: (payload) => {
+        setProgress(progressOf(payload));
+        Object.entries(payload.frames.metrics).forEach(([name, values]) => {
+          (series[name] ||= []).push(...values);
+        });
+        pushNewSteps(series, payload.next_since_step);
+      },
+      onComplete: (prog) => {
+        closeStreamRef.current = null;
+        setProgress(progressOf(prog));
+        // Final sweep — the cross-seed mean over the whole run
+        const mbs = prog.results?.mean_by_step || series;
+        if (mbs) {
+          pushNewSteps(mbs, prog.total_steps);
+          setMeanByStep(mbs);
+
+          // V8: consequence fetch — parent-owned, AbortController-guarded
+          // Abort any previous in-flight request before starting a new one.
+          if (consequenceAbortRef.current) consequenceAbortRef.current.abort();
+          const controller = new AbortController();
+          consequenceAbortRef.current = controller;
+
+          // 25-second hard timeout: abort the fetch if Gemini hangs.
+          const abortTimer = setTimeout(() => controller.abort(), 25_000);
+
+          setConsequenceLoading(true);
+          setConsequenceError('');
+          fetch(`${SIM_API}/analyse/consequences`, {
+            method:  'POST',
+            headers: { 'Content-Type': 'application/json' },
+            signal:  controller.signal,
+            body: JSON.stringify({
+              scenario:     runScenarioRef.current || '',
+              n_steps:      prog.total_steps,
+              n_agents:     nRef.current || 120,
+              mean_by_step: mbs,
+            }),
+          })
+            .then(r => r.ok ? r.json() : Promise.reject(`HTTP ${r.status}`))
+            .then(data => {
+              setConsequenceResult(data);
+              setConsequenceLoading(false);
+            })
+            .catch(err => {
+              // AbortError fires both on timeout and on unmount — show
+              // a clear message only for the timeout case (controller not
+              // yet nulled); unmount case is silenced as component is gone.
+              if (err?.name === 'AbortError') {
+                setConsequenceError('Analysis timed out — try again');
+              } else {
+                setConsequenceError(String(err));
+              }
+              setConsequenceLoading(false);
             })
-              .then(r => r.ok ? r.json() : Promise.reject(`HTTP ${r.status}`))
-              .then(data => {
-                setConsequenceResult(data);
-                setConsequenceLoading(false);
-              })
-              .catch(err => {
-                // AbortError fires both on timeout and on unmount — show
-                // a clear message only for the timeout case (controller not
-                // yet nulled); unmount case is silenced as component is gone.
-                if (err?.name === 'AbortError') {
-                  setConsequenceError('Analysis timed out — try again');
-                } else {
-                  setConsequenceError(String(err));
-                }
-                setConsequenceLoading(false);
-              })
-              .finally(() => {
-                // Cancel the timer so it doesn’t fire after a fast response.
-                clearTimeout(abortTimer);
-              });
-          }
-          setLoading(false);
-          toast.success('Simulation complete!');
-          loadHistory();
-        } else if (prog.status === 'error') {
-          clearInterval(pollRef.current);
-          setLoading(false);
-          setError(prog.error || 'Simulation encountered a server error.');
+            .finally(() => {
+              // Cancel the timer so it doesn’t fire after a fast response.
+              clearTimeout(abortTimer);
+            });
         }
-      } catch (_) { /* swallow transient network errors */ }
-    }, 800);
+        setLoading(false);
+        toast.success('Simulation complete!');
+        loadHistory();
+      },
+      onError: (err) => {
+        closeStreamRef.current = null;
+        setLoading(false);
+        setError(err?.error || err?.message || 'Simulation encountered a server error.');
+      },
+    });
 
     return () => {
-      clearInterval(pollRef.current);
+      closeStreamRef.current?.();
+      closeStreamRef.current = null;
     };
   }, [simulationId, loading, pushNewSteps]);
 
@@ -486,7 +485,7 @@ const Simulation = () => {
 
   // ── Run handler ───────────────────────────────────────────────────────────
   // Fix 3: no inline result ingest. POST returns only simulation_id + status='started'.
-  // The polling loop drives all data — handleRun just fires and forgets.
+  // The live stream drives all data — handleRun just fires and forgets.
   const handleRun = async () => {
     setError('');
     clearCharts();              // V3: reset cursor + wipe chart data
@@ -498,13 +497,13 @@ const Simulation = () => {
     setConsequenceLoading(false);
     setLoading(true);
     setRunScenario(scenario);
-    setSimulationId(null);      // clear old ID so polling useEffect re-fires
+    setSimulationId(null);      // clear old ID so the stream useEffect re-fires
 
     try {
       const data = await runABMSimulation(n, scenario, steps, 1);
       // Fix 3: backend now returns { simulation_id, status: 'started' } — no results key.
       // If somehow results ARE included (fast/legacy run), we ignore them here.
-      // Polling always drives chart updates.
+      // The stream always drives chart updates.
       setSimulationId(data.simulation_id);
       setInterpretedParams(data.interpreted_params || {});
     } catch (err) {
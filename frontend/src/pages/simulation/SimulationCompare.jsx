@@ -11,7 +11,7 @@ import {
 } from 'chart.js';
 import { Line } from 'react-chartjs-2';
 import {
-  runABMSimulation, getABMProgress, fetchStepResults,
+  runABMSimulation, streamABMSimulation,
 } from '../../services/simulationApi';
 import ConsequencePanel from './ConsequencePanel';
 import ReportExporter from './ReportExporter';
@@ -211,9 +211,9 @@ const SimulationCompare = ({ n, steps }) => {
   const seriesA = useRef(METRICS.map(() => []));
   const seriesB = useRef(METRICS.map(() => []));
 
-  // Two independent interval refs — A and B never share a clearInterval call
-  const pollRefA = useRef(null);
-  const pollRefB = useRef(null);
+  // Two independent stream-close refs — A and B never share a close call
+  const streamRefA = useRef(null);
+  const streamRefB = useRef(null);
   const simIdA   = useRef(null);
   const simIdB   = useRef(null);
   const doneA    = useRef(false);
@@ -276,9 +276,11 @@ const SimulationCompare = ({ n, steps }) => {
     setDiverg(result);
   }, []);
 
-  // ── Polling ────────────────────────────────────────────────────────────
-  // Each sim gets its own independent interval stored in its own ref.
-  // An error or completion in A never touches pollRefB and vice versa.
+  // ── Live streams ───────────────────────────────────────────────────────
+  // Each sim gets its own SSE stream, closed through its own ref.
+  // An error or completion in A never touches streamRefB and vice versa.
+  // `frames` events carry only the steps since the previous event; they are
+  // appended to a per-sim series, so no update re-sends the whole run.
 
   // Helper: check if both sims are done and fire shared post-run logic once.
   const checkBothDone = useCallback(() => {
@@ -289,122 +291,94 @@ const SimulationCompare = ({ n, steps }) => {
     }
   }, [computeDivergence]);
 
-  const startPolling = useCallback(() => {
-    // ── Sim A interval ────────────────────────────────────────────────────
-    clearInterval(pollRefA.current);
-    pollRefA.current = setInterval(async () => {
-      try {
-        if (doneA.current) return;
-        const pA = await getABMProgress(simIdA.current);
-        setProgA(pA);
-
-        if (pA.steps_done > renderedA.current) {
-          const raw = await fetchStepResults(simIdA.current);
-          const mbs = raw?.results?.mean_by_step || raw?.mean_by_step;
-          if (mbs) pushSteps(mbs, pA.steps_done, 0, renderedA, seriesA);
-        }
-
-        if (pA.status === 'complete') {
-          clearInterval(pollRefA.current);
-          pollRefA.current = null;
-          doneA.current = true;
-          const raw = await fetchStepResults(simIdA.current);
-          const mbs = raw?.results?.mean_by_step || raw?.mean_by_step;
-          if (mbs) {
-            pushSteps(mbs, pA.total_steps, 0, renderedA, seriesA);
-            setFinalA(METRICS.map(m => m.derive(mbs, pA.total_steps - 1)));
-            setMbsA(mbs);
-            setConsLoadingA(true); setConsErrorA('');
-            
-            if (consAbortRefA.current) consAbortRefA.current.abort();
-            const controllerA = new AbortController();
-            consAbortRefA.current = controllerA;
-            const timerA = setTimeout(() => controllerA.abort(), 25_000);
-
-            fetch(`${SIM_API}/analyse/consequences`, {
-              method: 'POST', headers: { 'Content-Type': 'application/json' },
-              signal: controllerA.signal,
-              body: JSON.stringify({ scenario: scenarioA, n_steps: pA.total_steps, n_agents: n, mean_by_step: mbs }),
-            })
-              .then(r => r.ok ? r.json() : Promise.reject(`HTTP ${r.status}`))
-              .then(d => { setConsResultA(d); setConsLoadingA(false); })
-              .catch(e => {
-                if (e?.name === 'AbortError') setConsErrorA('Analysis timed out — try again');
-                else setConsErrorA(String(e));
-                setConsLoadingA(false);
-              })
-              .finally(() => clearTimeout(timerA));
-          }
-          checkBothDone();
-        } else if (pA.status === 'error') {
-          // Stop A's interval only — B continues unaffected
-          clearInterval(pollRefA.current);
-          pollRefA.current = null;
-          doneA.current = true;
-          setProgA(prev => ({ ...prev, status: 'error' }));
-          checkBothDone();
-        }
-      } catch (_) { /* swallow transient network error, keep polling */ }
-    }, 800);
-
-    // ── Sim B interval ────────────────────────────────────────────────────
-    clearInterval(pollRefB.current);
-    pollRefB.current = setInterval(async () => {
-      try {
-        if (doneB.current) return;
-        const pB = await getABMProgress(simIdB.current);
-        setProgB(pB);
-
-        if (pB.steps_done > renderedB.current) {
-          const raw = await fetchStepResults(simIdB.current);
-          const mbs = raw?.results?.mean_by_step || raw?.mean_by_step;
-          if (mbs) pushSteps(mbs, pB.steps_done, 1, renderedB, seriesB);
-        }
-
-        if (pB.status === 'complete') {
-          clearInterval(pollRefB.current);
-          pollRefB.current = null;
-          doneB.current = true;
-          const raw = await fetchStepResults(simIdB.current);
-          const mbs = raw?.results?.mean_by_step || raw?.mean_by_step;
-          if (mbs) {
-            pushSteps(mbs, pB.total_steps, 1, renderedB, seriesB);
-            setFinalB(METRICS.map(m => m.derive(mbs, pB.total_steps - 1)));
-            setMbsB(mbs);
-            setConsLoadingB(true); setConsErrorB('');
-            
-            if (consAbortRefB.current) consAbortRefB.current.abort();
-            const controllerB = new AbortController();
-            consAbortRefB.current = controllerB;
-            const timerB = setTimeout(() => controllerB.abort(), 25_000);
-
-            fetch(`${SIM_API}/analyse/consequences`, {
-              method: 'POST', headers: { 'Content-Type': 'application/json' },
-              signal: controllerB.signal,
-              body: JSON.stringify({ scenario: scenarioB, n_steps: pB.total_steps, n_agents: n, mean_by_step: mbs }),
-            })
-              .then(r => r.ok ? r.json() : Promise.reject(`HTTP ${r.status}`))
-              .then(d => { setConsResultB(d); setConsLoadingB(false); })
-              .catch(e => {
-                if (e?.name === 'AbortError') setConsErrorB('Analysis timed out — try again');
-                else setConsErrorB(String(e));
-                setConsLoadingB(false);
-              })
-              .finally(() => clearTimeout(timerB));
-          }
-          checkBothDone();
-        } else if (pB.status === 'error') {
-          // Stop B's interval only — A continues unaffected
-          clearInterval(pollRefB.current);
-          pollRefB.current = null;
-          doneB.current = true;
-          setProgB(prev => ({ ...prev, status: 'error' }));
-          checkBothDone();
-        }
-      } catch (_) { /* swallow transient network error, keep polling */ }
-    }, 800);
+  // Follow one sim's stream onto dataset dsIdx; onDone(mbs, totalSteps)
+  // receives the final mean_by_step.
+  const followSim = useCallback((simId, dsIdx, renderedRef, seriesRef, setProg, doneRef, onDone) => {
+    const series = {};
+    const progressOf = ({ status, steps_done, total_steps, pct }) => ({ status, steps_done, total_steps, pct });
+    return streamABMSimulation(simId, {
+      onFrames: (payload) => {
+        setProg(progressOf(payload));
+        Object.entries(payload.frames.metrics).forEach(([name, values]) => {
+          (series[name] ||= []).push(...values);
+        });
+        pushSteps(series, payload.next_since_step, dsIdx, renderedRef, seriesRef);
+      },
+      onComplete: (prog) => {
+        setProg(progressOf(prog));
+        doneRef.current = true;
+        const mbs = prog.results?.mean_by_step || series;
+        pushSteps(mbs, prog.total_steps, dsIdx, renderedRef, seriesRef);
+        onDone(mbs, prog.total_steps);
+        checkBothDone();
+      },
+      onError: () => {
+        // Only this sim stops — the other one continues unaffected
+        doneRef.current = true;
+        setProg(prev => ({ ...prev, status: 'error' }));
+        checkBothDone();
+      },
+    });
   }, [pushSteps, checkBothDone]);
 
+  const startStreams = useCallback(() => {
+    // ── Sim A stream ──────────────────────────────────────────────────────
+    streamRefA.current?.();
+    streamRefA.current = followSim(simIdA.current, 0, renderedA, seriesA, setProgA, doneA, (mbs, totalSteps) => {
+      streamRefA.current = null;
+      setFinalA(METRICS.map(m => m.derive(mbs, totalSteps - 1)));
+      setMbsA(mbs);
+      setConsLoadingA(true); setConsErrorA('');
+
+      if (consAbortRefA.current) consAbortRefA.current.abort();
+      const controllerA = new AbortController();
+      consAbortRefA.current = controllerA;
+      const timerA = setTimeout(() => controllerA.abort(), 25_000);
+
+      fetch(`${SIM_API}/analyse/consequences`, {
+        method: 'POST', headers: { 'Content-Type': 'application/json' },
+        signal: controllerA.signal,
+        body: JSON.stringify({ scenario: scenarioA, n_steps: totalSteps, n_agents: n, mean_by_step: mbs }),
+      })
+        .then(r => r.ok ? r.json() : Promise.reject(`HTTP ${r.status}`))
+        .then(d => { setConsResultA(d); setConsLoadingA(false); })
+        .catch(e => {
+          if (e?.name === 'AbortError') setConsErrorA('Analysis timed out — try again');
+          else setConsErrorA(String(e));
+          setConsLoadingA(false);
+        })
+        .finally(() => clearTimeout(timerA));
+    });
+
+    // ── Sim B stream ──────────────────────────────────────────────────────
+    streamRefB.current?.();
+    streamRefB.current = followSim(simIdB.current, 1, renderedB, seriesB, setProgB, doneB, (mbs, totalSteps) => {
+      streamRefB.current = null;
+      setFinalB(METRICS.map(m => m.derive(mbs, totalSteps - 1)));
+      setMbsB(mbs);
+      setConsLoadingB(true); setConsErrorB('');
+
+      if (consAbortRefB.current) consAbortRefB.current.abort();
+      const controllerB = new AbortController();
+      consAbortRefB.current = controllerB;
+      const timerB = setTimeout(() => controllerB.abort(), 25_000);
+
+      fetch(`${SIM_API}/analyse/consequences`, {
+        method: 'POST', headers: { 'Content-Type': 'application/json' },
+        signal: controllerB.signal,
+        body: JSON.stringify({ scenario: scenarioB, n_steps: totalSteps, n_agents: n, mean_by_step: mbs }),
+      })
+        .then(r => r.ok ? r.json() : Promise.reject(`HTTP ${r.status}`))
+        .then(d => { setConsResultB(d); setConsLoadingB(false); })
+        .catch(e => {
+          if (e?.name === 'AbortError') setConsErrorB('Analysis timed out — try again');
+          else setConsErrorB(String(e));
+          setConsLoadingB(false);
+        })
+        .finally(() => clearTimeout(timerB));
+    });
+  }, [followSim, scenarioA, scenarioB, n]);
+
   // Unmount-only cleanup for consequence AbortControllers
   useEffect(() => {
     return () => {
@@ -439,7 +413,7 @@ const SimulationCompare = ({ n, steps }) => {
       ]);
       simIdA.current = dataA.simulation_id;
       simIdB.current = dataB.simulation_id;
-      startPolling();
+      startStreams();
     } catch (err) {
       setLoading(false);
       setError(err.message || 'Failed to start comparison.');
@@ -449,8 +423,8 @@ const SimulationCompare = ({ n, steps }) => {
 
   // Cleanup on unmount — both refs cleared independently
   useEffect(() => () => {
-    clearInterval(pollRefA.current);
-    clearInterval(pollRefB.current);
+    streamRefA.current?.();
+    streamRefB.current?.();
   }, []);
 
   const bothDone = doneA.current && doneB.current;
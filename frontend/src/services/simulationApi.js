@@ -37,6 +37,47 @@ export async function runABMSimulation(nAgents, scenario, steps, nRuns = 1) {
   return res.json();
 }
 
+/**
+ * Start a parameter sweep: every variant simulated as one server-side job
+ * (identical configs deduplicated) and ranked by the priority weights.
+ * Follow it with streamABMSimulation(); the `complete` event's results
+ * carry `ranked` — variants best first with `rank`, `score`, `deltas`
+ * and `mean_by_step`.
+ *
+ * @param {number} nAgents
+ * @param {Array<{name: string, scenario?: string}>} variants - named scenarios / lever overrides
+ * @param {number} steps
+ * @param {{employment, welfare, infrastructure, environment}} weights - percentages
+ * @param {number} [nRuns=1] - seeds per variant (shared across variants)
+ * @returns {{ simulation_id, n_variants, n_unique_runs, steps_per_run, variants }}
+ */
+export async function runABMSweep(nAgents, variants, steps, weights, nRuns = 1) {
+  const body = {
+    base: {
+      n_workers: parseInt(nAgents, 10),
+      n_steps: parseInt(steps, 10),
+      n_runs: parseInt(nRuns, 10),
+      n_firms: Math.max(3, Math.round(nAgents / 15)),
+      n_households: Math.max(5, Math.round(nAgents / 3)),
+    },
+    variants,
+    weights,
+  };
+
+  const res = await fetch(`${BASE_URL}/abm/sweep`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(body),
+  });
+
+  if (!res.ok) {
+    const err = await res.json().catch(() => ({ detail: res.statusText }));
+    throw new Error(err.detail || `HTTP ${res.status}`);
+  }
+
+  return res.json();
+}
+
 /**
  * Fetch ABM simulation progress.
  * @param {string} simulationId
@@ -64,6 +105,86 @@ export async function fetchStepResults(simulationId) {
   return res.json();
 }
 
+/**
+ * Fetch progress plus only the step frames produced after `sinceStep`.
+ * Pass the returned `next_since_step` as `sinceStep` on the next poll so
+ * each response carries just the new frames.
+ *
+ * Response shape:
+ *   { status, steps_done, total_steps, pct, since_step, next_since_step,
+ *     frames: { steps, seeds, seed_steps, metrics: { <metric>: [...] } },
+ *     results? }   // results (final aggregate) only once status is complete
+ *
+ * @param {string} simulationId
+ * @param {number} [sinceStep=0]
+ */
+export async function fetchStepFrames(simulationId, sinceStep = 0) {
+  const res = await fetch(`${BASE_URL}/results/${simulationId}?since_step=${sinceStep}`);
+  if (!res.ok) throw new Error(`Results fetch failed: ${res.status}`);
+  return res.json();
+}
+
+/**
+ * Subscribe to the server-push (SSE) stream of a running ABM simulation
+ * instead of polling progress + results.
+ *
+ * Handlers:
+ *   onFrames(payload)   — same shape as fetchStepFrames(), without results
+ *   onProgress(payload) — { status, steps_done, total_steps, pct } for runs
+ *                         without step frames (variant batches, sweeps)
+ *   onComplete(payload) — { status, steps_done, total_steps, pct, results }
+ *   onError(errorOrProgress) — also called when the run is cancelled
+ *
+ * @param {string} simulationId
+ * @param {{ onFrames?: Function, onProgress?: Function, onComplete?: Function, onError?: Function }} handlers
+ * Each `frames` event carries its `next_since_step` as the SSE id, so when
+ * the connection drops EventSource reconnects on its own and the server
+ * resumes after the last frames delivered (Last-Event-ID), not `sinceStep`.
+ *
+ * @param {number} [sinceStep=0] - resume after this global step
+ * @returns {() => void} close function
+ */
+export function streamABMSimulation(simulationId, handlers = {}, sinceStep = 0) {
+  const { onFrames, onProgress, onComplete, onError } = handlers;
+  const source = new EventSource(
+    `${BASE_URL}/abm/simulate/${simulationId}/stream?since_step=${sinceStep}`,
+  );
+  source.addEventListener('frames', (e) => onFrames?.(JSON.parse(e.data)));
+  source.addEventListener('progress', (e) => onProgress?.(JSON.parse(e.data)));
+  source.addEventListener('complete', (e) => {
+    source.close();
+    onComplete?.(JSON.parse(e.data));
+  });
+  source.addEventListener('cancelled', (e) => {
+    source.close();
+    onError?.(JSON.parse(e.data));
+  });
+  source.addEventListener('error', (e) => {
+    // Server-sent "error" events carry data; transport errors do not.  After
+    // a transport error the browser retries by itself (readyState CONNECTING),
+    // resuming via Last-Event-ID; only a source it gave up on is reported.
+    if (e.data) {
+      source.close();
+      onError?.(JSON.parse(e.data));
+    } else if (source.readyState === EventSource.CLOSED) {
+      onError?.(new Error('Simulation stream closed'));
+    }
+  });
+  return () => source.close();
+}
+
+/**
+ * Cancel a queued or running ABM job (simulation, variant batch or sweep).
+ * A running job stops before its next step.
+ * @param {string} simulationId
+ * @returns {{ simulation_id, status }}  status: cancelled | cancelling | <final status>
+ */
+export async function cancelABMSimulation(simulationId) {
+  const res = await fetch(`${BASE_URL}/abm/simulate/${simulationId}`, { method: 'DELETE' });
+  if (!res.ok) throw new Error(`Cancel failed: ${res.status}`);
+  return res.json();
+}
+
 /**
  * Fetch the full result of a completed ABM simulation.
  * @param {string} simulationId
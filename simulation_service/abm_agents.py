@@ -2,38 +2,67 @@
 
 from __future__ import annotations
 
-import random
 from mesa import Agent
 
 
 class Worker(Agent):
-    """Worker agent with employment state and income dynamics."""
+    """Worker agent with employment state and income dynamics.
+
+    ``employed`` and ``income`` are properties: every change is reported to
+    ``model.labour`` (a LabourAggregates) so model-level rates stay O(1).
+    """
 
     # Probability of losing a job each step (layoffs / churn / automation).
     JOB_LOSS_PROB: float = 0.05  # 5% per step keeps the market dynamic
 
     def __init__(self, model, employed: bool | None = None):
         super().__init__(model)
+        rng = model.random
         # Workers start with ~40% unemployed so the ABM begins with a
         # realistic slack labour market and churn keeps it dynamic.
-        self.employed = employed if employed is not None else random.random() < 0.60
-        self.base_income = random.uniform(900.0, 1300.0)
-        self.skill = random.uniform(0.3, 1.0)
-        self.income = self.base_income if self.employed else 0.0
+        self._employed = employed if employed is not None else rng.random() < 0.60
+        self.base_income = rng.uniform(900.0, 1300.0)
+        self.skill = rng.uniform(0.3, 1.0)
+        self._income = self.base_income if self._employed else 0.0
+        model.labour.add_worker(self._employed, self._income)
+        if not self._employed:
+            model.labour_market.employment_changed(self, False)
+
+    @property
+    def employed(self) -> bool:
+        return self._employed
+
+    @employed.setter
+    def employed(self, value: bool):
+        value = bool(value)
+        if value != self._employed:
+            self._employed = value
+            self.model.labour.employment_changed(value)
+            self.model.labour_market.employment_changed(self, value)
+
+    @property
+    def income(self) -> float:
+        return self._income
+
+    @income.setter
+    def income(self, value: float):
+        if value != self._income:
+            self.model.labour.income_changed(self._income, value)
+            self._income = value
 
     def step(self):
         """Apply layoff churn, then try to find a job, then update income."""
         # ── 1. Layoff / churn phase ──────────────────────────────────────
         # Each employed worker has a small chance of losing their job every
         # step, keeping the labour market dynamic throughout the simulation.
-        if self.employed and random.random() < self.JOB_LOSS_PROB:
+        if self.employed and self.model.random.random() < self.JOB_LOSS_PROB:
             self.employed = False
 
         # ── 2. Job-search phase ──────────────────────────────────────────
         if not self.employed:
             training_boost = min(0.2, self.model.government.training_budget / 10000.0)
             find_prob = min(1.0, self.model.job_find_prob + (0.08 * self.skill) + training_boost)
-            if random.random() < find_prob:
+            if self.model.random.random() < find_prob:
                 self.employed = True
 
         # ── 3. Income phase ──────────────────────────────────────────────
@@ -47,36 +76,25 @@ class Firm(Agent):
 
     ``hiring_rate`` (0–1) controls the probability that any individual
     unemployed worker gets an offer in a given step, preventing the labour
-    market from saturating too quickly.
+    market from saturating too quickly.  The hire is drawn at the firm's own
+    activation from the model's live unemployed index (LabourClearinghouse),
+    at most one per firm per step.
     """
 
     def __init__(self, model, hiring_rate: float = 0.3):
         super().__init__(model)
-        self.openings = random.randint(1, 4)
+        self.openings = self.model.random.randint(1, 4)
         self.hiring_rate = hiring_rate
 
     def step(self):
-        """Generate openings and probabilistically hire at most one worker per step."""
+        """Generate openings, then try for at most one hire while any are open."""
         # Firms only open new vacancies occasionally (30% chance per step)
         # to prevent the market from saturating within a few steps.
-        if random.random() < 0.30:
+        if self.model.random.random() < 0.30:
             self.openings += 1
 
-        if self.openings <= 0:
-            return
-
-        unemployed = [worker for worker in self.model.workers if not worker.employed]
-        if not unemployed:
-            return
-
-        # Each firm hires at most ONE worker per step via stochastic gate.
-        # This prevents firms from clearing the entire queue in a single tick.
-        random.shuffle(unemployed)
-        for worker in unemployed:
-            if random.random() < self.hiring_rate:
-                worker.employed = True
-                self.openings = max(0, self.openings - 1)
-                break  # one hire per firm per step
+        if self.openings > 0:
+            self.model.labour_market.hire(self)
 
 
 class Household(Agent):
@@ -85,7 +103,7 @@ class Household(Agent):
     def __init__(self, model, members: list[Worker]):
         super().__init__(model)
         self.members = members
-        self.rent = random.uniform(300.0, 650.0)
+        self.rent = self.model.random.uniform(300.0, 650.0)
         self.moved_this_step = False
 
     def step(self):
@@ -94,11 +112,12 @@ class Household(Agent):
         affordability_threshold = self.rent * 3.0
         unaffordable = total_income < affordability_threshold
 
-        should_move = (unaffordable and random.random() < 0.55) or (random.random() < self.model.move_prob)
+        rng = self.model.random
+        should_move = (unaffordable and rng.random() < 0.55) or (rng.random() < self.model.move_prob)
         if should_move:
             self.moved_this_step = True
             self.model.migration_count += 1
-            self.rent = max(180.0, self.rent * random.uniform(0.9, 1.06))
+            self.rent = max(180.0, self.rent * rng.uniform(0.9, 1.06))
         else:
             self.moved_this_step = False
 
@@ -120,34 +139,20 @@ class Government(Agent):
     def step(self):
         """Adjust policy levers and set government_spending_multiplier each step."""
         # ── Labour market response (unchanged from Step A) ───────────────
-        unemployment = self.model.unemployment_rate()
+        # policy_unemployment() is the model's own rate, or the metro-wide
+        # rate for a district shard (abm_districts.py).
+        unemployment = self.model.policy_unemployment()
         if unemployment > 0.16:
             self.subsidy_pct = min(0.3, self.subsidy_pct + 0.003)
             self.training_budget = min(6000.0, self.training_budget + 15.0)
         else:
             self.subsidy_pct = max(0.02, self.subsidy_pct - 0.001)
 
-        self.infra_spend = max(250.0, self.infra_spend + random.uniform(-30.0, 30.0))
+        self.infra_spend = max(250.0, self.infra_spend + self.model.random.uniform(-30.0, 30.0))
 
         # ── Fiscal stance: set multiplier read by InfrastructureAgent ────
-        # spending_keywords → expansionary fiscal policy
-        spending_keywords = [
-            "invest", "infrastructure", "education",
-            "training", "subsidy", "stimulus", "spending",
-        ]
-        # austerity_keywords → contractionary fiscal policy
-        austerity_keywords = [
-            "cut", "austerity", "deregulat",
-            "tax cut", "privatise", "privatize",
-        ]
-
-        scenario = self.model.scenario.lower()
-        if any(kw in scenario for kw in spending_keywords):
-            self.model.government_spending_multiplier = 1.6
-        elif any(kw in scenario for kw in austerity_keywords):
-            self.model.government_spending_multiplier = 0.4
-        else:
-            self.model.government_spending_multiplier = 1.0
+        # model.policy is the scenario compiled once (abm_scenario.py).
+        self.model.government_spending_multiplier = self.model.policy.spending_multiplier
 
         # NOTE: infrastructure_score and env_score are now written exclusively
         # by InfrastructureAgent.step() and EnvironmentAgent.step().
@@ -176,7 +181,7 @@ class InfrastructureAgent(Agent):
 
     def step(self):
         # 1. Count employed workers as an activity proxy for firm demand
-        employed_count = sum(1 for w in self.model.workers if w.employed)
+        employed_count = self.model.labour.employed_count
 
         # 2. Demand pressure: more economic activity = more infrastructure strain
         demand_pressure = employed_count * self.WORKER_DEMAND_FACTOR
@@ -188,13 +193,7 @@ class InfrastructureAgent(Agent):
         )
 
         # 4. Scenario keyword boost: direct infrastructure policy investment
-        infra_keywords = [
-            "infrastructure", "road", "transport",
-            "rail", "bridge", "broadband", "utilities",
-        ]
-        keyword_boost = 0.6 if any(
-            kw in self.model.scenario.lower() for kw in infra_keywords
-        ) else 0.0
+        keyword_boost = 0.6 if self.model.policy.infra else 0.0
 
         # 5. Update score (clamped to [0, 100])
         delta = gov_investment + keyword_boost - self.DEPRECIATION_RATE - demand_pressure
@@ -217,20 +216,13 @@ class EnvironmentAgent(Agent):
 
     def step(self):
         # 1. Count employed workers as production-activity proxy
-        employed_count = sum(1 for w in self.model.workers if w.employed)
+        employed_count = self.model.labour.employed_count
 
         # 2. Production damage scales with economic activity
         production_damage = employed_count * self.PRODUCTION_DAMAGE
 
         # 3. Green policy boost
-        green_keywords = [
-            "green", "environment", "renewable", "solar",
-            "wind", "sustainability", "carbon", "emissions",
-            "electric", "clean energy",
-        ]
-        green_boost = 0.8 if any(
-            kw in self.model.scenario.lower() for kw in green_keywords
-        ) else 0.0
+        green_boost = 0.8 if self.model.policy.green else 0.0
 
         # 4. Update score (clamped to [0, 100])
         delta = self.NATURAL_RECOVERY + green_boost - production_damage
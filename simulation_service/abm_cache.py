@@ -0,0 +1,165 @@
+"""Content-addressed cache of completed ABM simulation results."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    from .abm_runner import ENGINE_VERSION
+    from .abm_scenario import compile_scenario
+except ImportError:
+    from abm_runner import ENGINE_VERSION
+    from abm_scenario import compile_scenario
+
+# Config fields that change how a run is delivered or stored, not what it computes.
+NON_RESULT_FIELDS = ("step_delay_ms", "execution", "use_cache", "agent_storage")
+
+
+def cache_key(cfg: dict) -> str:
+    """SHA-256 of the effective config (after interpret_scenario) + engine version.
+
+    The config is serialised as canonical JSON — sorted keys, no whitespace —
+    so two payloads that differ only in field order or delivery settings map
+    to the same key.  The scenario enters as its compiled PolicyProfile, so
+    texts the model cannot tell apart ("Build roads" / "build more roads")
+    share a key too.
+    """
+    effective = {k: v for k, v in cfg.items() if k not in NON_RESULT_FIELDS}
+    if "scenario" in effective:
+        effective["scenario"] = compile_scenario(effective["scenario"]).as_key()
+    canonical = json.dumps(
+        {"engine_version": ENGINE_VERSION, "config": effective},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """LRU result cache: a byte-bounded memory tier over the SQLite table.
+
+    Memory entries map ``cache_key -> (simulation_id, record)`` in recency
+    order and are evicted once their serialised size exceeds
+    ``max_memory_bytes``.  The disk tier is the ``simulations`` table itself:
+    cached rows carry ``cache_key``, ``size_bytes`` and ``last_used_at``, and
+    the least recently used ones drop out of the cache (their ``cache_key``
+    is cleared) once their total passes ``max_disk_bytes``.  The rows
+    themselves stay: they are users' stored results, still served by
+    /results/{id} and /simulations and reloaded by the in-memory stores.
+    ``connect`` is a context manager yielding a ``sqlite3`` connection with
+    ``Row`` rows (app._db).
+    """
+
+    def __init__(
+        self,
+        connect: Callable,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+    ):
+        self._connect = connect
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[str, dict, int]]" = OrderedDict()
+        self._memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Tuple[str, dict]]:
+        """Return ``(simulation_id, record)`` for ``key``, or None on a miss."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+        if entry is None:
+            entry = self._load(key)
+            if entry is not None:
+                self._remember(key, *entry)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        sim_id, record, _ = entry
+        self._touch(sim_id)
+        return sim_id, record
+
+    def put(self, key: str, sim_id: str, record: dict, size_bytes: int) -> None:
+        """Admit a freshly saved result, then trim both tiers to their limits."""
+        self._remember(key, sim_id, record, size_bytes)
+        self._trim_disk()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "memory_bytes":   self._memory_bytes,
+                "hits":           self.hits,
+                "misses":         self.misses,
+            }
+
+    # ── Memory tier ────────────────────────────────────────────────────────
+
+    def _remember(self, key: str, sim_id: str, record: dict, size_bytes: int) -> None:
+        if size_bytes > self.max_memory_bytes:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= old[2]
+            self._memory[key] = (sim_id, record, size_bytes)
+            self._memory_bytes += size_bytes
+            while self._memory_bytes > self.max_memory_bytes:
+                _, (_, _, evicted) = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted
+
+    # ── Disk tier (simulations table) ──────────────────────────────────────
+
+    def _load(self, key: str) -> Optional[Tuple[str, dict, int]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, results_json, size_bytes FROM simulations "
+                "WHERE cache_key = ? ORDER BY last_used_at DESC LIMIT 1",
+                (key,),
+            ).fetchone()
+        if row is None or not row["results_json"]:
+            return None
+        return row["id"], json.loads(row["results_json"]), int(row["size_bytes"] or 0)
+
+    def _touch(self, sim_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE simulations SET last_used_at = ? WHERE id = ?",
+                (datetime.now(timezone.utc).isoformat(), sim_id),
+            )
+            conn.commit()
+
+    def _trim_disk(self) -> None:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, cache_key, size_bytes FROM simulations "
+                "WHERE cache_key IS NOT NULL ORDER BY last_used_at DESC"
+            ).fetchall()
+            total, evict = 0, []
+            for row in rows:
+                total += int(row["size_bytes"] or 0)
+                if total > self.max_disk_bytes:
+                    evict.append(row)
+            if not evict:
+                return
+            conn.executemany(
+                "UPDATE simulations SET cache_key = NULL WHERE id = ?",
+                [(row["id"],) for row in evict],
+            )
+            conn.commit()
+        with self._lock:
+            for row in evict:
+                entry = self._memory.get(row["cache_key"])
+                if entry is not None and entry[0] == row["id"]:
+                    del self._memory[row["cache_key"]]
+                    self._memory_bytes -= entry[2]
@@ -0,0 +1,196 @@
+"""Compact, array-backed agents for large Mesa ABM populations."""
+
+from __future__ import annotations
+
+from array import array
+from typing import List, Sequence
+
+try:
+    from .abm_agents import Firm, Household, Worker
+except ImportError:
+    from abm_agents import Firm, Household, Worker
+
+
+class WorkerColumns:
+    """Per-worker state in contiguous typed columns, one row per worker.
+
+    Rows of removed workers are released and handed to the next appended
+    worker, so migration churn does not grow the columns.
+    """
+
+    def __init__(self):
+        self.employed = bytearray()
+        self.income = array("d")
+        self.base_income = array("d")
+        self.skill = array("d")
+        self._free: List[int] = []
+
+    def append(self, employed: bool, income: float, base_income: float, skill: float) -> int:
+        if self._free:
+            row = self._free.pop()
+            self.employed[row] = employed
+            self.income[row] = income
+            self.base_income[row] = base_income
+            self.skill[row] = skill
+            return row
+        self.employed.append(employed)
+        self.income.append(income)
+        self.base_income.append(base_income)
+        self.skill.append(skill)
+        return len(self.income) - 1
+
+    def release(self, row: int) -> None:
+        """Mark ``row`` free for reuse by a later append()."""
+        self._free.append(row)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.employed) + 8 * 3 * len(self.income)
+
+
+class HouseholdColumns:
+    """Per-household rent and move flag in typed columns; freed rows are reused."""
+
+    def __init__(self):
+        self.rent = array("d")
+        self.moved = bytearray()
+        self._free: List[int] = []
+
+    def append(self, rent: float) -> int:
+        if self._free:
+            row = self._free.pop()
+            self.rent[row] = rent
+            self.moved[row] = False
+            return row
+        self.rent.append(rent)
+        self.moved.append(False)
+        return len(self.rent) - 1
+
+    def release(self, row: int) -> None:
+        """Mark ``row`` free for reuse by a later append()."""
+        self._free.append(row)
+
+    @property
+    def nbytes(self) -> int:
+        return 9 * len(self.rent)
+
+
+class CompactWorker:
+    """Worker API over a row of ``model.worker_columns``.
+
+    A two-slot view (model, row) instead of a Mesa Agent: no ``__dict__``,
+    unique id or AgentSet registration.  Draws the same random numbers in
+    the same order as Worker and shares its ``step()``, so a compact model
+    reproduces the Mesa-agent model exactly.
+    """
+
+    __slots__ = ("model", "idx")
+
+    JOB_LOSS_PROB = Worker.JOB_LOSS_PROB
+    step = Worker.step
+
+    def __init__(self, model, employed: bool | None = None):
+        self.model = model
+        rng = model.random
+        employed = employed if employed is not None else rng.random() < 0.60
+        base_income = rng.uniform(900.0, 1300.0)
+        skill = rng.uniform(0.3, 1.0)
+        income = base_income if employed else 0.0
+        self.idx = model.worker_columns.append(employed, income, base_income, skill)
+        model.labour.add_worker(employed, income)
+        if not employed:
+            model.labour_market.employment_changed(self, False)
+
+    @property
+    def employed(self) -> bool:
+        return bool(self.model.worker_columns.employed[self.idx])
+
+    @employed.setter
+    def employed(self, value: bool):
+        value = bool(value)
+        columns = self.model.worker_columns
+        if value != bool(columns.employed[self.idx]):
+            columns.employed[self.idx] = value
+            self.model.labour.employment_changed(value)
+            self.model.labour_market.employment_changed(self, value)
+
+    @property
+    def income(self) -> float:
+        return self.model.worker_columns.income[self.idx]
+
+    @income.setter
+    def income(self, value: float):
+        columns = self.model.worker_columns
+        old = columns.income[self.idx]
+        if value != old:
+            self.model.labour.income_changed(old, value)
+            columns.income[self.idx] = value
+
+    @property
+    def base_income(self) -> float:
+        return self.model.worker_columns.base_income[self.idx]
+
+    @base_income.setter
+    def base_income(self, value: float):
+        self.model.worker_columns.base_income[self.idx] = value
+
+    @property
+    def skill(self) -> float:
+        return self.model.worker_columns.skill[self.idx]
+
+    @skill.setter
+    def skill(self, value: float):
+        self.model.worker_columns.skill[self.idx] = value
+
+    def remove(self) -> None:
+        """Release this worker's row; the object must not be used afterwards."""
+        self.model.worker_columns.release(self.idx)
+
+
+class CompactFirm:
+    """Slotted Firm with the same draws and ``step()`` as Firm."""
+
+    __slots__ = ("model", "openings", "hiring_rate")
+
+    step = Firm.step
+
+    def __init__(self, model, hiring_rate: float = 0.3):
+        self.model = model
+        self.openings = model.random.randint(1, 4)
+        self.hiring_rate = hiring_rate
+
+    def remove(self) -> None:
+        pass
+
+
+class CompactHousehold:
+    """Household API over a row of ``model.household_columns``."""
+
+    __slots__ = ("model", "idx", "members")
+
+    step = Household.step
+
+    def __init__(self, model, members: Sequence):
+        self.model = model
+        self.members = members
+        self.idx = model.household_columns.append(model.random.uniform(300.0, 650.0))
+
+    @property
+    def rent(self) -> float:
+        return self.model.household_columns.rent[self.idx]
+
+    @rent.setter
+    def rent(self, value: float):
+        self.model.household_columns.rent[self.idx] = value
+
+    @property
+    def moved_this_step(self) -> bool:
+        return bool(self.model.household_columns.moved[self.idx])
+
+    @moved_this_step.setter
+    def moved_this_step(self, value: bool):
+        self.model.household_columns.moved[self.idx] = value
+
+    def remove(self) -> None:
+        """Release this household's row; the object must not be used afterwards."""
+        self.model.household_columns.release(self.idx)
@@ -0,0 +1,285 @@
+"""Sharded multi-district ABM: one Mesa model per district, migrants exchanged between steps."""
+
+from __future__ import annotations
+
+import traceback
+from multiprocessing import get_context
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+try:
+    from .abm_model import AGENT_CLASSES, CivicABMModel
+except ImportError:
+    from abm_model import AGENT_CLASSES, CivicABMModel
+
+# Metrics summed over districts; every other metric is a worker-weighted mean.
+SUMMED_METRICS = ("migration_count",)
+# Metrics the coordinator reads to route migrants and set the metro policy
+# rate; every district run records them.
+ROUTING_METRICS = ("unemployment_rate", "rent_index")
+
+
+def _empty_batch() -> Dict[str, np.ndarray]:
+    return {
+        "sizes":       np.zeros(0, dtype=np.int32),
+        "base_income": np.zeros(0, dtype=np.float64),
+        "skill":       np.zeros(0, dtype=np.float64),
+    }
+
+
+class DistrictABMModel(CivicABMModel):
+    """One district (ward) of a metro run, with its own agents and scores.
+
+    Households that move in Household.step leave the district with
+    probability EMIGRATION_SHARE: emigrate() removes them and their
+    members and returns them as a migrant batch — per-household ``sizes``
+    plus per-worker ``base_income`` / ``skill`` arrays.  immigrate() settles
+    a batch routed here as new, unemployed residents.  The Government
+    responds to the metro-wide unemployment rate broadcast by the
+    coordinator (``metro_unemployment``) once one is known.
+    """
+
+    EMIGRATION_SHARE: float = 0.3
+
+    def __init__(self, district: int = 0, **kwargs):
+        super().__init__(**kwargs)
+        self.district = district
+        self.metro_unemployment: float | None = None
+
+    def policy_unemployment(self) -> float:
+        if self.metro_unemployment is None:
+            return self.unemployment_rate()
+        return self.metro_unemployment
+
+    def emigrate(self) -> Dict[str, np.ndarray]:
+        """Remove this step's emigrating households; return them as a batch."""
+        rng = self.random
+        leaving = [
+            household for household in self.households
+            if household.moved_this_step and household.members
+            and rng.random() < self.EMIGRATION_SHARE
+        ]
+        if not leaving:
+            return _empty_batch()
+        # Lists, not sets, wherever order matters: removal order fixes the
+        # unemployed index and the income sum's rounding, so shards must not
+        # depend on object addresses to match across processes.
+        movers = [worker for household in leaving for worker in household.members]
+        batch = {
+            "sizes":       np.array([len(h.members) for h in leaving], dtype=np.int32),
+            "base_income": np.array([w.base_income for w in movers]),
+            "skill":       np.array([w.skill for w in movers]),
+        }
+        gone, moved = set(leaving), set(movers)
+        for worker in movers:
+            self.labour.remove_worker(worker.employed, worker.income)
+            self.labour_market.withdraw(worker)
+            worker.remove()
+        for household in leaving:
+            household.remove()
+        self.workers = [worker for worker in self.workers if worker not in moved]
+        self.households = [household for household in self.households if household not in gone]
+        self.households_changed()
+        return batch
+
+    def immigrate(self, batch: Dict[str, np.ndarray]) -> None:
+        """Settle a migrant batch: new households of new, job-seeking workers."""
+        worker_cls, _, household_cls = AGENT_CLASSES[self.agent_storage]
+        offsets = np.concatenate(([0], np.cumsum(batch["sizes"])))
+        for i in range(len(batch["sizes"])):
+            members = []
+            for j in range(offsets[i], offsets[i + 1]):
+                worker = worker_cls(self, employed=False)
+                worker.base_income = float(batch["base_income"][j])
+                worker.skill = float(batch["skill"][j])
+                members.append(worker)
+            self.workers.extend(members)
+            self.households.append(household_cls(self, members))
+        self.households_changed()
+
+
+class _DistrictHost:
+    """The districts of one shard process (or of the calling thread)."""
+
+    def __init__(self, specs: Sequence[tuple]):
+        self.models = {
+            district: DistrictABMModel(district=district, **kwargs) for district, kwargs in specs
+        }
+
+    def step(self, metro_unemployment: float | None, inbound: Dict[int, dict]) -> Dict[int, tuple]:
+        """Settle arrivals, advance every district one step, collect emigrants.
+
+        Returns ``district -> (metric row, n_workers at recording, batch)``.
+        """
+        out = {}
+        for district, model in self.models.items():
+            if district in inbound:
+                model.immigrate(inbound[district])
+            model.metro_unemployment = metro_unemployment
+            model.step()
+            row = model.recorder.view(model.recorder.n_rows - 1)[0].copy()
+            out[district] = (row, model.labour.n_workers, model.emigrate())
+        return out
+
+
+def _host_main(conn, specs: Sequence[tuple]) -> None:
+    """Shard process loop: one step() per message until None arrives."""
+    try:
+        host = _DistrictHost(specs)
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            conn.send(("ok", host.step(*message)))
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+class _LocalShard:
+    def __init__(self, specs):
+        self._host = _DistrictHost(specs)
+        self._reply = None
+
+    def send(self, message) -> None:
+        self._reply = self._host.step(*message)
+
+    def recv(self) -> Dict[int, tuple]:
+        return self._reply
+
+    def close(self) -> None:
+        pass
+
+
+class _ProcessShard:
+    def __init__(self, ctx, specs):
+        self._conn, child = ctx.Pipe()
+        self._process = ctx.Process(target=_host_main, args=(child, specs), daemon=True)
+        self._process.start()
+        child.close()
+
+    def send(self, message) -> None:
+        self._conn.send(message)
+
+    def recv(self) -> Dict[int, tuple]:
+        status, payload = self._conn.recv()
+        if status == "error":
+            raise RuntimeError(f"District shard failed:\n{payload}")
+        return payload
+
+    def close(self) -> None:
+        try:
+            self._conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._conn.close()
+
+
+def _route(
+    outbound: Dict[int, dict],
+    attractiveness: np.ndarray,
+    rng: np.random.Generator,
+) -> Dict[int, dict]:
+    """Send each emigrating household to another district, weighted by attractiveness."""
+    n_districts = len(attractiveness)
+    parts: Dict[int, List[dict]] = {}
+    for origin in sorted(outbound):
+        batch = outbound[origin]
+        sizes = batch["sizes"]
+        if not len(sizes):
+            continue
+        others = np.array([d for d in range(n_districts) if d != origin])
+        weights = attractiveness[others]
+        dest = rng.choice(others, size=len(sizes), p=weights / weights.sum())
+        offsets = np.concatenate(([0], np.cumsum(sizes)))
+        for district in np.unique(dest):
+            households = np.flatnonzero(dest == district)
+            workers = np.concatenate([np.arange(offsets[h], offsets[h + 1]) for h in households])
+            parts.setdefault(int(district), []).append({
+                "sizes":       sizes[households],
+                "base_income": batch["base_income"][workers],
+                "skill":       batch["skill"][workers],
+            })
+    return {
+        district: {key: np.concatenate([p[key] for p in batches]) for key in batches[0]}
+        for district, batches in parts.items()
+    }
+
+
+def run_metro(
+    district_kwargs: Sequence[dict],
+    metrics: Sequence[str],
+    n_steps: int,
+    route_seed: int,
+    processes: int = 0,
+    on_row: Callable[[int, np.ndarray], None] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Run one metro of DistrictABMModel shards in lock step.
+
+    ``district_kwargs[d]`` are district ``d``'s constructor arguments (its
+    own seed and population share).  With ``processes > 0`` the districts
+    are spread round-robin over that many spawned shard processes, which
+    keep their models between steps; otherwise all run in the calling
+    thread, with identical results.  At every step boundary the
+    coordinator collects each district's metric row, worker count and
+    emigrants, routes the emigrants with its own ``route_seed`` stream
+    (towards districts with higher employment and lower rent), and
+    broadcasts the metro unemployment rate for the next step's fiscal
+    response.  ``on_row(step, metro_row)`` sees every metro row as it is
+    formed.  Returns ``(metro rows, per-district rows)`` shaped
+    ``(n_steps, metrics)`` and ``(districts, n_steps, metrics)``.
+    """
+    n_districts = len(district_kwargs)
+    specs = list(enumerate(district_kwargs))
+    if processes > 0:
+        ctx = get_context("spawn")
+        n_hosts = min(processes, n_districts)
+        shards = [_ProcessShard(ctx, specs[i::n_hosts]) for i in range(n_hosts)]
+    else:
+        shards = [_LocalShard(specs)]
+    hosted = [[district for district, _ in specs[i::len(shards)]] for i in range(len(shards))]
+
+    summed = np.array([name in SUMMED_METRICS for name in metrics])
+    unemployment = list(metrics).index("unemployment_rate")
+    rent = list(metrics).index("rent_index")
+    rng = np.random.default_rng(route_seed)
+    metro_rows = np.zeros((n_steps, len(metrics)))
+    district_rows = np.zeros((n_districts, n_steps, len(metrics)))
+    metro_unemployment = None
+    inbound: Dict[int, dict] = {}
+    try:
+        for step in range(n_steps):
+            for shard, districts in zip(shards, hosted):
+                shard.send((metro_unemployment, {d: inbound[d] for d in districts if d in inbound}))
+            replies = {}
+            for shard in shards:
+                replies.update(shard.recv())
+
+            rows = np.array([replies[d][0] for d in range(n_districts)])
+            n_workers = np.array([replies[d][1] for d in range(n_districts)], dtype=np.float64)
+            district_rows[:, step] = rows
+            total = n_workers.sum()
+            weights = n_workers / total if total else np.full(n_districts, 1.0 / n_districts)
+            # Column-wise, not ``weights @ rows``: BLAS rounding would depend
+            # on how many metrics are recorded, and the metro rate feeds back.
+            metro_rows[step] = np.where(summed, rows.sum(axis=0), (weights[:, None] * rows).sum(axis=0))
+            metro_unemployment = float(metro_rows[step, unemployment])
+
+            attractiveness = np.maximum(1e-6, (1.0 - rows[:, unemployment]) / rows[:, rent])
+            inbound = _route({d: replies[d][2] for d in range(n_districts)}, attractiveness, rng)
+            if on_row is not None:
+                on_row(step, metro_rows[step])
+    finally:
+        for shard in shards:
+            shard.close()
+    return metro_rows, district_rows
+
+
+def split_evenly(total: int, parts: int) -> List[int]:
+    """``total`` agents over ``parts`` districts, the remainder to the first ones."""
+    return [total // parts + (1 if i < total % parts else 0) for i in range(parts)]
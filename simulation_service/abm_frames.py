@@ -0,0 +1,78 @@
+"""Append-only per-simulation log of live ABM step frames."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+class FrameLog:
+    """Every step frame a simulation has produced, in arrival order.
+
+    One frame is appended per model step of every seed, so frame ``k``
+    (0-based) is global step ``k + 1`` — the same counter as ``steps_done`` in
+    the progress store.  Readers ask for ``since(n)`` and get only the frames
+    after global step ``n`` in columnar form, so a poll costs O(new frames)
+    regardless of how far into the run it lands.  Appends only ever grow the
+    lists, and readers snapshot ``len()`` before slicing, so a reader in the
+    event loop never sees a half-written frame.
+
+    Live seeds are logged by reference (``append_row``): a frame is a row
+    index into the seed's MetricRecorder or SharedMetricBuffer, and its
+    values are read from that buffer only when a reader asks for them.
+    """
+
+    def __init__(self, metrics: Sequence[str]):
+        self.metrics: tuple[str, ...] = tuple(metrics)
+        self._seeds: List[int] = []
+        self._seed_steps: List[int] = []
+        # (values, None) for plain frames, (recorder, row) for referenced ones
+        self._rows: List[Tuple[Any, Optional[int]]] = []
+        self._recorders: Dict[int, Any] = {}
+        self._plain = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate resident size: frame bookkeeping, plain rows and referenced buffers."""
+        return (
+            len(self._rows) * 120
+            + self._plain * 32 * len(self.metrics)
+            + sum(recorder.nbytes for recorder in self._recorders.values())
+        )
+
+    def append(self, seed: int, seed_step: int, values: Sequence[float]) -> None:
+        """Record one step of ``seed`` (values in ``metrics`` order)."""
+        self._plain += 1
+        self._push(seed, seed_step, (values, None))
+
+    def append_row(self, seed: int, seed_step: int, recorder: Any, row: int) -> None:
+        """Record one step of ``seed`` as row ``row`` of ``recorder``, without copying it."""
+        self._recorders.setdefault(id(recorder), recorder)
+        self._push(seed, seed_step, (recorder, row))
+
+    def _push(self, seed: int, seed_step: int, frame: Tuple[Any, Optional[int]]) -> None:
+        self._seeds.append(seed)
+        self._seed_steps.append(seed_step)
+        # Row goes last: len() is taken from _rows, so a concurrent reader
+        # never sees a row whose seed / seed_step are missing.
+        self._rows.append(frame)
+
+    def since(self, since_step: int, stop: int | None = None) -> Dict[str, Any]:
+        """Columnar frames for global steps ``since_step + 1 .. stop``."""
+        stop = len(self._rows) if stop is None else min(stop, len(self._rows))
+        start = max(0, min(since_step, stop))
+        rows = [
+            source if row is None else source.view(row, row + 1)[0].tolist()
+            for source, row in self._rows[start:stop]
+        ]
+        return {
+            "steps":      list(range(start + 1, stop + 1)),
+            "seeds":      self._seeds[start:stop],
+            "seed_steps": self._seed_steps[start:stop],
+            "metrics": {
+                name: [row[i] for row in rows]
+                for i, name in enumerate(self.metrics)
+            },
+        }
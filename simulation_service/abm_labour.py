@@ -0,0 +1,127 @@
+"""Labour-market bookkeeping and matching for the Mesa ABM agents and model."""
+
+from __future__ import annotations
+
+import math
+
+
+class LabourAggregates:
+    """Running employed count and income sum over every Worker of a model.
+
+    Workers report each employment / income change through the
+    ``employment_changed`` and ``income_changed`` hooks, so the readers in one
+    step (Government, InfrastructureAgent, EnvironmentAgent, avg_welfare and
+    the DataCollector) get O(1) answers instead of rescanning
+    ``model.workers``.  With ``debug=True`` the model calls ``verify()`` after
+    every step to cross-check the tracked values against a full recount.
+    """
+
+    def __init__(self, debug: bool = False):
+        self.debug = debug
+        self.n_workers = 0
+        self.employed_count = 0
+        self.income_sum = 0.0
+
+    # ── Hooks called by Worker ──────────────────────────────────────────────
+
+    def add_worker(self, employed: bool, income: float) -> None:
+        self.n_workers += 1
+        self.employed_count += int(employed)
+        self.income_sum += income
+
+    def employment_changed(self, employed: bool) -> None:
+        self.employed_count += 1 if employed else -1
+
+    def remove_worker(self, employed: bool, income: float) -> None:
+        self.n_workers -= 1
+        self.employed_count -= int(employed)
+        self.income_sum -= income
+
+    def income_changed(self, old: float, new: float) -> None:
+        self.income_sum += new - old
+
+    # ── Reads ───────────────────────────────────────────────────────────────
+
+    def unemployment_rate(self) -> float:
+        """Fraction of workers currently unemployed."""
+        if not self.n_workers:
+            return 0.0
+        return (self.n_workers - self.employed_count) / self.n_workers
+
+    def avg_income(self) -> float:
+        """Average worker income."""
+        if not self.n_workers:
+            return 0.0
+        return self.income_sum / self.n_workers
+
+    def verify(self, workers) -> None:
+        """Raise RuntimeError if the tracked values drifted from a recount."""
+        employed = sum(1 for worker in workers if worker.employed)
+        income = math.fsum(worker.income for worker in workers)
+        if len(workers) != self.n_workers or employed != self.employed_count:
+            raise RuntimeError(
+                f"Labour aggregates out of sync: tracked {self.employed_count}/"
+                f"{self.n_workers} employed, recount {employed}/{len(workers)}"
+            )
+        if not math.isclose(income, self.income_sum, rel_tol=1e-9, abs_tol=1e-6):
+            raise RuntimeError(
+                f"Labour aggregates out of sync: tracked income sum "
+                f"{self.income_sum!r}, recount {income!r}"
+            )
+
+
+class LabourClearinghouse:
+    """Live unemployed-worker index and the per-firm hiring draw.
+
+    The index is a swap-remove array (``_pool`` with ``_slot`` positions), kept
+    current by ``Worker.employed`` so no step ever rescans ``model.workers``.
+    A firm with openings calls ``hire()`` at its own activation in the
+    shuffled phase, so hires keep their old timing: a worker hired before
+    its own step still faces that step's layoff churn and draws employed
+    income.  With ``U`` unemployed candidates the firm hires with
+    probability ``1 - (1 - hiring_rate)**U`` and the hire is uniform over
+    the pool — the same distribution as shuffling the unemployed and
+    offering to each with ``hiring_rate`` — in O(1) per firm.  All draws
+    come from ``rng`` (the owning model's ``random.Random``), so hiring is
+    reproducible per model seed.
+    """
+
+    def __init__(self, rng):
+        self.rng = rng
+        self._pool: list = []
+        self._slot: dict = {}
+
+    def __len__(self) -> int:
+        return len(self._pool)
+
+    # ── Unemployed index ────────────────────────────────────────────────────
+
+    def employment_changed(self, worker, employed: bool) -> None:
+        if employed:
+            slot = self._slot.pop(worker)
+            last = self._pool.pop()
+            if last is not worker:
+                self._pool[slot] = last
+                self._slot[last] = slot
+        else:
+            self._slot[worker] = len(self._pool)
+            self._pool.append(worker)
+
+    def withdraw(self, worker) -> None:
+        """Drop a worker leaving the model from the index (if unemployed)."""
+        if worker in self._slot:
+            self.employment_changed(worker, True)
+
+    # ── Matching ────────────────────────────────────────────────────────────
+
+    def hire(self, firm) -> bool:
+        """Give ``firm`` at most one hire from the live pool; True if it hired."""
+        n_unemployed = len(self._pool)
+        if not n_unemployed:
+            return False
+        rng = self.rng
+        if rng.random() >= 1.0 - (1.0 - firm.hiring_rate) ** n_unemployed:
+            return False
+        self._pool[rng.randrange(n_unemployed)].employed = True
+        firm.openings = max(0, firm.openings - 1)
+        return True
@@ -0,0 +1,55 @@
+"""Registry of ABM metrics and what each one needs to be computed."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import FrozenSet, Iterable, List, Optional
+
+
+@dataclass(frozen=True)
+class MetricSpec:
+    """``depends``: metrics recorded alongside this one (it is derived from
+    them); ``stages``: optional per-step model passes that only exist to
+    produce it (e.g. "rent", the household rent-pressure reduction)."""
+
+    depends: tuple = ()
+    stages:  tuple = ()
+
+
+# Canonical metric order: recorder columns, result series and frames follow it.
+METRICS = {
+    "unemployment_rate":    MetricSpec(),
+    "avg_income":           MetricSpec(),
+    "migration_count":      MetricSpec(),
+    "rent_index":           MetricSpec(stages=("rent",)),
+    "avg_welfare":          MetricSpec(depends=("unemployment_rate", "avg_income")),
+    "infrastructure_score": MetricSpec(),
+    "env_score":            MetricSpec(),
+}
+
+# All metrics tracked by the models' MetricRecorder.
+ALL_METRICS = list(METRICS)
+
+
+def resolve_metrics(requested: Optional[Iterable[str]] = None) -> List[str]:
+    """Requested metrics plus their dependencies, in canonical order.
+
+    ``None`` means every metric.  Raises ValueError on unknown names.
+    """
+    if requested is None:
+        return list(ALL_METRICS)
+    wanted = set()
+    pending = list(requested)
+    while pending:
+        name = pending.pop()
+        if name not in METRICS:
+            raise ValueError(f"Unknown metric {name!r}; expected some of {ALL_METRICS}")
+        if name not in wanted:
+            wanted.add(name)
+            pending.extend(METRICS[name].depends)
+    return [name for name in ALL_METRICS if name in wanted]
+
+
+def metric_stages(metrics: Iterable[str]) -> FrozenSet[str]:
+    """Model passes the given metrics need."""
+    return frozenset(stage for name in metrics for stage in METRICS[name].stages)
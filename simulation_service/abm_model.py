@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+from typing import Sequence
+
+import numpy as np
 from mesa import Model
-from mesa.datacollection import DataCollector
 
 try:
     # Package import path when imported as simulation_service.abm_model
@@ -11,12 +13,35 @@ try:
         Firm, Government, Household, Worker,
         InfrastructureAgent, EnvironmentAgent,
     )
+    from .abm_compact import (
+        CompactFirm, CompactHousehold, CompactWorker, HouseholdColumns, WorkerColumns,
+    )
+    from .abm_labour import LabourAggregates, LabourClearinghouse
+    from .abm_metrics import metric_stages, resolve_metrics
+    from .abm_recorder import MetricRecorder
+    from .abm_scenario import PolicyProfile, compile_scenario
 except ImportError:
     # Direct module import path when running from simulation_service directory
     from abm_agents import (
         Firm, Government, Household, Worker,
         InfrastructureAgent, EnvironmentAgent,
     )
+    from abm_compact import (
+        CompactFirm, CompactHousehold, CompactWorker, HouseholdColumns, WorkerColumns,
+    )
+    from abm_labour import LabourAggregates, LabourClearinghouse
+    from abm_metrics import metric_stages, resolve_metrics
+    from abm_recorder import MetricRecorder
+    from abm_scenario import PolicyProfile, compile_scenario
+
+# Worker / Firm / Household classes per agent_storage mode.
+# "mesa":    one Mesa Agent (own __dict__, unique id, AgentSet entry) each.
+# "compact": slotted views over typed columns (abm_compact.py) — same
+#            dynamics and numbers, a fraction of the memory per agent.
+AGENT_CLASSES = {
+    "mesa":    (Worker, Firm, Household),
+    "compact": (CompactWorker, CompactFirm, CompactHousehold),
+}
 
 
 class CivicABMModel(Model):
@@ -35,8 +60,21 @@ class CivicABMModel(Model):
         firm_hiring_rate: float = 0.3,
         scenario: str = '',
         seed: int | None = None,
+        debug_aggregates: bool = False,
+        record_capacity: int = 64,
+        agent_storage: str = "mesa",
+        metrics: Sequence[str] | None = None,
     ):
         super().__init__(seed=seed)
+        if agent_storage not in AGENT_CLASSES:
+            raise ValueError(
+                f"Unknown agent_storage {agent_storage!r}; expected one of {sorted(AGENT_CLASSES)}"
+            )
+        self.agent_storage = agent_storage
+        worker_cls, firm_cls, household_cls = AGENT_CLASSES[agent_storage]
+        if agent_storage == "compact":
+            self.worker_columns = WorkerColumns()
+            self.household_columns = HouseholdColumns()
 
         self.job_find_prob = job_find_prob
         self.move_prob = move_prob
@@ -44,8 +82,8 @@ class CivicABMModel(Model):
         self.migration_count = 0
         self.rent_index = 1.0
 
-        # Scenario string — read by Government, InfrastructureAgent,
-        # EnvironmentAgent each step.
+        # Scenario string; setting it compiles self.policy, the profile
+        # Government, InfrastructureAgent and EnvironmentAgent read each step.
         self.scenario = scenario or ''
 
         # Government fiscal stance multiplier — set by Government.step(),
@@ -60,16 +98,21 @@ class CivicABMModel(Model):
             training_budget=training_budget,
         )
 
+        # ── Labour aggregates and unemployed index (Workers report into
+        #    both from __init__ on) ──────────────────────────────────────
+        self.labour = LabourAggregates(debug=debug_aggregates)
+        self.labour_market = LabourClearinghouse(self.random)
+
         # ── Workers ──────────────────────────────────────────────────────
         self.workers: list[Worker] = []
         for _ in range(n_workers):
-            worker = Worker(self)
+            worker = worker_cls(self)
             self.workers.append(worker)
 
         # ── Firms ────────────────────────────────────────────────────────
         self.firms: list[Firm] = []
         for _ in range(n_firms):
-            firm = Firm(self, hiring_rate=self.firm_hiring_rate)
+            firm = firm_cls(self, hiring_rate=self.firm_hiring_rate)
             self.firms.append(firm)
 
         # ── Households ──────────────────────────────────────────────────
@@ -81,46 +124,57 @@ class CivicABMModel(Model):
             members = self.workers[start:end] if start < n_workers else []
             if not members and self.workers:
                 members = [self.random.choice(self.workers)]
-            household = Household(self, members)
+            household = household_cls(self, members)
             self.households.append(household)
+        # CSR membership index for the rent phase; rebuilt lazily whenever
+        # households or their members change (see households_changed()).
+        self._household_index: tuple[np.ndarray, np.ndarray, np.ndarray | None] | None = None
 
         # ── Infrastructure and Environment singleton agents ──────────────
         self.infra_agent = InfrastructureAgent(self)
         self.env_agent   = EnvironmentAgent(self)
 
-        # ── DataCollector ────────────────────────────────────────────────
-        # infrastructure_score and env_score now read from the singleton
-        # agent instances, NOT from model-level attributes.
-        self.datacollector = DataCollector(
-            model_reporters={
-                "unemployment_rate":    lambda model: model.unemployment_rate(),
-                "avg_income":           lambda model: model.avg_income(),
-                "migration_count":      lambda model: model.migration_count,
-                "rent_index":           lambda model: model.rent_index,
-                "avg_welfare":          lambda model: model.avg_welfare(),
-                "infrastructure_score": lambda model: next(
-                    (a.score for a in model.agents
-                     if isinstance(a, InfrastructureAgent)), 50.0
-                ),
-                "env_score": lambda model: next(
-                    (a.score for a in model.agents
-                     if isinstance(a, EnvironmentAgent)), 60.0
-                ),
-            }
-        )
+        # ── Metric reporters → columnar recorder ─────────────────────────
+        # Only the requested metrics (plus their dependencies, see
+        # abm_metrics.py) are computed and recorded; passes that feed no
+        # recorded metric, like the rent index, are skipped.
+        # infrastructure_score and env_score read the singleton agents.
+        # record_capacity is the expected step count; the recorder grows
+        # past it if needed.
+        reporters = {
+            "unemployment_rate":    lambda model: model.unemployment_rate(),
+            "avg_income":           lambda model: model.avg_income(),
+            "migration_count":      lambda model: model.migration_count,
+            "rent_index":           lambda model: model.rent_index,
+            "avg_welfare":          lambda model: model.avg_welfare(),
+            "infrastructure_score": lambda model: model.infra_agent.score,
+            "env_score":            lambda model: model.env_agent.score,
+        }
+        self.metrics = resolve_metrics(metrics)
+        self.model_reporters = {name: reporters[name] for name in self.metrics}
+        self._track_rent = "rent" in metric_stages(self.metrics)
+        self.recorder = MetricRecorder(self.model_reporters, capacity=record_capacity)
+
+    @property
+    def scenario(self) -> str:
+        return self._scenario
+
+    @scenario.setter
+    def scenario(self, text: str) -> None:
+        self._scenario = text or ''
+        self.policy: PolicyProfile = compile_scenario(self._scenario)
 
     def unemployment_rate(self) -> float:
         """Fraction of workers currently unemployed."""
-        if not self.workers:
-            return 0.0
-        unemployed = sum(1 for worker in self.workers if not worker.employed)
-        return unemployed / len(self.workers)
+        return self.labour.unemployment_rate()
+
+    def policy_unemployment(self) -> float:
+        """Unemployment rate the Government responds to (this model's own)."""
+        return self.unemployment_rate()
 
     def avg_income(self) -> float:
         """Average worker income for the current step."""
-        if not self.workers:
-            return 0.0
-        return sum(worker.income for worker in self.workers) / len(self.workers)
+        return self.labour.avg_income()
 
     def avg_welfare(self) -> float:
         """Welfare index in [0, 1]: combines employment rate and normalised income."""
@@ -131,18 +185,69 @@ class CivicABMModel(Model):
         income_score = min(1.0, self.avg_income() / 1500.0)
         return round((employment_rate * 0.6) + (income_score * 0.4), 4)
 
+    def households_changed(self) -> None:
+        """Invalidate the household membership index after adding/removing agents."""
+        self._household_index = None
+
+    def _household_rows(self) -> tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+        """CSR membership ``(offsets, rows, household_rows)``.
+
+        Household ``h``'s members are ``rows[offsets[h]:offsets[h+1]]``, rows
+        into _worker_incomes().  A worker may sit in several households
+        (fallback members) and then appears once per household.  For compact
+        agents ``household_rows`` maps households to their column rows.
+        """
+        if self._household_index is None:
+            households = self.households
+            household_rows = None
+            if self.agent_storage == "compact":
+                rows = [worker.idx for household in households for worker in household.members]
+                household_rows = np.array([household.idx for household in households], dtype=np.int64)
+            else:
+                position = {worker: i for i, worker in enumerate(self.workers)}
+                rows = [position[worker] for household in households for worker in household.members]
+            sizes = [len(household.members) for household in households]
+            self._household_index = (
+                np.concatenate(([0], np.cumsum(sizes, dtype=np.int64))),
+                np.array(rows, dtype=np.int64),
+                household_rows,
+            )
+        return self._household_index
+
+    def _worker_incomes(self) -> np.ndarray:
+        """Current income per worker row (a zero-copy column view for compact agents)."""
+        if self.agent_storage == "compact":
+            return np.frombuffer(self.worker_columns.income, dtype=np.float64)
+        return np.fromiter(
+            (worker.income for worker in self.workers), dtype=np.float64, count=len(self.workers)
+        )
+
+    def household_incomes(self) -> np.ndarray:
+        """Summed member income per household, one segmented reduction over the CSR index."""
+        offsets, rows, _ = self._household_rows()
+        totals = np.zeros(len(self.households))
+        if len(rows):
+            # reduceat needs non-empty segments; empty households keep 0.
+            nonempty = offsets[1:] > offsets[:-1]
+            totals[nonempty] = np.add.reduceat(self._worker_incomes()[rows], offsets[:-1][nonempty])
+        return totals
+
     def _update_rent_index(self):
         """Compute a bounded rent stress index from household affordability."""
         if not self.households:
             self.rent_index = 1.0
             return
 
-        pressure = []
-        for household in self.households:
-            total_income = sum(worker.income for worker in household.members)
-            pressure.append(household.rent / max(1.0, total_income))
-
-        avg_pressure = sum(pressure) / len(pressure)
+        household_rows = self._household_rows()[2]
+        if household_rows is not None:
+            rent = np.frombuffer(self.household_columns.rent, dtype=np.float64)[household_rows]
+        else:
+            rent = np.fromiter(
+                (household.rent for household in self.households),
+                dtype=np.float64, count=len(self.households),
+            )
+        pressure = rent / np.maximum(1.0, self.household_incomes())
+        avg_pressure = float(pressure.mean())
         self.rent_index = max(0.5, min(2.0, 1.0 + ((avg_pressure - 0.15) * 1.4)))
 
     def step(self):
@@ -164,7 +269,8 @@ class CivicABMModel(Model):
             Intra-group order is randomised to avoid position-bias artefacts,
             but all three run after Policy and Infrastructure agents so their
             employment/income state does not feed back into infra/env scores
-            until the *next* tick.
+            until the *next* tick.  Firms hire at their own activation from
+            the live unemployed index (see LabourClearinghouse).
         """
         # ── Phase 1: fiscal policy ────────────────────────────────────────
         self.government.step()
@@ -186,5 +292,10 @@ class CivicABMModel(Model):
         for agent in labour_agents:
             agent.step()
 
-        self._update_rent_index()
-        self.datacollector.collect(self)
+        if self._track_rent:
+            self._update_rent_index()
+        if self.labour.debug:
+            self.labour.verify(self.workers)
+            if len(self.labour_market) != self.labour.n_workers - self.labour.employed_count:
+                raise RuntimeError("Unemployed index out of sync with labour aggregates")
+        self.recorder.record(report(self) for report in self.model_reporters.values())
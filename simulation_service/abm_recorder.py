@@ -0,0 +1,66 @@
+"""Columnar per-step metric storage for the additive ABM simulation flow."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+
+class MetricRecorder:
+    """Preallocated ``(n_steps, n_metrics)`` float64 buffer of model metrics.
+
+    Replaces Mesa's DataCollector for the ABM models: ``record()`` writes one
+    row per step in place, and readers take ``view()`` slices without copying
+    or rebuilding a DataFrame.  The buffer doubles if a run outlives the
+    capacity hint, so recording stays amortised O(1) per step.  ``n_rows`` is
+    bumped only after a row is fully written, so a reader in another thread
+    that snapshots ``n_rows`` first always sees complete rows.
+    """
+
+    def __init__(self, metrics: Sequence[str], capacity: int = 64):
+        self.metrics: tuple[str, ...] = tuple(metrics)
+        self.columns: Dict[str, int] = {name: i for i, name in enumerate(self.metrics)}
+        self._data = np.zeros((max(1, int(capacity)), len(self.metrics)), dtype=np.float64)
+        self.n_rows = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the row buffer, for memory accounting."""
+        return int(self._data.nbytes)
+
+    def record(self, values: Iterable[float]) -> None:
+        """Append one step's metric values (in ``metrics`` order)."""
+        if self.n_rows == len(self._data):
+            grown = np.zeros((2 * len(self._data), len(self.metrics)), dtype=np.float64)
+            grown[: self.n_rows] = self._data[: self.n_rows]
+            self._data = grown
+        row = self._data[self.n_rows]
+        for i, value in enumerate(values):
+            row[i] = value
+        self.n_rows += 1
+
+    def view(self, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Read-only view of rows ``start:stop`` (no copy)."""
+        stop = self.n_rows if stop is None else min(stop, self.n_rows)
+        out = self._data[start:stop]
+        out.flags.writeable = False
+        return out
+
+    def series(self, start: int = 0, stop: int | None = None) -> Dict[str, List[float]]:
+        """Per-metric lists for rows ``start:stop`` — the JSON result shape."""
+        block = self.view(start, stop)
+        return {name: block[:, i].tolist() for i, name in enumerate(self.metrics)}
+
+    def final(self, stop: int | None = None) -> Dict[str, float]:
+        """Metric values of the last recorded row (0.0 before the first step)."""
+        stop = self.n_rows if stop is None else min(stop, self.n_rows)
+        if stop <= 0:
+            return {name: 0.0 for name in self.metrics}
+        return dict(zip(self.metrics, self._data[stop - 1].tolist()))
+
+    def to_dataframe(self):
+        """Recorded rows as a pandas DataFrame (pandas imported on demand)."""
+        import pandas as pd
+
+        return pd.DataFrame(self.view().copy(), columns=list(self.metrics))
@@ -2,137 +2,515 @@
 
 from __future__ import annotations
 
+import os
+import threading
 import time
-from statistics import mean
-from typing import Dict, Any
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
 
 try:
+    from .abm_districts import ROUTING_METRICS, run_metro, split_evenly
+    from .abm_frames import FrameLog
+    from .abm_metrics import ALL_METRICS, resolve_metrics
     from .abm_model import CivicABMModel
+    from .abm_recorder import MetricRecorder
+    from .abm_shm import SharedMetricBuffer
+    from .abm_snapshot import FORK_LEVERS, restore_model, snapshot_model
+    from .abm_state import SQLiteRunState
+    from .abm_stats import OnlineStepStats
+    from .abm_store import BoundedStore
+    from .abm_stream import run_notifier
+    from .abm_vectorized import EnsembleCivicABMModel, VectorizedCivicABMModel
 except ImportError:
+    from abm_districts import ROUTING_METRICS, run_metro, split_evenly
+    from abm_frames import FrameLog
+    from abm_metrics import ALL_METRICS, resolve_metrics
     from abm_model import CivicABMModel
+    from abm_recorder import MetricRecorder
+    from abm_shm import SharedMetricBuffer
+    from abm_snapshot import FORK_LEVERS, restore_model, snapshot_model
+    from abm_state import SQLiteRunState
+    from abm_stats import OnlineStepStats
+    from abm_store import BoundedStore
+    from abm_stream import run_notifier
+    from abm_vectorized import EnsembleCivicABMModel, VectorizedCivicABMModel
+
+# The per-simulation stores below are BoundedStores (abm_store.py): entries
+# of finished runs expire after RUN_STORE_TTL_S or are evicted, least
+# recently used first, once a store passes RUN_STORE_MEMORY_MB.  Finished
+# results live on in SQLite; app.py installs the loaders that reload them.
+_RUN_STORE_MAX_BYTES = int(os.getenv("RUN_STORE_MEMORY_MB", "64")) * 1024 * 1024
+_RUN_STORE_TTL_S = float(os.getenv("RUN_STORE_TTL_S", "3600"))
+_TERMINAL_STATUSES = ("complete", "error", "cancelled")
+
+
+def _run_finished(simulation_id: str, _value: Any = None) -> bool:
+    """True once a run's progress is terminal (or already evicted)."""
+    progress = _progress.peek(simulation_id)
+    return progress is None or progress["status"] in _TERMINAL_STATUSES
+
+
+def _forget_run(simulation_id: str, _progress_entry: Any = None) -> None:
+    """Drop the small side stores of a run whose progress entry was evicted."""
+    for store in (_partial_results, _pacing, _cancel_events, _cancel_requests):
+        store.pop(simulation_id, None)
+
 
 # ── Shared progress store ─────────────────────────────────────────────────────
-_progress: Dict[str, Dict[str, Any]] = {}
+_progress = BoundedStore(
+    "progress", _RUN_STORE_MAX_BYTES, _RUN_STORE_TTL_S,
+    finished=lambda key, value: value["status"] in _TERMINAL_STATUSES,
+    on_evict=_forget_run,
+)
 
 # ── Shared incremental results store ─────────────────────────────────────────
 # Written after EVERY individual step inside run_abm_single().
 # GET /results/{id} reads this to serve partial data mid-run.
-_live_results: Dict[str, Dict[str, Any]] = {}
+_live_results = BoundedStore(
+    "live_results", _RUN_STORE_MAX_BYTES, _RUN_STORE_TTL_S, finished=_run_finished,
+)
+
+# ── Append-only frame logs ────────────────────────────────────────────────────
+# One FrameLog per simulation; run_abm_single() appends every step of every
+# seed. GET /results/{id}?since_step=N reads only the frames after N.  An
+# evicted log is not rebuilt: readers fall back to the stored results.
+_frame_logs = BoundedStore(
+    "frame_logs", _RUN_STORE_MAX_BYTES, _RUN_STORE_TTL_S, finished=_run_finished,
+)
+
+# ── Partial cross-seed aggregates ─────────────────────────────────────────────
+# OnlineStepStats.summary() over the seeds finished so far, republished by
+# run_abm_multi_seed() after each seed; GET /results/{id} attaches it mid-run.
+_partial_results: Dict[str, Dict[str, Any]] = {}
+
+# ── Display pacing ────────────────────────────────────────────────────────────
+# Runs compute at full speed; step_delay_ms only paces what the delivery
+# layer (get_progress / get_live_frames / get_live_results) reveals.
+# simulation_id -> (wall-clock start, seconds per tick, frames per tick).
+_pacing: Dict[str, tuple] = {}
+
+# ── Cooperative cancellation ──────────────────────────────────────────────────
+# simulation_id -> Event set by DELETE /abm/simulate/{id}; run loops check
+# it between steps and raise RunCancelled.  _cancel_requests carries the
+# same request from another service worker when run state is shared.
+_cancel_events: Dict[str, threading.Event] = {}
+_cancel_requests: Dict[str, Any] = {}
+
+
+class RunCancelled(Exception):
+    """Raised inside a run loop once the run's cancel event is set."""
+
+# ── Run-state backend ─────────────────────────────────────────────────────────
+# "memory" (default): the stores above, private to this process.
+# "sqlite": progress, live results, frame logs, partial aggregates, pacing
+# and cancel requests live in a WAL-mode SQLite file (ABM_STATE_DB) that
+# every worker of `uvicorn --workers N` on the host reads and writes, so a
+# poll, stream or DELETE can land on any worker.
+STATE_BACKEND = os.getenv("ABM_STATE_BACKEND", "memory")
+if STATE_BACKEND == "sqlite":
+    _shared_state = SQLiteRunState(
+        os.getenv("ABM_STATE_DB") or str(Path(__file__).parent / "civictwin_runstate.db"),
+        ttl_s=_RUN_STORE_TTL_S,
+    )
+    _progress = _shared_state.progress
+    _live_results = _shared_state.live_results
+    _frame_logs = _shared_state.frame_logs
+    _partial_results = _shared_state.partial_results
+    _pacing = _shared_state.pacing
+    _cancel_requests = _shared_state.cancel_requests
+elif STATE_BACKEND != "memory":
+    raise ValueError(f"Unknown ABM_STATE_BACKEND {STATE_BACKEND!r}; expected 'memory' or 'sqlite'")
+SHARED_STATE = STATE_BACKEND != "memory"
+
+
+# Model classes selectable per run via config["engine"].
+# "mesa"  — one Mesa Agent object per worker/firm/household (reference path).
+# "numpy" — struct-of-arrays engine for city-scale populations.
+# "ensemble" — the numpy engine with every seed of a multi-seed run advanced
+#              together as one EnsembleCivicABMModel; a lone seed runs as
+#              "numpy", which produces the same series.
+ENGINES = {
+    "mesa":     CivicABMModel,
+    "numpy":    VectorizedCivicABMModel,
+    "ensemble": VectorizedCivicABMModel,
+}
+
+# Part of every result-cache key (see abm_cache.py).  Bump it whenever a
+# change to the models alters the numbers a given config produces, so
+# results cached under the old dynamics are never served again.
+ENGINE_VERSION = "abm-5"
+
+
+def spawn_seeds(root_seed: int | None, n: int) -> List[int]:
+    """Derive ``n`` independent per-seed / per-replicate seeds from ``root_seed``.
+
+    Uses ``numpy.random.SeedSequence.spawn`` so the child streams are
+    statistically independent of each other yet fixed for a given root: the
+    same root always yields the same seeds, and therefore bit-identical runs
+    whichever thread, process or ensemble slot executes them.
+    """
+    children = np.random.SeedSequence(root_seed).spawn(n)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+
+def start_pacing(simulation_id: str, config: dict, frames_per_tick: int = 1) -> None:
+    """Reveal ``frames_per_tick`` frames every config["step_delay_ms"] from now."""
+    delay_s = float(config.get("step_delay_ms", 300)) / 1000.0
+    if delay_s > 0:
+        _pacing[simulation_id] = (time.time(), delay_s, max(1, frames_per_tick))
+    else:
+        _pacing.pop(simulation_id, None)
+
+
+def _paced(simulation_id: str, computed: int) -> tuple[int, float | None]:
+    """``(visible frames, seconds until the next reveal or None)``.
+
+    The first tick is visible at once — as the first step used to be
+    published before the old in-loop sleep — then one more tick per delay.
+    """
+    pace = _pacing.get(simulation_id)
+    if pace is None:
+        return computed, None
+    started, delay_s, per_tick = pace
+    ticks = int((time.time() - started) / delay_s) + 1
+    visible = ticks * per_tick
+    if visible >= computed:
+        return computed, None
+    return visible, started + ticks * delay_s - time.time()
+
+
+def reveal_delay(simulation_id: str) -> float | None:
+    """Seconds until pacing reveals another computed frame, None if none is held back."""
+    progress = _progress.get(simulation_id)
+    if progress is None:
+        return None
+    return _paced(simulation_id, progress["steps_done"])[1]
+
 
-# All metrics tracked by the DataCollector.
-ALL_METRICS = [
-    "unemployment_rate",
-    "avg_income",
-    "migration_count",
-    "rent_index",
-    "avg_welfare",
-    "infrastructure_score",
-    "env_score",
-]
+def run_store_stats() -> Dict[str, Dict[str, Any]]:
+    """Memory accounting of the per-simulation run stores."""
+    return {store.name: store.stats() for store in (_progress, _live_results, _frame_logs)}
+
+
+def watch_cancel(simulation_id: str, event: threading.Event) -> None:
+    """Make the runs under ``simulation_id`` stop once ``event`` is set."""
+    _cancel_events[simulation_id] = event
+
+
+def unwatch_cancel(simulation_id: str) -> None:
+    _cancel_events.pop(simulation_id, None)
+
+
+def request_cancel(simulation_id: str) -> None:
+    """Ask whichever worker runs ``simulation_id`` to stop (shared state only)."""
+    _cancel_requests[simulation_id] = True
+
+
+def _check_cancel(simulation_id: str | None) -> None:
+    if simulation_id is None:
+        return
+    event = _cancel_events.get(simulation_id)
+    if event is not None and event.is_set():
+        raise RunCancelled(simulation_id)
+    if SHARED_STATE and simulation_id in _cancel_requests:
+        raise RunCancelled(simulation_id)
+
+
+def discard_run(simulation_id: str) -> None:
+    """Drop a cancelled run's live state and report it as "cancelled"."""
+    for store in (_live_results, _frame_logs, _partial_results, _pacing, _cancel_requests):
+        store.pop(simulation_id, None)
+    progress = _progress.get(simulation_id) or {}
+    _progress[simulation_id] = {
+        "status":      "cancelled",
+        "steps_done":  progress.get("steps_done", 0),
+        "total_steps": progress.get("total_steps", 0),
+        "pct":         progress.get("pct", 0.0),
+    }
+    run_notifier.notify(simulation_id)
 
 
 def get_progress(simulation_id: str) -> Dict[str, Any]:
-    """Return the current progress dict for a simulation, or a default."""
-    return _progress.get(simulation_id, {
+    """Return the current progress dict for a simulation, or a default.
+
+    Steps computed but not yet revealed by display pacing are not counted:
+    a run reports "running" until its last frame is due, however early the
+    compute finished.
+    """
+    progress = _progress.get(simulation_id, {
         "status": "unknown",
         "steps_done": 0,
         "total_steps": 0,
         "pct": 0,
     })
+    if progress["status"] not in ("running", "complete"):
+        return progress
+    visible, wait_s = _paced(simulation_id, progress["steps_done"])
+    if wait_s is None:
+        if progress["status"] == "complete":
+            _pacing.pop(simulation_id, None)
+        return progress
+    total = progress["total_steps"]
+    return {
+        **progress,
+        "status":     "running",
+        "steps_done": visible,
+        "pct":        round(visible / total * 100, 1) if total else 0.0,
+    }
 
 
 def get_live_results(simulation_id: str) -> Dict[str, Any] | None:
-    """Return partial results written so far for a running simulation."""
-    return _live_results.get(simulation_id)
+    """Return partial results written so far for a running simulation.
+
+    While a seed is running, _live_results holds a reference to the model's
+    MetricRecorder rather than a copy; the JSON series are built here, once
+    per request, from the rows recorded up to ``steps_done``.  Once at least
+    one seed has finished, its cross-seed aggregate so far is attached as
+    ``partial_aggregate``.  While display pacing holds frames back, or the
+    recorder lives in another worker process (shared run state), the series
+    are read from the revealed part of the frame log instead.
+    """
+    live = _live_results.get(simulation_id)
+    if live is None:
+        return None
+    progress = get_progress(simulation_id)
+    log = _frame_logs.get(simulation_id)
+    if log is not None and (
+        progress["steps_done"] < len(log)
+        or (live["status"] == "running" and "recorder" not in live)
+    ):
+        return _paced_live_results(simulation_id, log, progress, live)
+    if "recorder" not in live:
+        return live
+
+    recorder = live["recorder"]
+    rows = live["rows"]
+    results = {
+        "n_runs":        live["n_runs"],
+        "n_steps":       live["steps_done"],
+        "mean_by_step":  recorder.series(stop=rows),
+        "mean_final":    recorder.final(stop=rows),
+    }
+    partial = _partial_results.get(simulation_id)
+    if partial is not None:
+        results["partial_aggregate"] = partial
+    return {
+        "status":     live["status"],
+        "steps_done": live["steps_done"],
+        "results":    results,
+    }
+
+
+def _paced_live_results(
+    simulation_id: str,
+    log: FrameLog,
+    progress: Dict[str, Any],
+    live: Dict[str, Any],
+) -> Dict[str, Any]:
+    """get_live_results() view of the revealed frames: the last revealed seed's series."""
+    visible = progress["steps_done"]
+    frames = log.since(0, stop=visible)
+    seed = frames["seeds"][-1] if visible else 0
+    rows = [i for i, s in enumerate(frames["seeds"]) if s == seed]
+    mean_by_step = {
+        name: [values[i] for i in rows] for name, values in frames["metrics"].items()
+    }
+    results = {
+        "n_runs":        live.get("n_runs") or live.get("results", {}).get("n_runs"),
+        "n_steps":       visible,
+        "mean_by_step":  mean_by_step,
+        "mean_final":    {name: (values[-1] if values else 0.0) for name, values in mean_by_step.items()},
+    }
+    partial = _partial_results.get(simulation_id)
+    if partial is not None:
+        results["partial_aggregate"] = partial
+    return {
+        "status":     "running",
+        "steps_done": visible,
+        "results":    results,
+    }
+
+
+def get_live_frames(
+    simulation_id: str,
+    since_step: int,
+    limit: int | None = None,
+) -> Dict[str, Any] | None:
+    """Return progress plus only the frames produced after ``since_step``.
+
+    Payload size depends on the number of new frames (at most ``limit``),
+    not on how far into the run the client is.  The aggregated ``results``
+    are attached once the run is complete and every frame has been handed
+    out.  Returns None for simulations without a frame log.
+    """
+    log = _frame_logs.get(simulation_id)
+    if log is None:
+        return None
+
+    progress = get_progress(simulation_id)
+    available = min(len(log), progress["steps_done"])
+    if limit is not None:
+        available = min(available, since_step + limit)
+    payload = {
+        **progress,
+        "since_step":      since_step,
+        "next_since_step": max(since_step, available),
+        "frames":          log.since(since_step, stop=available),
+    }
+    if progress["status"] == "complete" and available >= len(log):
+        live = _live_results.get(simulation_id) or {}
+        if "results" in live:
+            payload["results"] = live["results"]
+    return payload
+
+
+def _engine(config: dict) -> str:
+    """Validated engine name from config["engine"] (default "mesa")."""
+    engine = config.get("engine") or "mesa"
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown ABM engine {engine!r}; expected one of {sorted(ENGINES)}")
+    return engine
+
+
+def _metrics(config: dict) -> List[str]:
+    """Metrics a run records: config["metrics"] and their dependencies (all if unset).
+
+    Adaptive runs also record their target_metric, and district runs the
+    columns the migrant router reads (ROUTING_METRICS).
+    """
+    requested = config.get("metrics")
+    if requested is None:
+        return list(ALL_METRICS)
+    requested = list(requested)
+    if config.get("target_ci95") is not None:
+        requested.append(config.get("target_metric") or "unemployment_rate")
+    if _districts(config) > 1:
+        requested.extend(ROUTING_METRICS)
+    return resolve_metrics(requested)
+
+
+def _model_kwargs(config: dict, scenario: str, record_capacity: int = 64) -> dict:
+    """Constructor arguments shared by every engine (everything but the seed)."""
+    return dict(
+        n_workers=int(config.get("n_workers", 120)),
+        n_firms=int(config.get("n_firms", 8)),
+        n_households=int(config.get("n_households", 45)),
+        job_find_prob=float(config.get("job_find_prob", 0.15)),
+        move_prob=float(config.get("move_prob", 0.1)),
+        subsidy_pct=float(config.get("subsidy_pct", 0.1)),
+        infra_spend=float(config.get("infra_spend", 1000.0)),
+        training_budget=float(config.get("training_budget", 500.0)),
+        firm_hiring_rate=float(config.get("firm_hiring_rate", 0.3)),
+        scenario=scenario,
+        record_capacity=record_capacity,
+        metrics=_metrics(config),
+    )
+
+
+def _build_model(config: dict, scenario: str, record_capacity: int = 64):
+    """Instantiate the engine selected by config["engine"] (default "mesa")."""
+    engine = _engine(config)
+    kwargs = _model_kwargs(config, scenario, record_capacity)
+    kwargs["seed"] = config.get("seed")
+    # Debug-only: cross-check the Mesa model's incremental labour
+    # aggregates against a full recount after every step.
+    if engine == "mesa" and config.get("debug_aggregates"):
+        kwargs["debug_aggregates"] = True
+    if engine == "mesa":
+        kwargs["agent_storage"] = config.get("agent_storage") or "mesa"
+    return ENGINES[engine](**kwargs)
+
+
+def _publish_step(
+    simulation_id: str,
+    seed_idx: int,
+    step: int,
+    recorder: MetricRecorder,
+    total_steps: int,
+    n_runs: int,
+) -> None:
+    """Publish row ``step`` of one seed's recorder to the live stores.
+
+    Used by run_abm_single() for in-thread seeds and by the process-pool
+    drain loop in run_abm_multi_seed() for seeds running in worker
+    processes, so both execution modes feed the same progress, frame log
+    and live-results entries.  The row itself is not copied: the frame log
+    and live results reference the recorder, which for a process seed is
+    the shared-memory buffer its worker writes.
+    """
+    frame_log = _frame_logs.setdefault(simulation_id, FrameLog(recorder.metrics))
+    # Frame before progress, so steps_done never runs ahead of the log.
+    frame_log.append_row(seed_idx, step + 1, recorder, step)
+    done = len(frame_log)
+
+    # V1: _progress written INSIDE loop — visible to concurrent GETs
+    _progress[simulation_id] = {
+        "status": "running",
+        "steps_done": done,
+        "total_steps": total_steps,
+        "pct": round(done / total_steps * 100, 1),
+    }
+
+    # V1: _live_results written INSIDE loop after every step.
+    # Only the recorder reference and row count are published here;
+    # get_live_results() slices the recorder when someone asks.
+    _live_results[simulation_id] = {
+        "status":     "running",
+        "steps_done": done,
+        "n_runs":     n_runs,
+        "rows":       step + 1,
+        "recorder":   recorder,
+    }
+    run_notifier.notify(simulation_id)
 
 
 def run_abm_single(
     config: dict,
     simulation_id: str | None = None,
     seed_idx: int = 0,
+    on_step: Callable[[int, list], None] | None = None,
 ) -> dict:
     """Run one ABM simulation seed and return per-step values.
 
     Writes to _progress and _live_results INSIDE the per-step loop so that
     concurrent GET /progress and GET /results requests see live data.
+    ``on_step(step, values)`` is called after every step instead when the
+    seed runs in a worker process and rows go to a shared buffer.
 
-    Fix 4: time.sleep(step_delay_s) between steps keeps the simulation visible.
-    Default 300ms → 20 steps ≈ 6 s observable window.
+    Steps run back to back: step_delay_ms paces delivery to clients (see
+    start_pacing), not the compute, so the worker thread is released as
+    soon as the seed is done.  With config["n_districts"] > 1 the seed is a
+    sharded metro run (see run_abm_metro_seed).
     """
+    if _districts(config) > 1:
+        return run_abm_metro_seed(config, simulation_id, seed_idx)
     n_steps = int(config.get("n_steps", 50))
     n_runs  = int(config.get("n_runs", 1))
     scenario = config.get("scenario", "") or ""
-    # Fix 4: configurable inter-step delay for observability
-    step_delay_s = float(config.get("step_delay_ms", 300)) / 1000.0
     total_global_steps = n_steps * n_runs
 
-    model = CivicABMModel(
-        n_workers=int(config.get("n_workers", 120)),
-        n_firms=int(config.get("n_firms", 8)),
-        n_households=int(config.get("n_households", 45)),
-        job_find_prob=float(config.get("job_find_prob", 0.15)),
-        move_prob=float(config.get("move_prob", 0.1)),
-        subsidy_pct=float(config.get("subsidy_pct", 0.1)),
-        infra_spend=float(config.get("infra_spend", 1000.0)),
-        training_budget=float(config.get("training_budget", 500.0)),
-        firm_hiring_rate=float(config.get("firm_hiring_rate", 0.3)),
-        scenario=scenario,
-        seed=config.get("seed"),
-    )
+    model = _build_model(config, scenario, record_capacity=n_steps)
 
     # ── Per-step loop ─────────────────────────────────────────────────────────
     for step in range(n_steps):
+        _check_cancel(simulation_id)
         model.step()
 
         if simulation_id is not None:
-            done = seed_idx * n_steps + step + 1
-
-            # V1: _progress written INSIDE loop — visible to concurrent GETs
-            _progress[simulation_id] = {
-                "status": "running",
-                "steps_done": done,
-                "total_steps": total_global_steps,
-                "pct": round(done / total_global_steps * 100, 1),
-            }
-
-            # V1: _live_results written INSIDE loop after every step
-            frame = model.datacollector.get_model_vars_dataframe()
-            partial_series = {
-                col: [float(v) for v in frame[col].tolist()]
-                for col in frame.columns
-            }
-            partial_final = {
-                k: float(v[-1]) if v else 0.0
-                for k, v in partial_series.items()
-            }
-            _live_results[simulation_id] = {
-                "status": "running",
-                "steps_done": done,
-                "results": {
-                    "n_runs":        n_runs,
-                    "n_steps":       done,
-                    "mean_by_step":  partial_series,
-                    "mean_final":    partial_final,
-                },
-            }
-
-        # Fix 4: sleep AFTER writing results so the frontend can observe
-        # each step before the next one begins.
-        # With step_delay_ms=300 and n_steps=20: ~6 seconds total.
-        # With polling every 800ms: frontend receives ~2-3 new steps per poll.
-        if step_delay_s > 0:
-            time.sleep(step_delay_s)
+            _publish_step(
+                simulation_id, seed_idx, step, model.recorder,
+                total_global_steps, n_runs,
+            )
+        if on_step is not None:
+            on_step(step, model.recorder.view(step, step + 1)[0].tolist())
 
     # ── Final collection after all steps complete ─────────────────────────────
-    frame = model.datacollector.get_model_vars_dataframe()
-    series = {
-        col: [float(v) for v in frame[col].tolist()]
-        for col in frame.columns
-    }
-    final = {
-        key: float(values[-1]) if values else 0.0
-        for key, values in series.items()
-    }
+    series = model.recorder.series()
+    final = model.recorder.final()
 
     return {
         "seed":             config.get("seed"),
@@ -142,75 +520,678 @@ def run_abm_single(
     }
 
 
+def _districts(config: dict) -> int:
+    """Validated district count; sharded runs need the Mesa engine."""
+    n_districts = int(config.get("n_districts") or 1)
+    if n_districts > 1 and _engine(config) != "mesa":
+        raise ValueError("n_districts > 1 needs engine='mesa'")
+    return n_districts
+
+
+def run_abm_metro_seed(
+    config: dict,
+    simulation_id: str | None = None,
+    seed_idx: int = 0,
+) -> dict:
+    """Run one seed as a metro of config["n_districts"] DistrictABMModel shards.
+
+    Workers, firms and households are split evenly over the districts; each
+    district and the migrant router get a seed spawned from the run seed.
+    With config["execution"] == "process" the shards run in their own
+    processes (up to the process-pool size), otherwise in this thread —
+    the numbers are the same either way.  Metro rows are published to the
+    live stores like a single model's; the result adds each district's
+    final metrics.
+    """
+    n_steps = int(config.get("n_steps", 50))
+    n_runs = int(config.get("n_runs", 1))
+    n_districts = _districts(config)
+    kwargs = _model_kwargs(config, config.get("scenario", "") or "", record_capacity=n_steps)
+    kwargs["agent_storage"] = config.get("agent_storage") or "mesa"
+    if config.get("debug_aggregates"):
+        kwargs["debug_aggregates"] = True
+    populations = {
+        field: split_evenly(kwargs[field], n_districts)
+        for field in ("n_workers", "n_firms", "n_households")
+    }
+    if any(h > w for h, w in zip(populations["n_households"], populations["n_workers"])):
+        raise ValueError("Each district needs at least as many workers as households")
+    seeds = spawn_seeds(config.get("seed"), n_districts + 1)
+    district_kwargs = [
+        {**kwargs, **{field: counts[d] for field, counts in populations.items()}, "seed": seeds[d]}
+        for d in range(n_districts)
+    ]
+    processes = 0
+    if config.get("execution") == "process":
+        processes = _pool_settings["max_workers"] or os.cpu_count() or 1
+
+    metrics = kwargs["metrics"]
+    recorder = MetricRecorder(metrics, capacity=n_steps)
+
+    def on_row(step: int, row: np.ndarray) -> None:
+        recorder.record(row)
+        if simulation_id is not None:
+            _publish_step(simulation_id, seed_idx, step, recorder, n_steps * n_runs, n_runs)
+        _check_cancel(simulation_id)
+
+    _check_cancel(simulation_id)
+    _, district_rows = run_metro(
+        district_kwargs, metrics, n_steps, seeds[-1], processes=processes, on_row=on_row,
+    )
+    return {
+        "seed":             config.get("seed"),
+        "n_steps":          n_steps,
+        "metrics_by_step":  recorder.series(),
+        "final_metrics":    recorder.final(),
+        "district_final_metrics": [
+            dict(zip(metrics, rows[-1].tolist())) if n_steps else {} for rows in district_rows
+        ],
+    }
+
+
+# ── Process-pool seed execution ───────────────────────────────────────────────
+# execution="process" fans seeds out over a shared ProcessPoolExecutor.
+# Pool size and worker lifetime come from configure_process_pool() or the
+# ABM_PROCESS_WORKERS / ABM_PROCESS_MAX_TASKS_PER_CHILD environment variables.
+# Worker processes write each step into a SharedMetricBuffer (abm_shm.py)
+# that the service process reads in place — no per-step pickling.
+_pool_lock = threading.Lock()
+_process_pool: ProcessPoolExecutor | None = None
+_pool_settings: Dict[str, int | None] = {
+    "max_workers":         int(os.getenv("ABM_PROCESS_WORKERS", "0")) or None,
+    "max_tasks_per_child": int(os.getenv("ABM_PROCESS_MAX_TASKS_PER_CHILD", "0")) or None,
+}
+# How often the drain loop looks for new rows in the shared buffers.
+_SHM_POLL_S = 0.02
+
+
+def configure_process_pool(
+    max_workers: int | None = None,
+    max_tasks_per_child: int | None = None,
+) -> None:
+    """Set pool size / per-worker task limit; restarts the pool on next use.
+
+    ``max_workers=None`` uses every core.  ``max_tasks_per_child`` recycles a
+    worker process after that many seeds (None keeps workers for the life of
+    the pool).
+    """
+    shutdown_process_pool()
+    with _pool_lock:
+        _pool_settings["max_workers"] = max_workers
+        _pool_settings["max_tasks_per_child"] = max_tasks_per_child
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Lazily create the shared process pool."""
+    global _process_pool
+    with _pool_lock:
+        if _process_pool is None:
+            # spawn: worker processes must not inherit the service's threads.
+            _process_pool = ProcessPoolExecutor(
+                max_workers=_pool_settings["max_workers"],
+                mp_context=get_context("spawn"),
+                max_tasks_per_child=_pool_settings["max_tasks_per_child"],
+            )
+        return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """Stop the shared process pool (called on service shutdown)."""
+    global _process_pool
+    with _pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _run_seed_in_worker(run_config: dict, buffer_name: str | None) -> dict:
+    """Process-pool entry point: run one seed, writing its rows to ``buffer_name``.
+
+    Between steps the worker checks the buffer's stop flag and raises
+    RunCancelled once the service has set it.
+    """
+    if buffer_name is None:
+        return run_abm_single(run_config)
+    buffer = SharedMetricBuffer(_metrics(run_config), int(run_config["n_steps"]), name=buffer_name)
+
+    def on_step(step: int, values: list) -> None:
+        buffer.record(values)
+        if buffer.stop_requested:
+            raise RunCancelled(buffer_name)
+
+    try:
+        return run_abm_single(run_config, on_step=on_step)
+    finally:
+        buffer.close()
+
+
+def _run_seeds_in_processes(
+    run_configs: list,
+    simulation_id: str | None,
+    total_steps: int,
+    on_run: Callable[[int, dict], None],
+    first_idx: int = 0,
+) -> None:
+    """Run seeds on the process pool; publish their frames as they arrive.
+
+    ``run_configs[i]`` is seed index ``first_idx + i`` of the whole run.
+    Each seed gets a SharedMetricBuffer that its worker fills step by step;
+    the live stores reference the buffer like an in-thread seed's recorder,
+    and this loop only publishes the rows that appeared since its last look.
+    Finished seeds are handed to ``on_run(seed_idx, run)`` in seed order,
+    whatever order the workers complete in.  On cancellation seeds not yet
+    started are withdrawn and seeds already in a worker are told to stop
+    through their buffer's stop flag, which the worker reads between steps.
+    """
+    pool = _get_process_pool()
+    buffers: Dict[int, SharedMetricBuffer] = {}
+    if simulation_id is not None:
+        for seed_idx, run_config in enumerate(run_configs, start=first_idx):
+            buffers[seed_idx] = SharedMetricBuffer(_metrics(run_config), int(run_config["n_steps"]))
+    published = {seed_idx: 0 for seed_idx in buffers}
+    n_runs = int(run_configs[0]["n_runs"])
+
+    def drain(seed_idx: int) -> None:
+        buffer = buffers[seed_idx]
+        for step in range(published[seed_idx], buffer.n_rows):
+            _publish_step(simulation_id, seed_idx, step, buffer, total_steps, n_runs)
+        published[seed_idx] = buffer.n_rows
+
+    try:
+        futures = {
+            pool.submit(
+                _run_seed_in_worker, run_config,
+                buffers[seed_idx].name if seed_idx in buffers else None,
+            ): seed_idx
+            for seed_idx, run_config in enumerate(run_configs, start=first_idx)
+        }
+        finished: Dict[int, dict] = {}
+        next_idx = first_idx
+        pending = set(futures)
+        while pending:
+            try:
+                _check_cancel(simulation_id)
+            except RunCancelled:
+                for future in pending:
+                    future.cancel()
+                for buffer in buffers.values():
+                    buffer.request_stop()
+                raise
+            done, pending = wait(
+                pending,
+                timeout=_SHM_POLL_S if buffers else None,
+                return_when=FIRST_COMPLETED,
+            )
+            for seed_idx in list(buffers):
+                drain(seed_idx)
+            for future in done:
+                seed_idx = futures[future]
+                finished[seed_idx] = future.result()
+                # Every row is written before the future completes, so the
+                # drain above published the whole seed.
+                buffer = buffers.pop(seed_idx, None)
+                if buffer is not None:
+                    buffer.unlink()
+            while next_idx in finished:
+                on_run(next_idx, finished.pop(next_idx))
+                next_idx += 1
+    finally:
+        for buffer in buffers.values():
+            buffer.unlink()
+
+
+# ── Ensemble seed execution ───────────────────────────────────────────────────
+def _run_seeds_as_ensemble(
+    run_configs: list,
+    simulation_id: str | None,
+    total_steps: int,
+    on_run: Callable[[int, dict], None],
+    first_idx: int = 0,
+) -> None:
+    """Advance every seed together in one EnsembleCivicABMModel.
+
+    Each model step publishes one frame per seed, so the live stores see
+    the seeds interleaved step by step rather than one after another.  All
+    seeds finish together and are handed to ``on_run`` in seed order.
+    """
+    config = run_configs[0]
+    n_steps = int(config["n_steps"])
+    n_runs = int(config["n_runs"])
+
+    model = EnsembleCivicABMModel(
+        seeds=[run_config["seed"] for run_config in run_configs],
+        **_model_kwargs(config, config.get("scenario", "") or "", record_capacity=n_steps),
+    )
+    for step in range(n_steps):
+        _check_cancel(simulation_id)
+        model.step()
+        if simulation_id is not None:
+            for seed_idx, recorder in enumerate(model.recorders, start=first_idx):
+                _publish_step(simulation_id, seed_idx, step, recorder, total_steps, n_runs)
+
+    for seed_idx, (run_config, recorder) in enumerate(
+        zip(run_configs, model.recorders), start=first_idx
+    ):
+        on_run(seed_idx, {
+            "seed":            run_config["seed"],
+            "n_steps":         n_steps,
+            "metrics_by_step": recorder.series(),
+            "final_metrics":   recorder.final(),
+        })
+
+
 def run_abm_multi_seed(
     config: dict,
     simulation_id: str | None = None,
 ) -> dict:
-    """Run multiple seeds and aggregate mean metrics.
+    """Run multiple seeds and aggregate cross-seed statistics.
 
     n_runs taken directly from config — no hard floor.
     Called from a background thread (see app.py Fix 1) so it may block freely.
+    With config["execution"] == "process" the seeds run in parallel on the
+    shared process pool; frames still stream into the live stores per step.
+    With config["engine"] == "ensemble" the seeds run as one array-batched
+    model in the calling thread (the execution mode is then ignored).
+    With config["target_ci95"] set, n_runs becomes the batch size and
+    batches continue until the target precision or config["max_runs"] is
+    reached; result["precision"] reports what was achieved.
+    The result carries per-step mean / std / 95% CI half-width and
+    p10 / p50 / p90 bands, plus each seed's final metrics.
     """
     n_runs  = int(config.get("n_runs", 1))
     n_steps = int(config.get("n_steps", 50))
 
+    # Adaptive seed count: keep adding batches of n_runs seeds until the 95%
+    # CI half-width of target_metric's final value is within target_ci95,
+    # or max_runs seeds have run.
+    target_ci95 = config.get("target_ci95")
+    target_metric = config.get("target_metric") or "unemployment_rate"
+    if target_ci95 is not None:
+        if target_metric not in ALL_METRICS:
+            raise ValueError(f"Unknown target_metric {target_metric!r}; expected one of {ALL_METRICS}")
+        batch_size = max(2, n_runs)
+        max_runs = max(batch_size, int(config.get("max_runs") or batch_size))
+    else:
+        batch_size = max_runs = n_runs
+    metrics = _metrics(config)
+
     if simulation_id is not None:
         _progress[simulation_id] = {
             "status":      "running",
             "steps_done":  0,
-            "total_steps": n_steps * n_runs,
+            "total_steps": n_steps * batch_size,
             "pct":         0.0,
         }
-
-    runs = []
-    for seed in range(n_runs):
-        run_config = dict(config)
-        run_config["seed"]   = seed
-        run_config["n_steps"] = n_steps
-        run_config["n_runs"]  = n_runs
-        runs.append(
-            run_abm_single(run_config, simulation_id=simulation_id, seed_idx=seed)
+        _frame_logs[simulation_id] = FrameLog(metrics)
+        # Seeds that advance together (ensemble / process pool) are revealed
+        # a step of each per tick; sequential seeds one frame per tick.
+        together = _districts(config) == 1 and (
+            _engine(config) == "ensemble" or config.get("execution") == "process"
         )
+        start_pacing(simulation_id, config, frames_per_tick=batch_size if together else 1)
 
-    # Aggregate means across all seeds
-    mean_by_step: Dict[str, list] = {}
-    for metric_name in ALL_METRICS:
-        try:
-            mean_by_step[metric_name] = [
-                float(mean(run["metrics_by_step"][metric_name][step] for run in runs))
-                for step in range(n_steps)
-            ]
-        except (KeyError, IndexError):
-            mean_by_step[metric_name] = [0.0] * n_steps
-
-    mean_final: dict = {}
-    for metric_name in ALL_METRICS:
-        try:
-            mean_final[metric_name] = float(
-                mean(run["final_metrics"][metric_name] for run in runs)
-            )
-        except (KeyError, IndexError):
-            mean_final[metric_name] = 0.0
+    # config["seed"] is the root of the run; each of its seeds gets a child.
+    # Spawned children are prefix-stable, so an adaptive run that stops at k
+    # seeds used exactly the seeds of a fixed n_runs=k run.
+    seeds = spawn_seeds(int(config.get("seed") or 0), max_runs)
 
+    # Cross-seed aggregates are folded in online as each seed finishes (in
+    # seed order); only each seed's final metrics are kept, not its series.
+    stats = OnlineStepStats(metrics, n_steps)
+    runs: list = []
+
+    def on_run(seed_idx: int, run: dict) -> None:
+        series = run["metrics_by_step"]
+        stats.add(np.array([series[name] for name in metrics], dtype=np.float64).T)
+        entry = {"seed": run["seed"], "final_metrics": run["final_metrics"]}
+        if "district_final_metrics" in run:
+            entry["district_final_metrics"] = run["district_final_metrics"]
+        runs.append(entry)
+        if simulation_id is not None:
+            _partial_results[simulation_id] = stats.summary()
+
+    def precision_met() -> bool:
+        if stats.count < 2 or not n_steps:
+            return False
+        return bool(stats.ci95()[-1, metrics.index(target_metric)] <= target_ci95)
+
+    scheduled = 0
+    while scheduled < max_runs:
+        first_idx, scheduled = scheduled, min(max_runs, scheduled + batch_size)
+        run_configs = []
+        for seed in seeds[first_idx:scheduled]:
+            run_config = dict(config)
+            run_config["seed"]   = seed
+            run_config["n_steps"] = n_steps
+            run_config["n_runs"]  = scheduled
+            run_configs.append(run_config)
+
+        total_steps = n_steps * scheduled
+        if _engine(config) == "ensemble" and len(run_configs) > 1:
+            _run_seeds_as_ensemble(run_configs, simulation_id, total_steps, on_run, first_idx)
+        elif config.get("execution") == "process" and len(run_configs) > 1 and _districts(config) == 1:
+            _run_seeds_in_processes(run_configs, simulation_id, total_steps, on_run, first_idx)
+        else:
+            for seed_idx, run_config in enumerate(run_configs, start=first_idx):
+                on_run(seed_idx, run_abm_single(run_config, simulation_id=simulation_id, seed_idx=seed_idx))
+
+        if target_ci95 is None or precision_met():
+            break
+
+    n_runs = stats.count
+    aggregate = stats.summary()
+    del aggregate["seeds_done"]
     result = {
+        "seed":          int(config.get("seed") or 0),
         "n_runs":        n_runs,
         "n_steps":       n_steps,
         "runs":          runs,
-        "mean_by_step":  mean_by_step,
-        "mean_final":    mean_final,
+        **aggregate,
     }
+    if target_ci95 is not None:
+        achieved = aggregate["ci95_final"][target_metric] if n_runs > 1 else None
+        result["precision"] = {
+            "metric":        target_metric,
+            "target_ci95":   target_ci95,
+            "achieved_ci95": achieved,
+            "met":           precision_met(),
+            "runs_used":     n_runs,
+            "max_runs":      max_runs,
+        }
 
     if simulation_id is not None:
+        # Results first, then progress: a delta poll that sees "complete"
+        # must also find the final aggregate.
+        _live_results[simulation_id] = {
+            "status":     "complete",
+            "steps_done": n_steps * n_runs,
+            "results":    result,
+        }
         _progress[simulation_id] = {
             "status":      "complete",
             "steps_done":  n_steps * n_runs,
             "total_steps": n_steps * n_runs,
             "pct":         100.0,
         }
-        _live_results[simulation_id] = {
-            "status":     "complete",
-            "steps_done": n_steps * n_runs,
-            "results":    result,
+        _partial_results.pop(simulation_id, None)
+        run_notifier.notify(simulation_id)
+
+    return result
+
+
+def replay_result(simulation_id: str, result: dict) -> None:
+    """Publish an already computed (cached) result as a completed run.
+
+    Results keep no per-seed series, so the frame log is rebuilt from the
+    cross-seed mean — one frame per step, tagged seed -1 — and progress
+    counts those frames.  /results?since_step=N and the SSE stream then
+    replay the run like a fresh one before reporting it complete.  Callers
+    pass a new ``simulation_id`` per replay, so the run that produced the
+    result keeps its own frame log and progress.
+    """
+    mean_by_step = result["mean_by_step"]
+    n_steps = int(result["n_steps"])
+    metrics = list(mean_by_step)
+    frame_log = FrameLog(metrics)
+    for step in range(n_steps):
+        frame_log.append(-1, step + 1, [mean_by_step[name][step] for name in metrics])
+    _frame_logs[simulation_id] = frame_log
+
+    _live_results[simulation_id] = {
+        "status":     "complete",
+        "steps_done": n_steps,
+        "results":    result,
+    }
+    _progress[simulation_id] = {
+        "status":      "complete",
+        "steps_done":  n_steps,
+        "total_steps": n_steps,
+        "pct":         100.0,
+    }
+    run_notifier.notify(simulation_id)
+
+
+# ── Common-random-numbers variant batches ─────────────────────────────────────
+def _variant_cube(config: dict, seeds: List[int], on_step: Callable[[int], None]) -> np.ndarray:
+    """``(len(seeds), n_steps, metrics)`` metrics of one variant on ``seeds``.
+
+    The array engines run all seeds as one ensemble; "mesa" runs them one
+    after another.  ``on_step(k)`` reports k more replicate-steps done.
+    """
+    n_steps = int(config["n_steps"])
+    scenario = config.get("scenario", "") or ""
+    if _engine(config) == "mesa":
+        cube = np.zeros((len(seeds), n_steps, len(_metrics(config))))
+        for i, seed in enumerate(seeds):
+            model = _build_model({**config, "seed": seed}, scenario, record_capacity=n_steps)
+            for _ in range(n_steps):
+                model.step()
+                on_step(1)
+            cube[i] = model.recorder.view()
+        return cube
+
+    model = EnsembleCivicABMModel(
+        seeds=seeds, **_model_kwargs(config, scenario, record_capacity=n_steps)
+    )
+    for _ in range(n_steps):
+        model.step()
+        on_step(len(seeds))
+    return model.metric_cube()
+
+
+def run_abm_variants(
+    configs: List[dict],
+    names: List[str],
+    simulation_id: str | None = None,
+    publish: bool = True,
+) -> dict:
+    """Run policy variants on common random numbers and pair them with a baseline.
+
+    ``configs[0]`` is the baseline.  Every variant runs the same replicate
+    seeds, spawned from the baseline's root seed, so replicate ``r`` of
+    each variant sees the same random stream.  The array engines draw
+    fixed-shape blocks every step, so the streams stay synchronised even
+    where the variants' dynamics diverge; with "mesa" they share only the
+    seed.  Each replicate's variant-minus-baseline series is folded into
+    its own OnlineStepStats.  The paired CIs are therefore much tighter
+    than comparing independently seeded runs, and ``variance_ratio_final``
+    (paired variance over the independent-runs variance) reports how much.
+    Batches run at full speed; step_delay_ms is ignored and only progress
+    is published while they run.  With ``publish=False`` the caller
+    post-processes the result and calls publish_complete() itself.
+    """
+    base = configs[0]
+    if _districts(base) > 1:
+        raise ValueError("Variant batches run single-district models only")
+    n_runs = int(base.get("n_runs", 1))
+    n_steps = int(base.get("n_steps", 50))
+    seeds = spawn_seeds(int(base.get("seed") or 0), n_runs)
+    total_steps = n_steps * n_runs * len(configs)
+    done = 0
+
+    def on_step(k: int) -> None:
+        nonlocal done
+        done += k
+        if simulation_id is None:
+            return
+        _check_cancel(simulation_id)
+        _progress[simulation_id] = {
+            "status":      "running",
+            "steps_done":  done,
+            "total_steps": total_steps,
+            "pct":         round(done / total_steps * 100, 1) if total_steps else 0.0,
         }
+        run_notifier.notify(simulation_id)
+
+    metrics = _metrics(base)
+    variant_stats = [OnlineStepStats(metrics, n_steps) for _ in configs]
+    paired_stats = [OnlineStepStats(metrics, n_steps) for _ in configs[1:]]
+    baseline = _variant_cube({**base, "n_steps": n_steps}, seeds, on_step)
+    for series in baseline:
+        variant_stats[0].add(series)
+    for idx, config in enumerate(configs[1:], start=1):
+        cube = _variant_cube({**config, "n_steps": n_steps}, seeds, on_step)
+        for series, base_series in zip(cube, baseline):
+            variant_stats[idx].add(series)
+            paired_stats[idx - 1].add(series - base_series)
 
+    def summary(stats: OnlineStepStats) -> dict:
+        out = stats.summary()
+        del out["seeds_done"]
+        return out
+
+    base_var = variant_stats[0].std()[-1] ** 2 if n_steps else np.zeros(len(metrics))
+    paired = []
+    for idx, stats in enumerate(paired_stats, start=1):
+        entry = {"name": names[idx], **summary(stats)}
+        if n_steps:
+            independent_var = variant_stats[idx].std()[-1] ** 2 + base_var
+            paired_var = stats.std()[-1] ** 2
+            ratio = np.divide(paired_var, independent_var,
+                              out=np.zeros_like(paired_var), where=independent_var > 0)
+            entry["variance_ratio_final"] = dict(zip(metrics, ratio.tolist()))
+        paired.append(entry)
+
+    result = {
+        "seed":     int(base.get("seed") or 0),
+        "n_runs":   n_runs,
+        "n_steps":  n_steps,
+        "seeds":    seeds,
+        "variants": [
+            {"name": name, **summary(stats)} for name, stats in zip(names, variant_stats)
+        ],
+        "paired_vs_baseline": paired,
+    }
+
+    if simulation_id is not None and publish:
+        publish_complete(simulation_id, result, total_steps)
+    return result
+
+
+def fork_overrides(base: dict, config: dict) -> Dict[str, Any]:
+    """Fork levers on which ``config`` differs from ``base``; ValueError on other fields."""
+    ignored = set(FORK_LEVERS) | {"n_steps", "n_runs", "step_delay_ms", "execution", "use_cache"}
+    changed = sorted(k for k in set(base) | set(config) if k not in ignored and base.get(k) != config.get(k))
+    if changed:
+        raise ValueError(f"Fork branches may only change {list(FORK_LEVERS)}; got {changed}")
+    return {k: config.get(k) for k in FORK_LEVERS if base.get(k) != config.get(k)}
+
+
+def run_abm_fork(
+    configs: List[dict],
+    names: List[str],
+    fork_step: int,
+    load_snapshot: Callable[[int], bytes | None] | None = None,
+    save_snapshot: Callable[[int, bytes], None] | None = None,
+    simulation_id: str | None = None,
+) -> dict:
+    """Compute the common prefix once per seed, then fork every branch from it.
+
+    ``configs[0]`` is the baseline; the branches may differ from it only in
+    FORK_LEVERS, which take effect after step ``fork_step``.  For each
+    replicate seed (spawned from the baseline's root seed) the baseline runs
+    ``fork_step`` steps — or warm-starts from ``load_snapshot(seed)`` — and
+    is checkpointed with snapshot_model(), handed to ``save_snapshot(seed,
+    blob)``.  Every branch, the baseline included, is restored from that
+    checkpoint and runs the remaining steps, so all branches share the
+    prefix exactly and the RNG state at the fork.  Paired branch-minus-
+    baseline statistics are reported as in run_abm_variants().  Mesa engine
+    only; runs at full speed and publishes progress only.
+    """
+    base = configs[0]
+    if _engine(base) != "mesa" or _districts(base) > 1:
+        raise ValueError("Forking from snapshots needs a single-district engine='mesa' run")
+    n_runs = int(base.get("n_runs", 1))
+    n_steps = int(base.get("n_steps", 50))
+    if not 0 < fork_step < n_steps:
+        raise ValueError(f"fork_step must be between 1 and n_steps - 1 ({n_steps - 1})")
+    overrides = [fork_overrides(base, config) for config in configs]
+    seeds = spawn_seeds(int(base.get("seed") or 0), n_runs)
+    total_steps = n_runs * (fork_step + len(configs) * (n_steps - fork_step))
+    done = 0
+
+    def on_step(k: int) -> None:
+        nonlocal done
+        done += k
+        if simulation_id is None:
+            return
+        _check_cancel(simulation_id)
+        _progress[simulation_id] = {
+            "status":      "running",
+            "steps_done":  done,
+            "total_steps": total_steps,
+            "pct":         round(done / total_steps * 100, 1) if total_steps else 0.0,
+        }
+        run_notifier.notify(simulation_id)
+
+    metrics = _metrics(base)
+    branch_stats = [OnlineStepStats(metrics, n_steps) for _ in configs]
+    paired_stats = [OnlineStepStats(metrics, n_steps) for _ in configs[1:]]
+    reused = 0
+    for seed in seeds:
+        blob = load_snapshot(seed) if load_snapshot is not None else None
+        if blob is None:
+            model = _build_model({**base, "seed": seed}, base.get("scenario", "") or "",
+                                 record_capacity=fork_step)
+            for _ in range(fork_step):
+                model.step()
+                on_step(1)
+            blob = snapshot_model(model)
+            if save_snapshot is not None:
+                save_snapshot(seed, blob)
+        else:
+            reused += 1
+            on_step(fork_step)
+
+        baseline = None
+        for idx, levers in enumerate(overrides):
+            model = restore_model(blob, record_capacity=n_steps, overrides=levers)
+            for _ in range(n_steps - fork_step):
+                model.step()
+                on_step(1)
+            series = model.recorder.view().copy()
+            branch_stats[idx].add(series)
+            if idx == 0:
+                baseline = series
+            else:
+                paired_stats[idx - 1].add(series - baseline)
+
+    def summary(stats: OnlineStepStats) -> dict:
+        out = stats.summary()
+        del out["seeds_done"]
+        return out
+
+    result = {
+        "seed":             int(base.get("seed") or 0),
+        "n_runs":           n_runs,
+        "n_steps":          n_steps,
+        "fork_step":        fork_step,
+        "seeds":            seeds,
+        "snapshots_reused": reused,
+        "branches": [
+            {"name": name, "overrides": levers, **summary(stats)}
+            for name, levers, stats in zip(names, overrides, branch_stats)
+        ],
+        "paired_vs_baseline": [
+            {"name": name, **summary(stats)} for name, stats in zip(names[1:], paired_stats)
+        ],
+    }
+    if simulation_id is not None:
+        publish_complete(simulation_id, result, total_steps)
     return result
+
+
+def publish_complete(simulation_id: str, result: dict, total_steps: int) -> None:
+    """Mark a run without a frame log (variant batch, sweep) complete."""
+    _live_results[simulation_id] = {
+        "status":     "complete",
+        "steps_done": total_steps,
+        "results":    result,
+    }
+    _progress[simulation_id] = {
+        "status":      "complete",
+        "steps_done":  total_steps,
+        "total_steps": total_steps,
+        "pct":         100.0,
+    }
+    run_notifier.notify(simulation_id)
@@ -0,0 +1,116 @@
+"""Scenario text compiled once into an immutable ABM policy profile."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Tuple
+
+# ── Agent vocabularies (fiscal stance and per-step boosts) ────────────────
+# Spending keywords → expansionary fiscal policy
+SPENDING_KEYWORDS = (
+    "invest", "infrastructure", "education",
+    "training", "subsidy", "stimulus", "spending",
+)
+# Austerity keywords → contractionary fiscal policy
+AUSTERITY_KEYWORDS = (
+    "cut", "austerity", "deregulat",
+    "tax cut", "privatise", "privatize",
+)
+INFRA_KEYWORDS = (
+    "infrastructure", "road", "transport",
+    "rail", "bridge", "broadband", "utilities",
+)
+GREEN_KEYWORDS = (
+    "green", "environment", "renewable", "solar",
+    "wind", "sustainability", "carbon", "emissions",
+    "electric", "clean energy",
+)
+
+# government_spending_multiplier per fiscal stance.
+STANCE_MULTIPLIERS = {"spending": 1.6, "austerity": 0.4, "neutral": 1.0}
+
+
+@dataclass(frozen=True)
+class PolicyProfile:
+    """What a scenario text means to the ABM, independent of its wording.
+
+    ``overrides`` are the config levers the interpreter sets (applied to the
+    run config before the model is built); ``stance``, ``infra`` and
+    ``green`` are read by the Government, InfrastructureAgent and
+    EnvironmentAgent every step.  Two texts that compile to equal profiles
+    produce the same run.
+    """
+
+    overrides: Tuple[Tuple[str, float], ...] = ()
+    stance:    str  = "neutral"
+    infra:     bool = False
+    green:     bool = False
+
+    @property
+    def spending_multiplier(self) -> float:
+        return STANCE_MULTIPLIERS[self.stance]
+
+    def params(self) -> Dict[str, float]:
+        """The lever overrides as a dict, in interpretation order."""
+        return dict(self.overrides)
+
+    def as_key(self) -> dict:
+        """JSON-ready form for cache keys."""
+        return {
+            "overrides": [list(item) for item in self.overrides],
+            "stance":    self.stance,
+            "infra":     self.infra,
+            "green":     self.green,
+        }
+
+
+NEUTRAL = PolicyProfile()
+
+
+def _interpret(text: str) -> Dict[str, float]:
+    """Rule-based keyword → ABM parameter mapping (text is lowercased)."""
+    params: Dict[str, float] = {}
+
+    if any(k in text for k in ("infra", "road", "bridge", "construction", "transport", "metro", "highway")):
+        params["infra_spend"] = params.get("infra_spend", 1000.0) + 3000.0
+
+    if any(k in text for k in ("train", "school", "education", "skill", "college", "university", "learn")):
+        params["training_budget"] = params.get("training_budget", 500.0) + 2000.0
+
+    if any(k in text for k in ("subsid", "welfare", "cash", "poor", "benefit", "stipend", "allowance")):
+        params["subsidy_pct"] = min(0.3, params.get("subsidy_pct", 0.1) + 0.08)
+
+    if any(k in text for k in ("job", "employ", "work", "hire", "recruit", "labour", "labor")):
+        params["job_find_prob"]    = min(0.85, params.get("job_find_prob", 0.3) + 0.15)
+        params["firm_hiring_rate"] = min(0.7,  params.get("firm_hiring_rate", 0.3) + 0.15)
+
+    if any(k in text for k in ("cut", "auster", "reduce spend", "budget cut")):
+        params["infra_spend"]      = max(200.0, params.get("infra_spend", 1000.0) - 500.0)
+        params["training_budget"]  = max(100.0, params.get("training_budget", 500.0) - 200.0)
+
+    if any(k in text for k in ("stimulus", "boost", "growth", "expand")):
+        params["job_find_prob"] = min(0.85, params.get("job_find_prob", 0.3) + 0.1)
+        params["infra_spend"]   = params.get("infra_spend", 1000.0) + 1000.0
+
+    return params
+
+
+@lru_cache(maxsize=1024)
+def compile_scenario(scenario: str | None) -> PolicyProfile:
+    """Scan scenario text once; later runs of the same text hit the cache."""
+    if not scenario:
+        return NEUTRAL
+    text = scenario.lower()
+    if any(kw in text for kw in SPENDING_KEYWORDS):
+        stance = "spending"
+    elif any(kw in text for kw in AUSTERITY_KEYWORDS):
+        stance = "austerity"
+    else:
+        stance = "neutral"
+    return PolicyProfile(
+        overrides=tuple(_interpret(text).items()),
+        stance=stance,
+        infra=any(kw in text for kw in INFRA_KEYWORDS),
+        green=any(kw in text for kw in GREEN_KEYWORDS),
+    )
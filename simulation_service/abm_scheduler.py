@@ -0,0 +1,229 @@
+"""Bounded, prioritised job scheduler for background ABM runs."""
+
+from __future__ import annotations
+
+import bisect
+import itertools
+import threading
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+# Priority classes: lower runs first.  Interactive single runs overtake
+# queued bulk work (variant batches, sweeps).
+INTERACTIVE = 0
+BULK = 1
+
+
+class SchedulerFull(Exception):
+    """The queue, or the submitting client's share of it, is full (HTTP 429)."""
+
+
+class _Job:
+    __slots__ = ("job_id", "fn", "args", "priority", "client_id", "seq", "state", "cancel")
+
+    def __init__(self, job_id, fn, args, priority, client_id, seq):
+        self.job_id = job_id
+        self.fn = fn
+        self.args = args
+        self.priority = priority
+        self.client_id = client_id
+        self.seq = seq
+        self.state = "queued"
+        self.cancel = threading.Event()
+
+    def sort_key(self):
+        return (self.priority, self.seq)
+
+
+class JobScheduler:
+    """Fixed worker threads fed from a bounded priority queue.
+
+    Jobs are ordered by (priority, arrival).  A worker takes the first
+    queued job that is allowed to start: bulk jobs may hold at most
+    ``max_bulk_running`` workers, so some are always left for interactive
+    runs, and each client runs at most ``max_running_per_client`` jobs at a
+    time — a client's further jobs wait behind it without blocking others.
+    ``submit()`` raises SchedulerFull once ``max_queued`` jobs are waiting
+    or a client has ``max_pending_per_client`` jobs queued or running.
+
+    Cancellation is cooperative: a queued job is dropped, a running one
+    has its ``cancel_event()`` set and is expected to stop between steps.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        max_queued: int = 64,
+        max_running_per_client: int = 2,
+        max_pending_per_client: int = 8,
+        max_bulk_running: Optional[int] = None,
+    ):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.max_running_per_client = max_running_per_client
+        self.max_pending_per_client = max_pending_per_client
+        self.max_bulk_running = (
+            max(1, max_workers - 2) if max_bulk_running is None else max_bulk_running
+        )
+        self._cond = threading.Condition()
+        self._queue: List[_Job] = []          # sorted by _Job.sort_key()
+        self._jobs: Dict[str, _Job] = {}      # queued and running jobs
+        self._running_by_client: Dict[str, int] = {}
+        self._running_bulk = 0
+        self._seq = itertools.count()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"abm-worker-{i}", daemon=True)
+            for i in range(max_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    # ── Submission / control ───────────────────────────────────────────────
+
+    def submit(
+        self,
+        job_id: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        priority: int = INTERACTIVE,
+        client_id: str = "anonymous",
+    ) -> int:
+        """Queue ``fn(*args)`` under ``job_id``; return its 1-based queue position (see position())."""
+        with self._cond:
+            if self._closed:
+                raise SchedulerFull("scheduler is shut down")
+            if len(self._queue) >= self.max_queued:
+                raise SchedulerFull(f"ABM queue is full ({self.max_queued} jobs waiting)")
+            pending = sum(1 for job in self._jobs.values() if job.client_id == client_id)
+            if pending >= self.max_pending_per_client:
+                raise SchedulerFull(
+                    f"client {client_id!r} already has {pending} ABM jobs queued or running"
+                )
+            job = _Job(job_id, fn, args, priority, client_id, next(self._seq))
+            self._jobs[job_id] = job
+            bisect.insort(self._queue, job, key=_Job.sort_key)
+            self._cond.notify_all()
+            return self._dispatch_position(job)
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """Cancel a job; return the state it was in ("queued" / "running") or None."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job.cancel.set()
+            if job.state == "queued":
+                self._queue.remove(job)
+                del self._jobs[job_id]
+                self._cond.notify_all()
+            return job.state
+
+    def cancel_event(self, job_id: str) -> Optional[threading.Event]:
+        """Event set when ``job_id`` is cancelled, for the job to poll."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            return job.cancel if job is not None else None
+
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based place of a queued job in dispatch order, None once it runs.
+
+        Dispatch order applies the same start rules as the workers (bulk
+        and per-client limits), assuming that whenever no queued job may
+        start, the jobs started so far finish before the next one starts.
+        """
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.state != "queued":
+                return None
+            return self._dispatch_position(job)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "workers":      self.max_workers,
+                "running":      sum(self._running_by_client.values()),
+                "running_bulk": self._running_bulk,
+                "queued":       len(self._queue),
+                "max_queued":   self.max_queued,
+            }
+
+    def shutdown(self) -> None:
+        """Drop queued jobs, cancel running ones and stop the workers."""
+        with self._cond:
+            self._closed = True
+            for job in self._jobs.values():
+                job.cancel.set()
+            self._queue.clear()
+            self._cond.notify_all()
+
+    # ── Workers ────────────────────────────────────────────────────────────
+
+    def _runnable(
+        self, queue: List[_Job], running_bulk: int, running_by_client: Dict[str, int],
+    ) -> Optional[_Job]:
+        for job in queue:
+            if job.priority != INTERACTIVE and running_bulk >= self.max_bulk_running:
+                continue
+            if running_by_client.get(job.client_id, 0) >= self.max_running_per_client:
+                continue
+            return job
+        return None
+
+    def _next_runnable(self) -> Optional[_Job]:
+        return self._runnable(self._queue, self._running_bulk, self._running_by_client)
+
+    def _dispatch_position(self, target: _Job) -> int:
+        """Replay the workers' picks over the queue until ``target`` starts."""
+        queue = list(self._queue)
+        running_bulk = self._running_bulk
+        running_by_client = dict(self._running_by_client)
+        position = 0
+        while True:
+            job = None
+            if sum(running_by_client.values()) < self.max_workers:
+                job = self._runnable(queue, running_bulk, running_by_client)
+            if job is None:
+                if not running_by_client:
+                    # Nothing can ever start it (e.g. max_bulk_running=0).
+                    return position + queue.index(target) + 1
+                running_bulk, running_by_client = 0, {}
+                continue
+            position += 1
+            if job is target:
+                return position
+            queue.remove(job)
+            running_by_client[job.client_id] = running_by_client.get(job.client_id, 0) + 1
+            if job.priority != INTERACTIVE:
+                running_bulk += 1
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                job = self._next_runnable()
+                while job is None and not self._closed:
+                    self._cond.wait()
+                    job = self._next_runnable()
+                if job is None:
+                    return
+                self._queue.remove(job)
+                job.state = "running"
+                self._running_by_client[job.client_id] = self._running_by_client.get(job.client_id, 0) + 1
+                if job.priority != INTERACTIVE:
+                    self._running_bulk += 1
+            try:
+                job.fn(*job.args)
+            except Exception:
+                # Jobs record their own failures; keep the worker alive.
+                traceback.print_exc()
+            finally:
+                with self._cond:
+                    del self._jobs[job.job_id]
+                    left = self._running_by_client[job.client_id] - 1
+                    if left:
+                        self._running_by_client[job.client_id] = left
+                    else:
+                        del self._running_by_client[job.client_id]
+                    if job.priority != INTERACTIVE:
+                        self._running_bulk -= 1
+                    self._cond.notify_all()
@@ -0,0 +1,117 @@
+"""Shared-memory metric buffers for seeds running in worker processes."""
+
+from __future__ import annotations
+
+from multiprocessing import shared_memory
+from typing import Sequence
+
+import numpy as np
+
+try:
+    from .abm_recorder import MetricRecorder
+except ImportError:
+    from abm_recorder import MetricRecorder
+
+# Header: the int64 row counter and stop flag, padded to a cache line before the rows.
+_HEADER_BYTES = 64
+_COUNTER, _STOP = 0, 1
+
+# Odd multiplier for the per-row check words (the 64-bit golden ratio).
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+class SharedMetricBuffer(MetricRecorder):
+    """MetricRecorder whose ``(capacity, n_metrics)`` rows live in shared memory.
+
+    The API process creates the segment and passes ``name`` to a worker
+    process, which attaches with ``create=False`` and records one row per
+    step.  Readers get ``view()`` / ``series()`` / ``final()`` straight from
+    the shared pages — nothing is pickled or queued per step.
+
+    Python issues no memory fences, so on weakly ordered CPUs (ARM) another
+    core may see the row counter before the row it publishes.  Each row
+    therefore has a check word, written after its values, that mixes the
+    row's bits with its index; ``n_rows`` counts a row only once its check
+    matches, so readers see complete rows whatever the store order.  The
+    counter just bounds how far they look.
+
+    The header also holds a stop flag: the service sets it with
+    ``request_stop()`` and the worker polls ``stop_requested`` between steps.
+
+    The capacity is fixed (the seed's step count).  The creator calls
+    ``unlink()`` once the seed is drained; readers still holding the buffer
+    keep a valid mapping until they drop it.
+    """
+
+    def __init__(self, metrics: Sequence[str], capacity: int, name: str | None = None):
+        self.metrics = tuple(metrics)
+        self.columns = {metric: i for i, metric in enumerate(self.metrics)}
+        capacity = max(1, int(capacity))
+        n_metrics = len(self.metrics)
+        size = _HEADER_BYTES + capacity * (n_metrics + 1) * 8
+        self._shm = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+        self._header = np.ndarray((2,), dtype=np.int64, buffer=self._shm.buf)
+        self._data = np.ndarray(
+            (capacity, n_metrics), dtype=np.float64,
+            buffer=self._shm.buf, offset=_HEADER_BYTES,
+        )
+        self._checks = np.ndarray(
+            (capacity,), dtype=np.uint64,
+            buffer=self._shm.buf, offset=_HEADER_BYTES + capacity * n_metrics * 8,
+        )
+        self._weights = np.arange(1, n_metrics + 1, dtype=np.uint64) * _MIX | np.uint64(1)
+        self._verified = 0
+        if name is None:
+            self._header[:] = 0
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def nbytes(self) -> int:
+        return int(self._data.nbytes + self._checks.nbytes)
+
+    def _check(self, row: int) -> np.uint64:
+        bits = self._data[row].view(np.uint64)
+        return np.bitwise_xor.reduce(bits * self._weights) ^ np.uint64(row + 1)
+
+    @property
+    def n_rows(self) -> int:
+        """Leading rows whose check word matches their values."""
+        limit = int(self._header[_COUNTER])
+        n = self._verified
+        while n < limit and self._checks[n] == self._check(n):
+            n += 1
+        self._verified = n
+        return n
+
+    def record(self, values: Sequence[float]) -> None:
+        """Write the next row, then its check word, then bump the counter."""
+        n = int(self._header[_COUNTER])
+        if n == len(self._data):
+            raise IndexError(f"shared buffer {self.name} is full ({n} rows)")
+        self._data[n] = values
+        self._checks[n] = self._check(n)
+        self._header[_COUNTER] = n + 1
+
+    def request_stop(self) -> None:
+        """Ask the worker filling this buffer to stop after its current step."""
+        self._header[_STOP] = 1
+
+    @property
+    def stop_requested(self) -> bool:
+        return bool(self._header[_STOP])
+
+    def close(self) -> None:
+        """Detach this process from the segment (views become invalid)."""
+        self._header = self._data = self._checks = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Free the segment's name; the mapping lives on until this object goes."""
+        self._shm.unlink()
+
+    def __del__(self):
+        if getattr(self, "_data", None) is not None:
+            self.close()
@@ -0,0 +1,253 @@
+"""Checkpoints of Mesa ABM model state for forking and warm-starting runs."""
+
+from __future__ import annotations
+
+import io
+import json
+import threading
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+try:
+    from .abm_model import CivicABMModel
+except ImportError:
+    from abm_model import CivicABMModel
+
+# Config fields a fork may change at the snapshot step.  Population sizes
+# and the seed are baked into the snapshot.
+FORK_LEVERS = (
+    "job_find_prob", "move_prob", "firm_hiring_rate",
+    "subsidy_pct", "infra_spend", "training_budget", "scenario",
+)
+_GOVERNMENT_LEVERS = ("subsidy_pct", "infra_spend", "training_budget")
+
+
+def snapshot_model(model: CivicABMModel) -> bytes:
+    """Serialise the full state of a CivicABMModel between steps.
+
+    Agents become per-class arrays (households as CSR member indices into
+    ``model.workers``), the unemployed index keeps its order, and both RNG
+    states are captured, so a restored model continues bit-identically.
+    The recorded rows so far travel along.  The blob is a compressed
+    ``.npz`` with a JSON ``meta`` entry — no pickle.
+    """
+    workers = model.workers
+    index = {worker: i for i, worker in enumerate(workers)}
+    members = [[index[w] for w in household.members] for household in model.households]
+    meta = {
+        "steps":            model.steps,
+        "agent_storage":    model.agent_storage,
+        "job_find_prob":    model.job_find_prob,
+        "move_prob":        model.move_prob,
+        "firm_hiring_rate": model.firm_hiring_rate,
+        "migration_count":  model.migration_count,
+        "rent_index":       model.rent_index,
+        "scenario":         model.scenario,
+        "government_spending_multiplier": model.government_spending_multiplier,
+        "government": {lever: getattr(model.government, lever) for lever in _GOVERNMENT_LEVERS},
+        "infra_score":      model.infra_agent.score,
+        "env_score":        model.env_agent.score,
+        "labour": {
+            "n_workers":      model.labour.n_workers,
+            "employed_count": model.labour.employed_count,
+            "income_sum":     model.labour.income_sum,
+        },
+        "random_state":     model.random.getstate(),
+        "rng_state":        model.rng.bit_generator.state,
+        "metrics":          list(model.recorder.metrics),
+    }
+    buf = io.BytesIO()
+    np.savez_compressed(
+        buf,
+        meta=np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8),
+        worker_employed=np.array([w.employed for w in workers], dtype=np.bool_),
+        worker_base_income=np.array([w.base_income for w in workers], dtype=np.float64),
+        worker_skill=np.array([w.skill for w in workers], dtype=np.float64),
+        worker_income=np.array([w.income for w in workers], dtype=np.float64),
+        firm_openings=np.array([f.openings for f in model.firms], dtype=np.int64),
+        firm_hiring_rate=np.array([f.hiring_rate for f in model.firms], dtype=np.float64),
+        household_rent=np.array([h.rent for h in model.households], dtype=np.float64),
+        household_moved=np.array([h.moved_this_step for h in model.households], dtype=np.bool_),
+        household_offsets=np.cumsum([0] + [len(m) for m in members], dtype=np.int64),
+        household_members=np.array([i for m in members for i in m], dtype=np.int64),
+        unemployed_pool=np.array([index[w] for w in model.labour_market._pool], dtype=np.int64),
+        recorded=model.recorder.view(),
+    )
+    return buf.getvalue()
+
+
+def restore_model(
+    blob: bytes,
+    record_capacity: int = 64,
+    overrides: Optional[Dict[str, Any]] = None,
+) -> CivicABMModel:
+    """Rebuild a CivicABMModel from snapshot_model() output.
+
+    ``overrides`` sets fork levers (FORK_LEVERS) on the restored state —
+    e.g. a new subsidy or scenario from the snapshot step on.  Levers not
+    overridden keep the values they had evolved to.
+    """
+    overrides = dict(overrides or {})
+    unknown = sorted(set(overrides) - set(FORK_LEVERS))
+    if unknown:
+        raise ValueError(f"Cannot change {unknown} at a fork; forkable fields are {list(FORK_LEVERS)}")
+
+    with np.load(io.BytesIO(blob), allow_pickle=False) as npz:
+        arrays = {name: npz[name] for name in npz.files}
+    meta = json.loads(arrays["meta"].tobytes().decode("utf-8"))
+    recorded = arrays["recorded"]
+    offsets = arrays["household_offsets"]
+
+    model = CivicABMModel(
+        n_workers=len(arrays["worker_employed"]),
+        n_firms=len(arrays["firm_openings"]),
+        n_households=len(arrays["household_rent"]),
+        record_capacity=max(record_capacity, len(recorded)),
+        agent_storage=meta.get("agent_storage", "mesa"),
+        metrics=meta["metrics"],
+    )
+    # The constructor drew fresh agents; overwrite every field with the
+    # snapshot, bypassing the Worker property hooks (aggregates are restored
+    # wholesale below).
+    workers = model.workers
+    if model.agent_storage == "compact":
+        # A fresh model's rows are its agents, in order: fill whole columns.
+        columns = model.worker_columns
+        columns.employed[:] = arrays["worker_employed"].astype(np.uint8).tobytes()
+        columns.base_income[:] = array("d", arrays["worker_base_income"].tobytes())
+        columns.skill[:] = array("d", arrays["worker_skill"].tobytes())
+        columns.income[:] = array("d", arrays["worker_income"].tobytes())
+        model.household_columns.rent[:] = array("d", arrays["household_rent"].tobytes())
+        model.household_columns.moved[:] = arrays["household_moved"].astype(np.uint8).tobytes()
+    else:
+        for i, worker in enumerate(workers):
+            worker._employed = bool(arrays["worker_employed"][i])
+            worker.base_income = float(arrays["worker_base_income"][i])
+            worker.skill = float(arrays["worker_skill"][i])
+            worker._income = float(arrays["worker_income"][i])
+        for i, household in enumerate(model.households):
+            household.rent = float(arrays["household_rent"][i])
+            household.moved_this_step = bool(arrays["household_moved"][i])
+    for i, firm in enumerate(model.firms):
+        firm.openings = int(arrays["firm_openings"][i])
+        firm.hiring_rate = float(arrays["firm_hiring_rate"][i])
+    members = arrays["household_members"]
+    for i, household in enumerate(model.households):
+        household.members = [workers[j] for j in members[offsets[i]:offsets[i + 1]]]
+    model.households_changed()
+
+    model.steps = meta["steps"]
+    model.job_find_prob = meta["job_find_prob"]
+    model.move_prob = meta["move_prob"]
+    model.firm_hiring_rate = meta["firm_hiring_rate"]
+    model.migration_count = meta["migration_count"]
+    model.rent_index = meta["rent_index"]
+    model.scenario = meta["scenario"]
+    model.government_spending_multiplier = meta["government_spending_multiplier"]
+    for lever, value in meta["government"].items():
+        setattr(model.government, lever, value)
+    model.infra_agent.score = meta["infra_score"]
+    model.env_agent.score = meta["env_score"]
+    for name, value in meta["labour"].items():
+        setattr(model.labour, name, value)
+
+    market = model.labour_market
+    market._pool = [workers[j] for j in arrays["unemployed_pool"]]
+    market._slot = {worker: slot for slot, worker in enumerate(market._pool)}
+
+    version, internal, gauss = meta["random_state"]
+    model.random.setstate((version, tuple(internal), gauss))
+    model.rng.bit_generator.state = meta["rng_state"]
+
+    recorder = model.recorder
+    recorder._data[: len(recorded)] = recorded
+    recorder.n_rows = len(recorded)
+
+    for lever, value in overrides.items():
+        if lever in _GOVERNMENT_LEVERS:
+            setattr(model.government, lever, value)
+        elif lever == "firm_hiring_rate":
+            model.firm_hiring_rate = value
+            for firm in model.firms:
+                firm.hiring_rate = value
+        elif lever == "scenario":
+            model.scenario = value or ""
+        else:
+            setattr(model, lever, value)
+    return model
+
+
+class SnapshotStore:
+    """Byte-capped LRU table of snapshot blobs next to the stored results.
+
+    Rows live in the ``abm_snapshots`` table of the results database
+    (created by app._init_db) and are keyed by a content hash of the
+    prefix config, step and seed, so any later fork of the same prefix
+    warm-starts from them.  Least recently used rows are deleted once their
+    total passes ``max_bytes``.  ``connect`` is the app's ``_db`` context
+    manager.
+    """
+
+    def __init__(self, connect: Callable, max_bytes: int = 256 * 1024 * 1024):
+        self._connect = connect
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, snapshot_id: str) -> Optional[bytes]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT blob FROM abm_snapshots WHERE id = ?", (snapshot_id,)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE abm_snapshots SET last_used_at = ? WHERE id = ?",
+                    (datetime.now(timezone.utc).isoformat(), snapshot_id),
+                )
+                conn.commit()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return bytes(row["blob"])
+
+    def put(self, snapshot_id: str, blob: bytes, step: int, seed: int) -> None:
+        """Store a snapshot, then trim the table to ``max_bytes``."""
+        now = datetime.now(timezone.utc).isoformat()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO abm_snapshots "
+                "(id, step, seed, size_bytes, created_at, last_used_at, blob) "
+                "VALUES (?,?,?,?,?,?,?)",
+                (snapshot_id, step, seed, len(blob), now, now, blob),
+            )
+            rows = conn.execute(
+                "SELECT id, size_bytes FROM abm_snapshots ORDER BY last_used_at DESC"
+            ).fetchall()
+            total, evict = 0, []
+            for row in rows:
+                total += int(row["size_bytes"])
+                if total > self.max_bytes:
+                    evict.append((row["id"],))
+            if evict:
+                conn.executemany("DELETE FROM abm_snapshots WHERE id = ?", evict)
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM abm_snapshots"
+            ).fetchone()
+        with self._lock:
+            return {
+                "entries":   entries,
+                "bytes":     size,
+                "max_bytes": self.max_bytes,
+                "hits":      self.hits,
+                "misses":    self.misses,
+            }
@@ -0,0 +1,305 @@
+"""SQLite (WAL) run-state backend shared by every service worker on a host."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence
+
+_MISSING = object()
+_TERMINAL_STATUSES = ("complete", "error", "cancelled")
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+class SQLiteRunState:
+    """Run-state tables in one SQLite database opened in WAL mode.
+
+    Exposes the same shapes the runner uses for its in-memory stores —
+    dict-like ``progress`` / ``live_results`` / ``partial_results`` /
+    ``pacing`` / ``cancel_requests`` and a ``frame_logs`` mapping of
+    FrameLog-compatible logs — so a run computed in one
+    ``uvicorn --workers N`` process can be polled, streamed and cancelled
+    through any other.  WAL lets readers in every process proceed while one
+    writer appends.  Finished runs are deleted ``ttl_s`` after their last
+    progress update.
+    """
+
+    def __init__(self, path: str, ttl_s: float = 3600.0, sweep_interval_s: float = 30.0):
+        self.path = path
+        self.ttl_s = ttl_s
+        self.sweep_interval_s = sweep_interval_s
+        self._local = threading.local()
+        self._last_sweep = 0.0
+        conn = self.connect()
+        with _transaction(conn):
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS run_state ("
+                " kind TEXT NOT NULL, sim_id TEXT NOT NULL, value TEXT NOT NULL,"
+                " updated_at REAL NOT NULL, PRIMARY KEY (kind, sim_id))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS run_frames ("
+                " sim_id TEXT NOT NULL, idx INTEGER NOT NULL, seed INTEGER NOT NULL,"
+                " seed_step INTEGER NOT NULL, vals TEXT NOT NULL, PRIMARY KEY (sim_id, idx))"
+            )
+        self.progress = JSONTable(self, "progress", on_write=self._maybe_sweep)
+        # The live MetricRecorder is a process-local object; other workers
+        # rebuild live series from the frame log instead.
+        self.live_results = JSONTable(self, "live_results", transient_keys=("recorder",))
+        self.partial_results = JSONTable(self, "partial_results")
+        self.pacing = JSONTable(self, "pacing")
+        self.cancel_requests = JSONTable(self, "cancel")
+        self.frame_logs = SQLiteFrameLogs(self)
+
+    def connect(self) -> sqlite3.Connection:
+        """This thread's connection (autocommit, WAL, 5 s busy timeout)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _maybe_sweep(self) -> None:
+        now = time.time()
+        if now - self._last_sweep >= self.sweep_interval_s:
+            self.sweep(now)
+
+    def sweep(self, now: Optional[float] = None) -> None:
+        """Delete every trace of runs that finished more than ``ttl_s`` ago."""
+        now = time.time() if now is None else now
+        self._last_sweep = now
+        conn = self.connect()
+        placeholders = ",".join("?" * len(_TERMINAL_STATUSES))
+        stale = [row[0] for row in conn.execute(
+            "SELECT sim_id FROM run_state WHERE kind = 'progress' AND updated_at < ?"
+            f" AND json_extract(value, '$.status') IN ({placeholders})",
+            (now - self.ttl_s, *_TERMINAL_STATUSES),
+        )]
+        if not stale:
+            return
+        with _transaction(conn):
+            conn.executemany("DELETE FROM run_state WHERE sim_id = ?", [(s,) for s in stale])
+            conn.executemany("DELETE FROM run_frames WHERE sim_id = ?", [(s,) for s in stale])
+
+
+class JSONTable(MutableMapping):
+    """One ``kind`` of run_state rows as a dict of JSON values keyed by sim id.
+
+    Mirrors the BoundedStore extras the service relies on: ``loader`` for
+    reloading a missing key, ``peek()`` and ``stats()``.
+    """
+
+    def __init__(
+        self,
+        state: SQLiteRunState,
+        kind: str,
+        transient_keys: Sequence[str] = (),
+        on_write: Optional[Callable[[], None]] = None,
+    ):
+        self.state = state
+        self.name = kind
+        self.transient_keys = tuple(transient_keys)
+        self.on_write = on_write
+        self.loader: Optional[Callable[[str], Any]] = None
+
+    def _select(self, key: str) -> Any:
+        row = self.state.connect().execute(
+            "SELECT value FROM run_state WHERE kind = ? AND sim_id = ?", (self.name, key)
+        ).fetchone()
+        return _MISSING if row is None else json.loads(row[0])
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._select(key)
+        if value is not _MISSING:
+            return value
+        value = self.loader(key) if self.loader is not None else None
+        if value is None:
+            raise KeyError(key)
+        self[key] = value
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if self.transient_keys and isinstance(value, dict):
+            value = {k: v for k, v in value.items() if k not in self.transient_keys}
+        self.state.connect().execute(
+            "INSERT OR REPLACE INTO run_state (kind, sim_id, value, updated_at) VALUES (?,?,?,?)",
+            (self.name, key, json.dumps(value), time.time()),
+        )
+        if self.on_write is not None:
+            self.on_write()
+
+    def __delitem__(self, key: str) -> None:
+        if self.pop(key, _MISSING) is _MISSING:
+            raise KeyError(key)
+
+    def pop(self, key: str, default: Any = _MISSING) -> Any:
+        """Remove ``key`` without reloading it first."""
+        value = self._select(key)
+        if value is not _MISSING:
+            self.state.connect().execute(
+                "DELETE FROM run_state WHERE kind = ? AND sim_id = ?", (self.name, key)
+            )
+            return value
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def peek(self, key: str, default: Any = None) -> Any:
+        value = self._select(key)
+        return default if value is _MISSING else value
+
+    def __iter__(self) -> Iterator[str]:
+        rows = self.state.connect().execute(
+            "SELECT sim_id FROM run_state WHERE kind = ?", (self.name,)
+        ).fetchall()
+        return iter([row[0] for row in rows])
+
+    def __len__(self) -> int:
+        return self.state.connect().execute(
+            "SELECT COUNT(*) FROM run_state WHERE kind = ?", (self.name,)
+        ).fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        entries, size = self.state.connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM run_state WHERE kind = ?",
+            (self.name,),
+        ).fetchone()
+        return {"backend": "sqlite", "entries": entries, "bytes": size, "ttl_s": self.state.ttl_s}
+
+
+class SQLiteFrameLog:
+    """FrameLog interface over the run_frames rows of one simulation."""
+
+    def __init__(self, state: SQLiteRunState, sim_id: str, metrics: Sequence[str]):
+        self.state = state
+        self.sim_id = sim_id
+        self.metrics: tuple[str, ...] = tuple(metrics)
+
+    def __len__(self) -> int:
+        return self.state.connect().execute(
+            "SELECT COALESCE(MAX(idx) + 1, 0) FROM run_frames WHERE sim_id = ?", (self.sim_id,)
+        ).fetchone()[0]
+
+    @property
+    def nbytes(self) -> int:
+        return 0    # lives on disk
+
+    def append(self, seed: int, seed_step: int, values: Sequence[float]) -> None:
+        """Record one step of ``seed``; only the run's owning worker appends."""
+        self.state.connect().execute(
+            "INSERT INTO run_frames (sim_id, idx, seed, seed_step, vals) "
+            "VALUES (?, (SELECT COALESCE(MAX(idx) + 1, 0) FROM run_frames WHERE sim_id = ?), ?, ?, ?)",
+            (self.sim_id, self.sim_id, int(seed), int(seed_step), json.dumps(list(values))),
+        )
+
+    def append_row(self, seed: int, seed_step: int, recorder, row: int) -> None:
+        """Record row ``row`` of ``recorder``; other workers read it, so it is copied."""
+        self.append(seed, seed_step, recorder.view(row, row + 1)[0].tolist())
+
+    def since(self, since_step: int, stop: int | None = None) -> Dict[str, Any]:
+        """Columnar frames for global steps ``since_step + 1 .. stop``."""
+        n = len(self)
+        stop = n if stop is None else min(stop, n)
+        start = max(0, min(since_step, stop))
+        rows = self.state.connect().execute(
+            "SELECT seed, seed_step, vals FROM run_frames "
+            "WHERE sim_id = ? AND idx >= ? AND idx < ? ORDER BY idx",
+            (self.sim_id, start, stop),
+        ).fetchall()
+        values = [json.loads(row[2]) for row in rows]
+        return {
+            "steps":      list(range(start + 1, start + len(rows) + 1)),
+            "seeds":      [row[0] for row in rows],
+            "seed_steps": [row[1] for row in rows],
+            "metrics": {
+                name: [row[i] for row in values] for i, name in enumerate(self.metrics)
+            },
+        }
+
+
+class SQLiteFrameLogs(MutableMapping):
+    """``sim_id -> SQLiteFrameLog`` mapping; assigning a FrameLog copies its frames."""
+
+    name = "frame_logs"
+
+    def __init__(self, state: SQLiteRunState):
+        self.state = state
+        self._meta = JSONTable(state, "frame_log")    # sim_id -> metric names
+
+    def __getitem__(self, key: str) -> SQLiteFrameLog:
+        metrics = self._meta.peek(key)
+        if metrics is None:
+            raise KeyError(key)
+        return SQLiteFrameLog(self.state, key, metrics)
+
+    def __setitem__(self, key: str, log) -> None:
+        conn = self.state.connect()
+        with _transaction(conn):
+            conn.execute("DELETE FROM run_frames WHERE sim_id = ?", (key,))
+            self._meta[key] = list(log.metrics)
+            if len(log):
+                frames = log.since(0)
+                columns = [frames["metrics"][name] for name in log.metrics]
+                conn.executemany(
+                    "INSERT INTO run_frames (sim_id, idx, seed, seed_step, vals) VALUES (?,?,?,?,?)",
+                    [
+                        (key, i, seed, seed_step, json.dumps([col[i] for col in columns]))
+                        for i, (seed, seed_step) in enumerate(zip(frames["seeds"], frames["seed_steps"]))
+                    ],
+                )
+
+    def __delitem__(self, key: str) -> None:
+        if self.pop(key, None) is None:
+            raise KeyError(key)
+
+    def pop(self, key: str, default: Any = _MISSING) -> Any:
+        try:
+            log = self[key]
+        except KeyError:
+            if default is _MISSING:
+                raise
+            return default
+        self._meta.pop(key, None)
+        self.state.connect().execute("DELETE FROM run_frames WHERE sim_id = ?", (key,))
+        return log
+
+    def peek(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key: str, default=None) -> SQLiteFrameLog:
+        """Like dict.setdefault, but always returns the SQLite-backed log."""
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._meta)
+
+    def __len__(self) -> int:
+        return len(self._meta)
+
+    def stats(self) -> Dict[str, Any]:
+        entries, size = self.state.connect().execute(
+            "SELECT COUNT(DISTINCT sim_id), COALESCE(SUM(LENGTH(vals)), 0) FROM run_frames"
+        ).fetchone()
+        return {"backend": "sqlite", "entries": entries, "bytes": size, "ttl_s": self.state.ttl_s}
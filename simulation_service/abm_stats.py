@@ -0,0 +1,163 @@
+"""Online cross-seed statistics for multi-seed ABM runs."""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+# Two-sided 95% Student-t critical values for 1..30 degrees of freedom;
+# beyond that the normal 1.96 is within 2%.
+_T95 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)
+
+
+def t95(dof: int) -> float:
+    """Two-sided 95% t critical value for ``dof`` degrees of freedom."""
+    if dof < 1:
+        return math.nan
+    return _T95[dof - 1] if dof <= len(_T95) else 1.96
+
+
+class P2Quantile:
+    """Jain & Chlamtac P² estimate of one quantile over a grid of cells.
+
+    Every cell of a ``shape``-sized array sees one observation per ``add()``
+    (one seed's value for that step / metric).  The first ``WARMUP``
+    observations are kept and answered exactly; the five P² markers are then
+    seeded from their quantiles, so memory stays constant however many seeds
+    follow.
+    """
+
+    WARMUP = 16
+
+    def __init__(self, p: float, shape: Sequence[int]):
+        self.p = p
+        self.count = 0
+        self._warm = np.zeros((self.WARMUP, *shape))
+        self._fractions = np.array([0.0, p / 2, p, (1 + p) / 2, 1.0])
+        self._expand = (...,) + (None,) * len(shape)
+        self.q: np.ndarray | None = None        # marker heights, (5, *shape)
+        self.n: np.ndarray | None = None        # marker positions
+        self.desired: np.ndarray | None = None  # desired marker positions
+
+    def _start_markers(self) -> None:
+        self.q = np.quantile(self._warm, self._fractions, axis=0)
+        positions = (self.WARMUP - 1) * self._fractions[self._expand]
+        self.n = np.broadcast_to(positions, self.q.shape).copy()
+        self.desired = self.n.copy()
+        self._warm = None
+
+    def add(self, x: np.ndarray) -> None:
+        if self.count < self.WARMUP:
+            self._warm[self.count] = x
+            self.count += 1
+            if self.count == self.WARMUP:
+                self._start_markers()
+            return
+        self.count += 1
+        q, n = self.q, self.n
+
+        # Extend the outer markers, then shift positions above x's cell.
+        np.minimum(q[0], x, out=q[0])
+        np.maximum(q[4], x, out=q[4])
+        cell = (x[None] >= q[1:4]).sum(axis=0)          # x in [q[cell], q[cell + 1])
+        n += np.arange(5)[self._expand] > cell[None]
+        self.desired += self._fractions[self._expand]
+
+        # Nudge the three middle markers toward their desired positions.
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            move = ((d >= 1) & (n[i + 1] - n[i] > 1)) | ((d <= -1) & (n[i - 1] - n[i] < -1))
+            if not move.any():
+                continue
+            d = np.where(move, np.sign(d), 0.0)
+            span_up, span_down = n[i + 1] - n[i], n[i] - n[i - 1]
+            parabolic = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                (span_down + d) * (q[i + 1] - q[i]) / span_up
+                + (span_up - d) * (q[i] - q[i - 1]) / span_down
+            )
+            neighbour = np.where(d > 0, q[i + 1], q[i - 1])
+            neighbour_n = np.where(d > 0, n[i + 1], n[i - 1])
+            linear = q[i] + d * (neighbour - q[i]) / np.where(move, neighbour_n - n[i], 1.0)
+            ok = (q[i - 1] < parabolic) & (parabolic < q[i + 1])
+            q[i] = np.where(move, np.where(ok, parabolic, linear), q[i])
+            n[i] += d
+
+    def value(self) -> np.ndarray:
+        if self.count == 0:
+            return np.zeros(self._warm.shape[1:])
+        if self.count < self.WARMUP:
+            return np.quantile(self._warm[: self.count], self.p, axis=0)
+        return self.q[2].copy()
+
+
+class OnlineStepStats:
+    """Welford mean / variance plus P² quantiles per step and metric.
+
+    ``add()`` folds in one finished seed's ``(n_steps, n_metrics)`` series;
+    nothing per seed is kept, so memory is O(n_steps × n_metrics) whatever
+    ``n_runs`` is, and ``summary()`` can be published after any seed.
+    Seeds must be added in a fixed order (seed index) for results to be
+    bit-identical across execution modes.
+    """
+
+    QUANTILES = (0.10, 0.50, 0.90)
+
+    def __init__(self, metrics: Sequence[str], n_steps: int):
+        self.metrics: tuple[str, ...] = tuple(metrics)
+        shape = (n_steps, len(self.metrics))
+        self.count = 0
+        self.mean = np.zeros(shape)
+        self._m2 = np.zeros(shape)
+        self._quantiles = [P2Quantile(p, shape) for p in self.QUANTILES]
+
+    def add(self, series: np.ndarray) -> None:
+        x = np.asarray(series, dtype=np.float64)
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        for sketch in self._quantiles:
+            sketch.add(x)
+
+    def std(self) -> np.ndarray:
+        """Sample standard deviation across seeds (0 with fewer than two)."""
+        if self.count < 2:
+            return np.zeros_like(self.mean)
+        return np.sqrt(self._m2 / (self.count - 1))
+
+    def ci95(self) -> np.ndarray:
+        """Half-width of the 95% confidence interval of the mean (t-based)."""
+        if self.count < 2:
+            return np.zeros_like(self.mean)
+        return t95(self.count - 1) * self.std() / math.sqrt(self.count)
+
+    def _columns(self, block: np.ndarray) -> Dict[str, List[float]]:
+        return {name: block[:, i].tolist() for i, name in enumerate(self.metrics)}
+
+    def _last(self, block: np.ndarray) -> Dict[str, float]:
+        if not len(block):
+            return {name: 0.0 for name in self.metrics}
+        return dict(zip(self.metrics, block[-1].tolist()))
+
+    def summary(self) -> Dict[str, object]:
+        """JSON-ready per-step aggregates over the seeds added so far."""
+        std, ci95 = self.std(), self.ci95()
+        p10, p50, p90 = (sketch.value() for sketch in self._quantiles)
+        return {
+            "seeds_done":    self.count,
+            "mean_by_step":  self._columns(self.mean),
+            "std_by_step":   self._columns(std),
+            "ci95_by_step":  self._columns(ci95),
+            "p10_by_step":   self._columns(p10),
+            "p50_by_step":   self._columns(p50),
+            "p90_by_step":   self._columns(p90),
+            "mean_final":    self._last(self.mean),
+            "std_final":     self._last(std),
+            "ci95_final":    self._last(ci95),
+        }
@@ -0,0 +1,217 @@
+"""Memory-bounded in-process stores for run state and results."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, Optional
+
+_MISSING = object()
+
+# Upper bound on remembered loader misses per store.
+_MAX_NEGATIVE_ENTRIES = 4096
+
+
+def approx_size(obj: Any) -> int:
+    """Rough resident size of a JSON-like value in bytes.
+
+    Objects exposing an integer ``nbytes`` (numpy arrays, MetricRecorder,
+    FrameLog) report themselves; containers are walked.
+    """
+    nbytes = getattr(obj, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(approx_size(k) + approx_size(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(approx_size(v) for v in obj)
+    return sys.getsizeof(obj)
+
+
+class BoundedStore(MutableMapping):
+    """Dict-like store with byte accounting, TTL for finished entries and LRU eviction.
+
+    ``finished(key, value)`` tells whether an entry belongs to a finished
+    run; only finished entries expire (``ttl_s`` after they were first seen
+    finished) or are evicted, least recently used first, once the store
+    holds more than ``max_bytes``.  Entries of running simulations are never
+    dropped.  ``on_evict(key, value)`` runs for every dropped entry (e.g. to
+    spill it to SQLite), and ``loader(key)`` — if set — transparently
+    reloads a missing key, returning None when it has nothing either.
+    Such misses are remembered for ``miss_ttl_s`` (or until the key is
+    written), so polling an unknown key does not hit the loader every time.
+
+    Entries mutated in place (a growing FrameLog or recorder) are re-sized
+    and re-checked for completion by a sweep that runs at most every
+    ``sweep_interval_s`` on writes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_bytes: int,
+        ttl_s: float = 3600.0,
+        finished: Callable[[str, Any], bool] = lambda key, value: True,
+        loader: Optional[Callable[[str], Any]] = None,
+        on_evict: Optional[Callable[[str, Any], None]] = None,
+        sweep_interval_s: float = 1.0,
+        miss_ttl_s: float = 5.0,
+    ):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self.finished = finished
+        self.loader = loader
+        self.on_evict = on_evict
+        self.sweep_interval_s = sweep_interval_s
+        self.miss_ttl_s = miss_ttl_s
+        self._lock = threading.RLock()
+        # key -> [value, size_bytes, finished_at or None], in LRU order
+        self._entries: "OrderedDict[str, list]" = OrderedDict()
+        self._bytes = 0
+        # key -> monotonic deadline of a remembered loader miss
+        self._misses: "OrderedDict[str, float]" = OrderedDict()
+        self._last_sweep = 0.0
+        self.evictions = 0
+        self.expirations = 0
+        self.reloads = 0
+
+    # ── Mapping protocol ───────────────────────────────────────────────────
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[0]
+            if self.loader is None or self._misses.get(key, 0.0) > time.monotonic():
+                raise KeyError(key)
+        value = self.loader(key)
+        if value is None:
+            with self._lock:
+                self._misses.pop(key, None)
+                self._misses[key] = time.monotonic() + self.miss_ttl_s
+                if len(self._misses) > _MAX_NEGATIVE_ENTRIES:
+                    self._misses.popitem(last=False)
+            raise KeyError(key)
+        with self._lock:
+            self.reloads += 1
+            if key not in self._entries:
+                self._put(key, value)
+            return self._entries[key][0]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        size = approx_size(value)
+        finished_at = time.monotonic() if self.finished(key, value) else None
+        with self._lock:
+            self._misses.pop(key, None)
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+                if finished_at is not None and old[2] is not None:
+                    finished_at = old[2]
+            self._entries[key] = [value, size, finished_at]
+            self._bytes += size
+        self._maybe_sweep()
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(key)
+            self._bytes -= entry[1]
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def pop(self, key: str, default: Any = _MISSING) -> Any:
+        """Remove ``key`` from memory without reloading it first."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+                return entry[0]
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def peek(self, key: str, default: Any = None) -> Any:
+        """Value in memory for ``key`` without reloading or touching recency."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return default if entry is None else entry[0]
+
+    # ── Accounting / eviction ──────────────────────────────────────────────
+
+    def _put(self, key: str, value: Any) -> None:
+        size = approx_size(value)
+        finished_at = time.monotonic() if self.finished(key, value) else None
+        self._entries[key] = [value, size, finished_at]
+        self._bytes += size
+
+    def _maybe_sweep(self) -> None:
+        # Over budget, sweep promptly — but not on every write, since running
+        # entries that alone exceed the budget cannot be evicted.
+        now = time.monotonic()
+        interval = self.sweep_interval_s
+        if self._bytes > self.max_bytes:
+            interval = min(interval, 0.01)
+        if now - self._last_sweep >= interval:
+            self.sweep(now)
+
+    def sweep(self, now: Optional[float] = None) -> None:
+        """Refresh running entries, expire stale finished ones, trim to ``max_bytes``."""
+        now = time.monotonic() if now is None else now
+        dropped = []
+        with self._lock:
+            self._last_sweep = now
+            for key, entry in self._entries.items():
+                if entry[2] is None:
+                    size = approx_size(entry[0])
+                    self._bytes += size - entry[1]
+                    entry[1] = size
+                    if self.finished(key, entry[0]):
+                        entry[2] = now
+            for key, entry in list(self._entries.items()):
+                if entry[2] is not None and now - entry[2] > self.ttl_s:
+                    dropped.append((key, self._drop(key)))
+                    self.expirations += 1
+            if self._bytes > self.max_bytes:
+                for key, entry in list(self._entries.items()):
+                    if self._bytes <= self.max_bytes:
+                        break
+                    if entry[2] is not None:
+                        dropped.append((key, self._drop(key)))
+                        self.evictions += 1
+        if self.on_evict is not None:
+            for key, value in dropped:
+                self.on_evict(key, value)
+
+    def _drop(self, key: str) -> Any:
+        value, size, _ = self._entries.pop(key)
+        self._bytes -= size
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries":     len(self._entries),
+                "bytes":       self._bytes,
+                "max_bytes":   self.max_bytes,
+                "ttl_s":       self.ttl_s,
+                "evictions":   self.evictions,
+                "expirations": self.expirations,
+                "reloads":     self.reloads,
+            }
@@ -0,0 +1,56 @@
+"""Wake-up notifications from ABM worker threads to streaming endpoints."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Dict, Set, Tuple
+
+
+_Waiter = Tuple[asyncio.AbstractEventLoop, asyncio.Event]
+
+
+class RunNotifier:
+    """Tells async stream handlers that a simulation has new state.
+
+    Simulation threads call ``notify()`` after every step; it only schedules
+    ``Event.set`` on each subscriber's event loop, so it never blocks the
+    simulation no matter how slow a consumer is.  Subscribers then read the
+    new frames from the simulation's FrameLog.  Notifications coalesce — a
+    subscriber that falls behind wakes once and picks up everything it
+    missed — so each subscriber buffers at most one pending wake-up.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters: Dict[str, Set[_Waiter]] = {}
+
+    def subscribe(self, simulation_id: str) -> _Waiter:
+        """Register the running event loop for wake-ups on ``simulation_id``."""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            self._waiters.setdefault(simulation_id, set()).add(waiter)
+        return waiter
+
+    def unsubscribe(self, simulation_id: str, waiter: _Waiter) -> None:
+        with self._lock:
+            waiters = self._waiters.get(simulation_id)
+            if waiters is not None:
+                waiters.discard(waiter)
+                if not waiters:
+                    del self._waiters[simulation_id]
+
+    def notify(self, simulation_id: str) -> None:
+        """Wake every subscriber of ``simulation_id`` (thread-safe, non-blocking)."""
+        with self._lock:
+            waiters = tuple(self._waiters.get(simulation_id, ()))
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # Loop already closed — the stream is gone; its finally
+                # block (or shutdown) removes the waiter.
+                pass
+
+
+run_notifier = RunNotifier()
@@ -0,0 +1,93 @@
+"""Parameter-sweep helpers: grid expansion and server-side variant ranking."""
+
+from __future__ import annotations
+
+import itertools
+from typing import Any, Dict, List, Mapping, Sequence
+
+# Default priority weights (percent), as in the ResourceOptimizer sliders.
+DEFAULT_WEIGHTS = {
+    "employment":     25.0,
+    "welfare":        25.0,
+    "infrastructure": 25.0,
+    "environment":    25.0,
+}
+
+
+def expand_grid(grid: Mapping[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Cartesian product of ``{field: [values, ...]}`` as a list of overrides."""
+    if not grid:
+        return []
+    fields = sorted(grid)
+    return [dict(zip(fields, values)) for values in itertools.product(*(grid[f] for f in fields))]
+
+
+def variant_name(overrides: Mapping[str, Any]) -> str:
+    """Stable display name for a grid point, e.g. ``infra_spend=2000, subsidy_pct=0.1``."""
+    return ", ".join(f"{field}={overrides[field]}" for field in sorted(overrides))
+
+
+# Metrics variant_deltas() reads; a sweep records at least these.
+RANKING_METRICS = ("unemployment_rate", "avg_welfare", "infrastructure_score", "env_score")
+
+
+def variant_deltas(mean_by_step: Mapping[str, Sequence[float]]) -> Dict[str, float]:
+    """First-to-last-step changes, same fields as ResourceOptimizer's extractDeltas."""
+    def first(name):
+        series = mean_by_step.get(name) or []
+        return series[0] if series else 0.0
+
+    def last(name):
+        series = mean_by_step.get(name) or []
+        return series[-1] if series else 0.0
+
+    return {
+        "empDelta":  (1 - last("unemployment_rate")) * 100 - (1 - first("unemployment_rate")) * 100,
+        "welDelta":  last("avg_welfare") - first("avg_welfare"),
+        "infDelta":  last("infrastructure_score") - first("infrastructure_score"),
+        "envDelta":  last("env_score") - first("env_score"),
+        "empStart":  (1 - first("unemployment_rate")) * 100,
+        "empFinal":  (1 - last("unemployment_rate")) * 100,
+        "welStart":  first("avg_welfare"),
+        "welFinal":  last("avg_welfare"),
+        "infStart":  first("infrastructure_score"),
+        "infFinal":  last("infrastructure_score"),
+        "envStart":  first("env_score"),
+        "envFinal":  last("env_score"),
+    }
+
+
+# Normalisation rationale (empirical ranges, 120 agents, 20 steps):
+#
+#   empDelta  — already in percentage points          → typical range  10–22 pp
+#   welDelta  — raw 0–1 index delta, × 200            → typical range  19–43 pp
+#               (× 100 gave 9–21 pp — welfare was structurally half the scale
+#                of infra/env, so × 200 corrects the imbalance)
+#   infDelta  — 0–100 score delta, unscaled           → typical range -12 to +17 pp
+#   envDelta  — 0–100 score delta, unscaled           → typical range  -7 to  +8 pp
+#
+# All four sit in a broadly comparable range, so the priority weights rather
+# than raw metric scale decide the ranking.
+def composite_score(deltas: Mapping[str, float], weights: Mapping[str, float]) -> float:
+    """Weighted sum of normalised metric deltas; weights are percentages."""
+    return (
+        deltas["empDelta"] * weights.get("employment", 0.0)
+        + deltas["welDelta"] * 200 * weights.get("welfare", 0.0)
+        + deltas["infDelta"] * weights.get("infrastructure", 0.0)
+        + deltas["envDelta"] * weights.get("environment", 0.0)
+    ) / 100
+
+
+def rank_variants(
+    variants: Sequence[Mapping[str, Any]],
+    weights: Mapping[str, float],
+) -> List[Dict[str, Any]]:
+    """Score every variant summary and return them best first with ``rank``."""
+    scored = []
+    for variant in variants:
+        deltas = variant_deltas(variant["mean_by_step"])
+        scored.append({**variant, "deltas": deltas, "score": composite_score(deltas, weights)})
+    scored.sort(key=lambda v: v["score"], reverse=True)
+    for rank, variant in enumerate(scored, start=1):
+        variant["rank"] = rank
+    return scored
@@ -0,0 +1,403 @@
+"""Struct-of-arrays NumPy engines for the additive ABM simulation flow.
+
+Mirror the behaviour of ``CivicABMModel`` (see abm_model.py) but keep all
+per-agent state in NumPy arrays and advance each phase as one batched array
+operation instead of calling ``Agent.step()`` on every Mesa agent.
+
+``EnsembleCivicABMModel`` holds many independent replicates as 2-D
+``(replicates, agents)`` arrays and advances them together; it backs
+multi-seed runs with ``engine="ensemble"``.  ``VectorizedCivicABMModel`` is
+its one-replicate case, selected per run with ``engine="numpy"``.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Sequence
+
+import numpy as np
+
+try:
+    from .abm_agents import EnvironmentAgent, InfrastructureAgent, Worker
+    from .abm_metrics import metric_stages, resolve_metrics
+    from .abm_recorder import MetricRecorder
+    from .abm_scenario import compile_scenario
+except ImportError:
+    from abm_agents import EnvironmentAgent, InfrastructureAgent, Worker
+    from abm_metrics import metric_stages, resolve_metrics
+    from abm_recorder import MetricRecorder
+    from abm_scenario import compile_scenario
+
+
+class EnsembleCivicABMModel:
+    """Array-backed twin of ``CivicABMModel`` advancing many replicates at once.
+
+    Worker state (employed / income / skill / base_income), household rent and
+    membership, and firm openings live in ``(n_replicates, n_agents)`` arrays;
+    government levers and scores are ``(n_replicates,)`` vectors.  ``step()``
+    keeps the Mesa model's phase order — Government, Infrastructure/
+    Environment, the shuffled labour market and households, rent index —
+    so the ``ALL_METRICS`` time series match the Mesa path statistically (not
+    draw-for-draw: the engines consume random numbers in a different order).
+
+    Each replicate owns its own ``numpy.random.Generator`` and draws the same
+    shapes in the same order as a one-replicate model, so replicate ``r``
+    reproduces ``VectorizedCivicABMModel(seed=seeds[r])`` exactly while the
+    per-step interpreter overhead is paid once for the whole ensemble.
+    """
+
+    # Random worker ids drawn per firm per step when sampling a hire from the
+    # unemployed pool; a full scan is only needed if none of them is unemployed.
+    HIRE_CANDIDATES = 32
+
+    def __init__(
+        self,
+        seeds: Sequence[int | None] = (None,),
+        n_workers: int = 120,
+        n_firms: int = 20,
+        n_households: int = 45,
+        job_find_prob: float = 0.3,
+        move_prob: float = 0.1,
+        subsidy_pct: float = 0.1,
+        infra_spend: float = 1000.0,
+        training_budget: float = 500.0,
+        firm_hiring_rate: float = 0.3,
+        scenario: str = '',
+        record_capacity: int = 64,
+        metrics: Sequence[str] | None = None,
+    ):
+        self.rngs = [np.random.default_rng(seed) for seed in seeds]
+        self.n_replicates = n_reps = len(self.rngs)
+        self._reps = np.arange(n_reps)
+        self.steps = 0
+
+        self.job_find_prob = job_find_prob
+        self.move_prob = move_prob
+        self.firm_hiring_rate = firm_hiring_rate
+        self.migration_count = np.zeros(n_reps, dtype=np.int64)
+        self.rent_index = np.ones(n_reps)
+        self.scenario = scenario or ''
+        self.government_spending_multiplier = 1.0
+
+        # ── Government levers (one government per replicate) ─────────────
+        self.subsidy_pct = np.full(n_reps, subsidy_pct, dtype=np.float64)
+        self.infra_spend = np.full(n_reps, infra_spend, dtype=np.float64)
+        self.training_budget = np.full(n_reps, training_budget, dtype=np.float64)
+
+        # The compiled scenario never changes during a run.
+        self.policy = compile_scenario(self.scenario)
+        self._stance_multiplier = self.policy.spending_multiplier
+        self._infra_boost = 0.6 if self.policy.infra else 0.0
+        self._green_boost = 0.8 if self.policy.green else 0.0
+
+        # ── Workers ──────────────────────────────────────────────────────
+        self.n_workers = n_workers
+        self.employed = self._draw(lambda rng: rng.random(n_workers)) < 0.60
+        self.base_income = self._draw(lambda rng: rng.uniform(900.0, 1300.0, n_workers))
+        self.skill = self._draw(lambda rng: rng.uniform(0.3, 1.0, n_workers))
+        self.income = np.where(self.employed, self.base_income, 0.0)
+
+        # ── Firms ────────────────────────────────────────────────────────
+        self.n_firms = n_firms
+        self.openings = self._draw(lambda rng: rng.integers(1, 5, n_firms))
+        self.hiring_rate = np.full((n_reps, n_firms), firm_hiring_rate, dtype=np.float64)
+
+        # ── Households ──────────────────────────────────────────────────
+        # Membership is stored as parallel (household, worker) index arrays so
+        # household income is a single weighted bincount.  Same slicing as
+        # CivicABMModel, including the one-random-worker fallback for
+        # households past the end of the worker list — drawn per replicate,
+        # hence the (replicates, members) shape of ``member_worker``.
+        self.n_households = n_households
+        household_size = max(1, n_workers // max(1, n_households))
+        owners: list[np.ndarray] = []
+        members: list[np.ndarray] = []
+        for idx in range(n_households):
+            start = idx * household_size
+            end = min(n_workers, start + household_size)
+            if start < n_workers:
+                block = np.broadcast_to(np.arange(start, end), (n_reps, end - start))
+            elif n_workers:
+                block = self._draw(lambda rng: rng.integers(0, n_workers, 1))
+            else:
+                block = np.empty((n_reps, 0), dtype=np.int64)
+            members.append(block)
+            owners.append(np.full(block.shape[1], idx, dtype=np.int64))
+        self.member_worker = (
+            np.concatenate(members, axis=1) if members else np.empty((n_reps, 0), dtype=np.int64)
+        )
+        self.member_household = np.concatenate(owners) if owners else np.empty(0, dtype=np.int64)
+        # Flat (replicate, household) bin of every membership entry, so one
+        # bincount sums household income across the whole ensemble.
+        self._member_bin = (
+            self._reps[:, None] * n_households + self.member_household
+        ).ravel()
+        self.rent = self._draw(lambda rng: rng.uniform(300.0, 650.0, n_households))
+        self.moved_this_step = np.zeros((n_reps, n_households), dtype=bool)
+        self.worker_pos = np.zeros((n_reps, n_workers))
+
+        # ── Infrastructure and Environment scores ────────────────────────
+        self.infrastructure_score = np.full(n_reps, 50.0)
+        self.env_score = np.full(n_reps, 60.0)
+
+        # Reporters return one value per replicate; each replicate records
+        # its requested metrics (abm_metrics.resolve_metrics) into its own
+        # MetricRecorder.
+        reporters = {
+            "unemployment_rate":    lambda model: model.unemployment_rate(),
+            "avg_income":           lambda model: model.avg_income(),
+            "migration_count":      lambda model: model.migration_count,
+            "rent_index":           lambda model: model.rent_index,
+            "avg_welfare":          lambda model: model.avg_welfare(),
+            "infrastructure_score": lambda model: model.infrastructure_score,
+            "env_score":            lambda model: model.env_score,
+        }
+        self.metrics = resolve_metrics(metrics)
+        self.model_reporters = {name: reporters[name] for name in self.metrics}
+        self._track_rent = "rent" in metric_stages(self.metrics)
+        self.recorders = [
+            MetricRecorder(self.model_reporters, capacity=record_capacity)
+            for _ in range(n_reps)
+        ]
+
+    def _draw(self, sample: Callable[[np.random.Generator], np.ndarray]) -> np.ndarray:
+        """Stack one ``sample(rng)`` per replicate, each from its own stream."""
+        return np.stack([sample(rng) for rng in self.rngs])
+
+    # ── Aggregates (one value per replicate) ────────────────────────────────
+
+    def unemployment_rate(self) -> np.ndarray:
+        """Fraction of workers currently unemployed."""
+        if not self.n_workers:
+            return np.zeros(self.n_replicates)
+        return 1.0 - np.count_nonzero(self.employed, axis=1) / self.n_workers
+
+    def avg_income(self) -> np.ndarray:
+        """Average worker income for the current step."""
+        if not self.n_workers:
+            return np.zeros(self.n_replicates)
+        return self.income.mean(axis=1)
+
+    def avg_welfare(self) -> np.ndarray:
+        """Welfare index in [0, 1]: combines employment rate and normalised income."""
+        if not self.n_workers:
+            return np.zeros(self.n_replicates)
+        employment_rate = 1.0 - self.unemployment_rate()
+        income_score = np.minimum(1.0, self.avg_income() / 1500.0)
+        return np.round((employment_rate * 0.6) + (income_score * 0.4), 4)
+
+    def household_incomes(self, member_income: np.ndarray | None = None) -> np.ndarray:
+        """Summed member income per household, shape ``(replicates, households)``.
+
+        ``member_income`` is one income per membership entry; it defaults to
+        each member's current income.
+        """
+        if member_income is None:
+            member_income = np.take_along_axis(self.income, self.member_worker, axis=1)
+        return np.bincount(
+            self._member_bin,
+            weights=member_income.ravel(),
+            minlength=self.n_replicates * self.n_households,
+        ).reshape(self.n_replicates, self.n_households)
+
+    def metric_cube(self) -> np.ndarray:
+        """Recorded metrics as one ``(replicates, steps, metrics)`` array."""
+        return np.stack([recorder.view() for recorder in self.recorders])
+
+    # ── Phases ──────────────────────────────────────────────────────────────
+
+    def _government_phase(self) -> None:
+        """Vector twin of ``Government.step``."""
+        slack = self.unemployment_rate() > 0.16
+        self.subsidy_pct = np.where(
+            slack,
+            np.minimum(0.3, self.subsidy_pct + 0.003),
+            np.maximum(0.02, self.subsidy_pct - 0.001),
+        )
+        self.training_budget = np.where(
+            slack, np.minimum(6000.0, self.training_budget + 15.0), self.training_budget
+        )
+
+        shock = np.array([rng.uniform(-30.0, 30.0) for rng in self.rngs])
+        self.infra_spend = np.maximum(250.0, self.infra_spend + shock)
+        self.government_spending_multiplier = self._stance_multiplier
+
+    def _infra_env_phase(self) -> None:
+        """Vector twin of ``InfrastructureAgent.step`` and ``EnvironmentAgent.step``."""
+        employed_count = np.count_nonzero(self.employed, axis=1)
+
+        infra_delta = (
+            InfrastructureAgent.GOV_INVESTMENT_BASE * self.government_spending_multiplier
+            + self._infra_boost
+            - InfrastructureAgent.DEPRECIATION_RATE
+            - employed_count * InfrastructureAgent.WORKER_DEMAND_FACTOR
+        )
+        self.infrastructure_score = np.clip(self.infrastructure_score + infra_delta, 0.0, 100.0)
+
+        env_delta = (
+            EnvironmentAgent.NATURAL_RECOVERY
+            + self._green_boost
+            - employed_count * EnvironmentAgent.PRODUCTION_DAMAGE
+        )
+        self.env_score = np.clip(self.env_score + env_delta, 0.0, 100.0)
+
+    def _labour_phase(self) -> None:
+        """Batched ``Worker.step`` / ``Firm.step`` in shuffled-schedule order.
+
+        The Mesa model activates workers, firms and households in one shuffled
+        list, so a firm sees some workers before and some after their own
+        step.  Each worker and firm gets a random activation position; workers
+        are grouped into the gaps between consecutive firms and each gap is
+        advanced as one array operation (for all replicates together), then
+        the firm after it hires.  Every draw has a fixed shape per step, so
+        two runs with the same seed stay on synchronised random streams even
+        when their parameters differ.
+        """
+        n, n_firms = self.n_workers, self.n_firms
+        n_reps, reps = self.n_replicates, self._reps
+        employed = self.employed
+
+        # Outcome of Worker.step for a worker that enters it employed
+        # (survives churn, or loses the job and re-finds one) or unemployed.
+        churn = self._draw(lambda rng: rng.random(n)) < Worker.JOB_LOSS_PROB
+        training_boost = np.minimum(0.2, self.training_budget / 10000.0)[:, None]
+        find_prob = np.minimum(1.0, self.job_find_prob + (0.08 * self.skill) + training_boost)
+        finds_job = self._draw(lambda rng: rng.random(n)) < find_prob
+        stays_employed = ~churn | finds_job
+
+        # Activation positions; worker_pos is also read by households.
+        self.worker_pos = self._draw(lambda rng: rng.random(n))
+        firm_pos = self._draw(lambda rng: rng.random(n_firms))
+        self.openings += self._draw(lambda rng: rng.random(n_firms)) < 0.30
+        gate = self._draw(lambda rng: rng.random(n_firms))
+        candidates = self._draw(
+            lambda rng: rng.integers(0, max(1, n), (n_firms, self.HIRE_CANDIDATES))
+        )
+        fallback_pick = self._draw(lambda rng: rng.random(n_firms))
+
+        # Gap k holds the workers activated between the k-th and (k+1)-th
+        # firm of their replicate; one stable sort groups every replicate's
+        # workers by gap as flat (replicate * n + worker) indices.
+        firm_order = np.argsort(firm_pos, axis=1)
+        sorted_pos = np.take_along_axis(firm_pos, firm_order, axis=1)
+        gap = np.stack([np.searchsorted(sorted_pos[r], self.worker_pos[r]) for r in range(n_reps)])
+        flat_order = np.argsort(gap.ravel(), kind="stable")
+        bounds = np.searchsorted(gap.ravel()[flat_order], np.arange(n_firms + 2))
+
+        # Employment right after each worker's own step: it sets their income
+        # (a worker hired after its activation keeps this step's support).
+        employed_at_step = employed.copy()
+        in_pool = ~employed
+        pool_size = np.count_nonzero(in_pool, axis=1)
+        for k in range(n_firms + 1):
+            flat = flat_order[bounds[k]:bounds[k + 1]]
+            if len(flat):
+                rep, idx = np.divmod(flat, n)
+                was_in_pool = in_pool[rep, idx]
+                now = np.where(employed[rep, idx], stays_employed[rep, idx], finds_job[rep, idx])
+                employed[rep, idx] = now
+                employed_at_step[rep, idx] = now
+                in_pool[rep, idx] = ~now
+                pool_size += np.bincount(rep, weights=(~now).astype(np.int64) - was_in_pool,
+                                         minlength=n_reps).astype(pool_size.dtype)
+            if k == n_firms:
+                break
+
+            firm = firm_order[:, k]
+            # P(at least one of the shuffled unemployed accepts); the accepted
+            # worker is uniform over the pool — same distribution as
+            # Firm.step's draw, without walking the queue.
+            hire_prob = 1.0 - (1.0 - self.hiring_rate[reps, firm]) ** pool_size
+            hiring = (pool_size > 0) & (self.openings[reps, firm] > 0) & (gate[reps, firm] < hire_prob)
+            if not hiring.any():
+                continue
+            rep, firm = reps[hiring], firm[hiring]
+            # Uniform pick from the pool: first pre-drawn candidate that is
+            # still unemployed, else an indexed pick from a full scan.
+            cand = candidates[rep, firm]
+            hits = in_pool[rep[:, None], cand]
+            worker = cand[np.arange(len(rep)), hits.argmax(axis=1)]
+            for i in np.flatnonzero(~hits.any(axis=1)):
+                r = rep[i]
+                worker[i] = np.flatnonzero(in_pool[r])[int(fallback_pick[r, firm[i]] * pool_size[r])]
+            # A worker hired before its own activation steps later as an
+            # employed worker; one hired after keeps this step's income.
+            employed[rep, worker] = True
+            in_pool[rep, worker] = False
+            pool_size[rep] -= 1
+            self.openings[rep, firm] -= 1
+
+        self._refresh_income(employed_at_step)
+
+    def _refresh_income(self, employed: np.ndarray) -> None:
+        """Recompute every worker's income from current levers and ``employed``."""
+        support = self.base_income * self.subsidy_pct[:, None]
+        infra_bonus = np.minimum(0.2, self.infra_spend / 20000.0)[:, None]
+        self.income = np.where(employed, self.base_income * (1 + infra_bonus), support)
+
+    def _household_phase(self, income_before: np.ndarray) -> None:
+        """Batched ``Household.step``.
+
+        A household activated before one of its members sees that member's
+        income from the previous step, as in the shuffled Mesa schedule.
+        """
+        h = self.n_households
+        household_pos = self._draw(lambda rng: rng.random(h))
+        member_stepped = (
+            np.take_along_axis(self.worker_pos, self.member_worker, axis=1)
+            < household_pos[:, self.member_household]
+        )
+        seen_income = np.where(
+            member_stepped,
+            np.take_along_axis(self.income, self.member_worker, axis=1),
+            np.take_along_axis(income_before, self.member_worker, axis=1),
+        )
+        unaffordable = self.household_incomes(seen_income) < self.rent * 3.0
+
+        under_pressure = self._draw(lambda rng: rng.random(h)) < 0.55
+        baseline_move = self._draw(lambda rng: rng.random(h)) < self.move_prob
+        drift = self._draw(lambda rng: rng.uniform(0.9, 1.06, h))
+        should_move = (unaffordable & under_pressure) | baseline_move
+        self.moved_this_step = should_move
+        self.migration_count += np.count_nonzero(should_move, axis=1)
+        self.rent = np.where(should_move, np.maximum(180.0, self.rent * drift), self.rent)
+
+    def _update_rent_index(self) -> None:
+        """Compute a bounded rent stress index from household affordability."""
+        if not self.n_households:
+            self.rent_index = np.ones(self.n_replicates)
+            return
+        pressure = self.rent / np.maximum(1.0, self.household_incomes())
+        self.rent_index = np.clip(1.0 + ((pressure.mean(axis=1) - 0.15) * 1.4), 0.5, 2.0)
+
+    def step(self):
+        """Advance every replicate one time step and collect its metrics.
+
+        Phase order follows ``CivicABMModel.step``: Government, then
+        Infrastructure & Environment on the previous tick's employment, then
+        workers, firms and households in shuffled order, then the rent index.
+        """
+        self._government_phase()
+        self._infra_env_phase()
+        # _refresh_income rebinds self.income, so this keeps last step's values.
+        income_before = self.income
+        self._labour_phase()
+        self._household_phase(income_before)
+        if self._track_rent:
+            self._update_rent_index()
+        self.steps += 1
+
+        values = np.column_stack([report(self) for report in self.model_reporters.values()])
+        for recorder, row in zip(self.recorders, values):
+            recorder.record(row)
+
+
+class VectorizedCivicABMModel(EnsembleCivicABMModel):
+    """Single-run NumPy engine: an ensemble of one replicate.
+
+    Takes the same ``seed=`` keyword as ``CivicABMModel`` and exposes that
+    replicate's ``recorder`` like the Mesa model does.
+    """
+
+    def __init__(self, *args, seed: int | None = None, **kwargs):
+        super().__init__((seed,), *args, **kwargs)
+        self.recorder = self.recorders[0]
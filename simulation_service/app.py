@@ -5,11 +5,10 @@ import json
 import os
 import sqlite3
 import uuid
-from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 import httpx
 from dotenv import load_dotenv
@@ -18,17 +17,27 @@ from dotenv import load_dotenv
 load_dotenv(Path(__file__).parent.parent / ".env")
 
 import numpy as np
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sklearn.ensemble import IsolationForest
 from sklearn.neighbors import LocalOutlierFactor
 
+from abm_cache import ResultCache, cache_key
+from abm_scheduler import BULK, INTERACTIVE, JobScheduler, SchedulerFull
+from abm_snapshot import SnapshotStore
+from abm_metrics import resolve_metrics
+from abm_scenario import compile_scenario
+from abm_store import BoundedStore
 from abm_runner import (
-    _live_results, _progress,
-    get_live_results, get_progress,
-    run_abm_multi_seed,
+    ALL_METRICS, SHARED_STATE, RunCancelled, _live_results, _progress, discard_run,
+    fork_overrides, get_live_frames, get_live_results, get_progress,
+    publish_complete, replay_result, request_cancel, reveal_delay, run_abm_multi_seed,
+    run_store_stats, run_abm_fork, run_abm_variants, shutdown_process_pool, unwatch_cancel, watch_cancel,
 )
+from abm_sweep import DEFAULT_WEIGHTS, RANKING_METRICS, expand_grid, rank_variants, variant_name
+from abm_stream import run_notifier
 from fraud_graph import analyze_fraud_graph
 from runner import run_single_simulation
 
@@ -54,14 +63,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Thread pool for background ABM runs.
-# The ABM uses time.sleep() per step -- it must NOT run on the event loop.
-# max_workers=8: 6 optimizer variants + 2 headroom for single-sim requests.
-_executor = ThreadPoolExecutor(max_workers=8)
+# Scheduler for background ABM runs.
+# ABM runs are CPU-bound -- they must NOT run on the event loop.  They
+# compute at full speed (step_delay_ms only paces delivery), so a worker is
+# held for the compute time alone.  Interactive /abm/simulate runs go ahead
+# of bulk variant batches and sweeps, and two workers are kept free of bulk
+# work; a full queue answers 429.
+abm_scheduler = JobScheduler(
+    max_workers=int(os.getenv("ABM_WORKERS", "8")),
+    max_queued=int(os.getenv("ABM_QUEUE_MAX", "64")),
+    max_running_per_client=int(os.getenv("ABM_CLIENT_MAX_RUNNING", "2")),
+    max_pending_per_client=int(os.getenv("ABM_CLIENT_MAX_PENDING", "8")),
+)
 
 # Ã¢â€â‚¬Ã¢â€â‚¬ In-memory fallback stores Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬
-simulation_store:     Dict[str, Dict[str, Any]] = {}
-abm_simulation_store: Dict[str, Dict[str, Any]] = {}
+# Bounded by RESULT_STORE_MEMORY_MB / RESULT_STORE_TTL_S (abm_store.py);
+# evicted records are reloaded from the simulations table on access.
+_RESULT_STORE_MAX_BYTES = int(os.getenv("RESULT_STORE_MEMORY_MB", "128")) * 1024 * 1024
+_RESULT_STORE_TTL_S = float(os.getenv("RESULT_STORE_TTL_S", "3600"))
+simulation_store = BoundedStore("simulation_store", _RESULT_STORE_MAX_BYTES, _RESULT_STORE_TTL_S)
+abm_simulation_store = BoundedStore("abm_simulation_store", _RESULT_STORE_MAX_BYTES, _RESULT_STORE_TTL_S)
 
 # Ã¢â€â‚¬Ã¢â€â‚¬ SQLite persistence Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬
 DB_PATH = Path(__file__).parent / "civictwin_results.db"
@@ -80,6 +101,32 @@ def _init_db() -> None:
             )
             """
         )
+        # Result-cache columns (see abm_cache.py), added to older databases.
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(simulations)")}
+        for column, ddl in (
+            ("cache_key",    "TEXT"),
+            ("size_bytes",   "INTEGER"),
+            ("last_used_at", "TEXT"),
+        ):
+            if column not in existing:
+                conn.execute(f"ALTER TABLE simulations ADD COLUMN {column} {ddl}")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_simulations_cache_key ON simulations (cache_key)"
+        )
+        # Model checkpoints for /abm/fork (see abm_snapshot.py).
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS abm_snapshots (
+                id           TEXT PRIMARY KEY,
+                step         INTEGER NOT NULL,
+                seed         INTEGER NOT NULL,
+                size_bytes   INTEGER NOT NULL,
+                created_at   TEXT NOT NULL,
+                last_used_at TEXT NOT NULL,
+                blob         BLOB NOT NULL
+            )
+            """
+        )
         conn.commit()
 
 
@@ -93,22 +140,36 @@ def _db():
         conn.close()
 
 
-def _save_simulation(sim_id: str, source: str, config: dict, results: dict) -> None:
+def _save_simulation(
+    sim_id: str,
+    source: str,
+    config: dict,
+    results: dict,
+    cache_key: Optional[str] = None,
+) -> int:
+    """Persist a run; returns the stored results size in bytes."""
     created_at = datetime.now(timezone.utc).isoformat()
+    results_json = json.dumps(results)
     with _db() as conn:
         conn.execute(
             "INSERT OR REPLACE INTO simulations "
-            "(id, created_at, source, config_json, results_json) VALUES (?,?,?,?,?)",
-            (sim_id, created_at, source, json.dumps(config), json.dumps(results)),
+            "(id, created_at, source, config_json, results_json, cache_key, size_bytes, last_used_at) "
+            "VALUES (?,?,?,?,?,?,?,?)",
+            (sim_id, created_at, source, json.dumps(config), results_json,
+             cache_key, len(results_json), created_at),
         )
         conn.commit()
+    return len(results_json)
 
 
-def _load_simulation(sim_id: str) -> Optional[dict]:
+def _load_simulation(sim_id: str, sources: Optional[tuple] = None) -> Optional[dict]:
+    """Stored run ``sim_id``; with ``sources``, only if its source is one of them."""
+    query, params = "SELECT * FROM simulations WHERE id = ?", (sim_id,)
+    if sources is not None:
+        query += f" AND source IN ({','.join('?' * len(sources))})"
+        params += tuple(sources)
     with _db() as conn:
-        row = conn.execute(
-            "SELECT * FROM simulations WHERE id = ?", (sim_id,)
-        ).fetchone()
+        row = conn.execute(query, params).fetchone()
     if row is None:
         return None
     return {
@@ -120,45 +181,97 @@ def _load_simulation(sim_id: str) -> Optional[dict]:
     }
 
 
-@app.on_event("startup")
-def startup():
-    _init_db()
-    key_status = "SET" if os.getenv("GEMINI_API_KEY") else "MISSING — using fallback"
-    print(f"[startup] GEMINI_API_KEY {key_status}")
+def _simulation_exists(sim_id: str) -> bool:
+    with _db() as conn:
+        row = conn.execute("SELECT 1 FROM simulations WHERE id = ?", (sim_id,)).fetchone()
+    return row is not None
 
 
-# Ã¢â€â‚¬Ã¢â€â‚¬ Scenario interpreter Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬
+# ABM result cache: memory LRU over the simulations table (abm_cache.py).
+result_cache = ResultCache(
+    _db,
+    max_memory_bytes=int(os.getenv("ABM_CACHE_MEMORY_MB", "64")) * 1024 * 1024,
+    max_disk_bytes=int(os.getenv("ABM_CACHE_DISK_MB", "512")) * 1024 * 1024,
+)
 
-def interpret_scenario(scenario: str) -> dict:
-    """Rule-based keyword Ã¢â€ â€™ ABM parameter mapping."""
-    if not scenario:
-        return {}
+# Fork checkpoints: LRU table next to the results, capped at SNAPSHOT_STORE_MB.
+snapshot_store = SnapshotStore(
+    _db, max_bytes=int(os.getenv("SNAPSHOT_STORE_MB", "256")) * 1024 * 1024,
+)
 
-    text   = scenario.lower()
-    params: dict = {}
 
-    if any(k in text for k in ("infra", "road", "bridge", "construction", "transport", "metro", "highway")):
-        params["infra_spend"] = params.get("infra_spend", 1000.0) + 3000.0
+# ── Store reloads ──────────────────────────────────────────────────────────
+# Finished records evicted from the in-memory stores come back from SQLite.
+_ABM_SOURCES = ("abm", "abm_variants", "abm_sweep", "abm_fork")
 
-    if any(k in text for k in ("train", "school", "education", "skill", "college", "university", "learn")):
-        params["training_budget"] = params.get("training_budget", 500.0) + 2000.0
 
-    if any(k in text for k in ("subsid", "welfare", "cash", "poor", "benefit", "stipend", "allowance")):
-        params["subsidy_pct"] = min(0.3, params.get("subsidy_pct", 0.1) + 0.08)
+def _record_loader(sources: tuple):
+    def load(sim_id: str) -> Optional[dict]:
+        row = _load_simulation(sim_id, sources)
+        return None if row is None else row["results"]
+    return load
 
-    if any(k in text for k in ("job", "employ", "work", "hire", "recruit", "labour", "labor")):
-        params["job_find_prob"]    = min(0.85, params.get("job_find_prob", 0.3) + 0.15)
-        params["firm_hiring_rate"] = min(0.7,  params.get("firm_hiring_rate", 0.3) + 0.15)
 
-    if any(k in text for k in ("cut", "auster", "reduce spend", "budget cut")):
-        params["infra_spend"]      = max(200.0, params.get("infra_spend", 1000.0) - 500.0)
-        params["training_budget"]  = max(100.0, params.get("training_budget", 500.0) - 200.0)
+def _spill_record(source: str):
+    """on_evict hook: persist a completed record that is not in SQLite yet."""
+    def spill(sim_id: str, record: dict) -> None:
+        if record.get("status") != "completed" or _simulation_exists(sim_id):
+            return
+        _save_simulation(sim_id, source, record.get("config") or {}, record)
+    return spill
 
-    if any(k in text for k in ("stimulus", "boost", "growth", "expand")):
-        params["job_find_prob"] = min(0.85, params.get("job_find_prob", 0.3) + 0.1)
-        params["infra_spend"]   = params.get("infra_spend", 1000.0) + 1000.0
 
-    return params
+def _completed_steps(results: dict) -> int:
+    n_steps, n_runs = int(results.get("n_steps") or 0), int(results.get("n_runs") or 1)
+    if "fork_step" in results:
+        fork_step = int(results["fork_step"])
+        return n_runs * (fork_step + len(results["branches"]) * (n_steps - fork_step))
+    runs = results.get("n_unique_runs") or len(results.get("variants") or [None])
+    return n_steps * n_runs * int(runs)
+
+
+def _load_progress(sim_id: str) -> Optional[dict]:
+    record = _record_loader(_ABM_SOURCES)(sim_id)
+    if record is None:
+        return None
+    steps = _completed_steps(record.get("results") or {})
+    return {"status": "complete", "steps_done": steps, "total_steps": steps, "pct": 100.0}
+
+
+def _load_live_results(sim_id: str) -> Optional[dict]:
+    record = _record_loader(_ABM_SOURCES)(sim_id)
+    if record is None or "results" not in record:
+        return None
+    results = record["results"]
+    return {"status": "complete", "steps_done": _completed_steps(results), "results": results}
+
+
+simulation_store.loader = _record_loader(("classic",))
+simulation_store.on_evict = _spill_record("classic")
+abm_simulation_store.loader = _record_loader(_ABM_SOURCES)
+abm_simulation_store.on_evict = _spill_record("abm")
+_progress.loader = _load_progress
+_live_results.loader = _load_live_results
+
+
+@app.on_event("startup")
+def startup():
+    _init_db()
+    key_status = "SET" if os.getenv("GEMINI_API_KEY") else "MISSING — using fallback"
+    print(f"[startup] GEMINI_API_KEY {key_status}")
+
+
+@app.on_event("shutdown")
+def shutdown():
+    abm_scheduler.shutdown()
+    shutdown_process_pool()
+
+
+# Ã¢â€â‚¬Ã¢â€â‚¬ Scenario interpreter Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬
+
+def interpret_scenario(scenario: str) -> dict:
+    """Lever overrides of the compiled scenario (abm_scenario.compile_scenario)."""
+    return compile_scenario(scenario).params()
 
 
 # Ã¢â€â‚¬Ã¢â€â‚¬ Pydantic models Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬
@@ -191,8 +304,69 @@ class ABMSimulationConfig(BaseModel):
     infra_spend:      float = 1000.0
     training_budget:  float = 500.0
     firm_hiring_rate: float = 0.3
-    step_delay_ms:    int   = 300   # Fix 4: inter-step pause for live visibility
+    step_delay_ms:    int   = 300   # display pacing of live frames; compute is not delayed
+    seed:             int   = 0     # root seed; each run's seed is spawned from it
     scenario:         Optional[str] = None
+    # numpy: array engine for large populations; ensemble: numpy with all seeds batched
+    engine:           Literal["mesa", "numpy", "ensemble"] = "mesa"
+    execution:        Literal["thread", "process"] = "thread"  # process: seeds in parallel on the process pool
+    # mesa only: split the population over n_districts shards that exchange
+    # migrating households each step; execution="process" runs the shards
+    # in parallel processes instead of seeds.
+    n_districts:      int   = 1
+    # mesa only: "compact" keeps agent state in typed columns behind slotted
+    # views — same numbers, far less memory per agent for large populations.
+    agent_storage:    Literal["mesa", "compact"] = "mesa"
+    # Metrics to compute and return (plus what they depend on, see
+    # abm_metrics.py); None = all of ALL_METRICS.
+    metrics:          Optional[List[str]] = None
+    use_cache:        bool  = True  # serve identical effective configs from the result cache
+    # Adaptive seed count: with target_ci95 set, n_runs is the batch size and
+    # seeds are added until the 95% CI half-width of target_metric's final
+    # value is <= target_ci95 (e.g. 0.005 = 0.5 pp unemployment) or max_runs.
+    target_ci95:      Optional[float] = None
+    target_metric:    str   = "unemployment_rate"
+    max_runs:         int   = 64
+
+
+class ABMVariant(BaseModel):
+    """One policy variant: a scenario and/or lever overrides on the batch base."""
+    name:             str
+    scenario:         Optional[str]   = None
+    job_find_prob:    Optional[float] = None
+    move_prob:        Optional[float] = None
+    subsidy_pct:      Optional[float] = None
+    infra_spend:      Optional[float] = None
+    training_budget:  Optional[float] = None
+    firm_hiring_rate: Optional[float] = None
+
+
+class ABMVariantBatch(BaseModel):
+    base:     ABMSimulationConfig = ABMSimulationConfig(engine="ensemble")
+    variants: List[ABMVariant]
+
+
+class ABMForkRequest(BaseModel):
+    """Shared prefix config, the step to fork at and the branches to run from it."""
+    base:      ABMSimulationConfig = ABMSimulationConfig()
+    fork_step: int
+    branches:  List[ABMVariant]
+
+
+class ABMSweepWeights(BaseModel):
+    """Priority weights (percent) for ranking sweep variants."""
+    employment:     float = DEFAULT_WEIGHTS["employment"]
+    welfare:        float = DEFAULT_WEIGHTS["welfare"]
+    infrastructure: float = DEFAULT_WEIGHTS["infrastructure"]
+    environment:    float = DEFAULT_WEIGHTS["environment"]
+
+
+class ABMSweepRequest(BaseModel):
+    """Base config plus named variants and/or a grid of lever / scenario values."""
+    base:     ABMSimulationConfig = ABMSimulationConfig(engine="ensemble")
+    variants: List[ABMVariant] = []
+    grid:     Dict[str, List[Any]] = {}   # e.g. {"infra_spend": [500, 2000], "subsidy_pct": [0.1, 0.3]}
+    weights:  ABMSweepWeights = ABMSweepWeights()
 
 
 class GraphData(BaseModel):
@@ -221,11 +395,13 @@ class AnomalyData(BaseModel):
 
 # Ã¢â€â‚¬Ã¢â€â‚¬ Background ABM job (Fix 1) Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬
 
-def _run_abm_job(sim_id: str, cfg: dict, interpreted_params: dict) -> None:
+def _run_abm_job(sim_id: str, cfg: dict, interpreted_params: dict, key: str) -> None:
     """Executed in a ThreadPoolExecutor thread.
 
-    Blocks freely (uses time.sleep per step). The event loop is NOT blocked,
-    so concurrent GET /progress and GET /results requests are served normally.
+    Computes at full speed; the event loop is NOT blocked, so concurrent
+    GET /progress and GET /results requests are served normally and reveal
+    the frames at the config's step_delay_ms pace.
+    The finished record is admitted to the result cache under ``key``.
     """
     try:
         result = run_abm_multi_seed(cfg, simulation_id=sim_id)
@@ -236,16 +412,169 @@ def _run_abm_job(sim_id: str, cfg: dict, interpreted_params: dict) -> None:
             "interpreted_params": interpreted_params,
         }
         abm_simulation_store[sim_id] = record
-        _save_simulation(sim_id, "abm", cfg, record)
+        size_bytes = _save_simulation(sim_id, "abm", cfg, record, cache_key=key)
+        result_cache.put(key, sim_id, record, size_bytes)
+    except Exception as exc:
+        _fail_abm_job(sim_id, exc)
+
+
+def _run_variant_job(sim_id: str, cfgs: List[dict], names: List[str], interpreted: List[dict]) -> None:
+    """Executed in a ThreadPoolExecutor thread: one common-random-numbers batch."""
+    try:
+        result = run_abm_variants(cfgs, names, simulation_id=sim_id)
+        record = {
+            "status":            "completed",
+            "results":           result,
+            "config":            cfgs[0],
+            "variants":          [dict(cfg, name=name) for cfg, name in zip(cfgs, names)],
+            "interpreted_params": interpreted,
+        }
+        abm_simulation_store[sim_id] = record
+        _save_simulation(sim_id, "abm_variants", cfgs[0], record)
     except Exception as exc:
-        _progress[sim_id] = {
-            "status":     "error",
-            "steps_done": 0,
-            "total_steps": 0,
-            "pct":        0,
-            "error":      str(exc),
+        _fail_abm_job(sim_id, exc)
+
+
+def _snapshot_id(base_cfg: dict, fork_step: int, seed: int) -> str:
+    """Content key of one seed's checkpoint: prefix config, seed and step."""
+    prefix = {
+        k: v for k, v in base_cfg.items()
+        if k not in ("n_steps", "n_runs", "max_runs", "target_ci95", "target_metric")
+    }
+    return cache_key({**prefix, "seed": seed, "snapshot_step": fork_step})
+
+
+def _run_fork_job(
+    sim_id: str,
+    cfgs: List[dict],
+    names: List[str],
+    fork_step: int,
+    interpreted: List[dict],
+) -> None:
+    """Executed on the ABM scheduler: one prefix per seed, every branch forked from it."""
+    def load(seed: int) -> Optional[bytes]:
+        return snapshot_store.get(_snapshot_id(cfgs[0], fork_step, seed))
+
+    def save(seed: int, blob: bytes) -> None:
+        snapshot_store.put(_snapshot_id(cfgs[0], fork_step, seed), blob, fork_step, seed)
+
+    try:
+        result = run_abm_fork(cfgs, names, fork_step, load, save, simulation_id=sim_id)
+        record = {
+            "status":            "completed",
+            "results":           result,
+            "config":            cfgs[0],
+            "branches":          [dict(cfg, name=name) for cfg, name in zip(cfgs, names)],
+            "interpreted_params": interpreted,
         }
-        abm_simulation_store[sim_id] = {"status": "failed", "error": str(exc)}
+        abm_simulation_store[sim_id] = record
+        _save_simulation(sim_id, "abm_fork", cfgs[0], record)
+    except Exception as exc:
+        _fail_abm_job(sim_id, exc)
+
+
+def _run_sweep_job(
+    sim_id: str,
+    cfgs: List[dict],
+    variants: List[dict],
+    weights: dict,
+) -> None:
+    """Executed in a ThreadPoolExecutor thread: one deduplicated, ranked sweep.
+
+    ``cfgs`` are the unique effective configs, baseline first; each entry of
+    ``variants`` names the requested variant and the index of its run.
+    """
+    try:
+        names = ["baseline"] + [
+            next(v["name"] for v in variants if v["run"] == idx)
+            for idx in range(1, len(cfgs))
+        ]
+        batch = run_abm_variants(cfgs, names, simulation_id=sim_id, publish=False)
+        summaries = batch["variants"]
+        paired = [None] + batch["paired_vs_baseline"]
+        entries = []
+        for variant in variants:
+            run = variant["run"]
+            entry = {**variant, **summaries[run], "name": variant["name"]}
+            if paired[run] is not None:
+                entry["paired_vs_baseline"] = {
+                    "mean_final": paired[run]["mean_final"],
+                    "ci95_final": paired[run]["ci95_final"],
+                }
+            entries.append(entry)
+        result = {
+            "seed":          batch["seed"],
+            "n_runs":        batch["n_runs"],
+            "n_steps":       batch["n_steps"],
+            "weights":       weights,
+            "n_variants":    len(variants),
+            "n_unique_runs": len(cfgs),
+            "baseline":      summaries[0],
+            "ranked":        rank_variants(entries, weights),
+        }
+        record = {
+            "status":   "completed",
+            "results":  result,
+            "config":   cfgs[0],
+            "variants": variants,
+        }
+        abm_simulation_store[sim_id] = record
+        _save_simulation(sim_id, "abm_sweep", cfgs[0], record)
+        publish_complete(sim_id, result, _progress[sim_id]["total_steps"])
+    except Exception as exc:
+        _fail_abm_job(sim_id, exc)
+
+
+def _run_scheduled(sim_id: str, job, *args) -> None:
+    """Scheduler entry point: run ``job`` with DELETE-able cancellation."""
+    event = abm_scheduler.cancel_event(sim_id)
+    if event is not None:
+        watch_cancel(sim_id, event)
+    try:
+        job(sim_id, *args)
+    finally:
+        unwatch_cancel(sim_id)
+
+
+def _submit_abm_job(request: Request, sim_id: str, priority: int, total_steps: int, job, *args) -> int:
+    """Queue an ABM job for the requesting client; return its queue position.
+
+    The client is the X-Client-Id header, else the peer address.
+    """
+    client_id = request.headers.get("x-client-id") or (
+        request.client.host if request.client else "anonymous"
+    )
+    # Seed the progress store before queueing so the first poll returns something
+    _progress[sim_id] = {
+        "status":      "queued",
+        "steps_done":  0,
+        "total_steps": total_steps,
+        "pct":         0.0,
+    }
+    try:
+        return abm_scheduler.submit(
+            sim_id, _run_scheduled, sim_id, job, *args,
+            priority=priority, client_id=client_id,
+        )
+    except SchedulerFull as exc:
+        _progress.pop(sim_id, None)
+        raise HTTPException(status_code=429, detail=str(exc), headers={"Retry-After": "5"})
+
+
+def _fail_abm_job(sim_id: str, exc: Exception) -> None:
+    if isinstance(exc, RunCancelled):
+        discard_run(sim_id)
+        abm_simulation_store[sim_id] = {"status": "cancelled"}
+        return
+    _progress[sim_id] = {
+        "status":     "error",
+        "steps_done": 0,
+        "total_steps": 0,
+        "pct":        0,
+        "error":      str(exc),
+    }
+    abm_simulation_store[sim_id] = {"status": "failed", "error": str(exc)}
+    run_notifier.notify(sim_id)
 
 
 # Ã¢â€â‚¬Ã¢â€â‚¬ Endpoints Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬
@@ -273,7 +602,12 @@ async def start_simulation(config: SimulationConfig):
 
 
 @app.get("/results/{simulation_id}")
-async def get_results(simulation_id: str):
+async def get_results(simulation_id: str, since_step: Optional[int] = None):
+    # 0. Delta poll: progress + only the frames after since_step
+    if since_step is not None:
+        frames = get_live_frames(simulation_id, max(0, since_step))
+        if frames:
+            return frames
     # 1. Live partial results (simulation still running in background thread)
     live = get_live_results(simulation_id)
     if live:
@@ -290,19 +624,20 @@ async def get_results(simulation_id: str):
 
 # Ã¢â€â‚¬Ã¢â€â‚¬ ABM multi-seed model Ã¢â‚¬â€ Fix 1: non-blocking, returns immediately Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬Ã¢â€â‚¬
 
-@app.post("/abm/simulate")
-async def run_abm_simulation(config: ABMSimulationConfig):
-    """Start a background ABM run and return the simulation_id immediately.
-
-    The simulation executes in a ThreadPoolExecutor thread with per-step
-    time.sleep() pauses. The event loop is never blocked, so concurrent
-    GET /abm/simulate/{id}/progress and GET /results/{id} requests are served
-    in real time while the ABM is still computing.
-
-    V2: run_in_executor is called Ã¢â‚¬â€ simulation is NOT awaited inline.
-    """
-    simulation_id = str(uuid.uuid4())
+def _effective_abm_config(config: ABMSimulationConfig) -> tuple[dict, dict]:
+    """Validated run config with interpret_scenario() overrides applied."""
+    if config.target_metric not in ALL_METRICS:
+        raise HTTPException(status_code=422, detail=f"target_metric must be one of {ALL_METRICS}")
+    if config.n_districts < 1 or (config.n_districts > 1 and config.engine != "mesa"):
+        raise HTTPException(status_code=422, detail="n_districts must be 1, or > 1 with engine='mesa'")
     cfg = config.dict()
+    if config.metrics is not None:
+        try:
+            metrics = resolve_metrics(config.metrics)
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+        # Canonical order, and "all of them" keys like the default.
+        cfg["metrics"] = None if metrics == ALL_METRICS else metrics
 
     # Scenario interpretation
     interpreted_params: dict = {}
@@ -311,34 +646,242 @@ async def run_abm_simulation(config: ABMSimulationConfig):
         for key, value in interpreted_params.items():
             cfg[key] = value
     cfg["scenario"] = config.scenario or ""
+    return cfg, interpreted_params
 
-    # Seed the progress store immediately so the first poll returns something
-    _progress[simulation_id] = {
-        "status":      "running",
-        "steps_done":  0,
-        "total_steps": config.n_steps * config.n_runs,
-        "pct":         0.0,
-    }
 
-    # V2: fire-and-forget into thread pool Ã¢â‚¬â€ endpoint returns immediately
-    loop = asyncio.get_event_loop()
-    loop.run_in_executor(
-        _executor,
-        _run_abm_job,
-        simulation_id,
-        cfg,
-        interpreted_params,
+@app.post("/abm/simulate")
+async def run_abm_simulation(config: ABMSimulationConfig, request: Request):
+    """Start a background ABM run and return the simulation_id immediately.
+
+    The simulation is queued on the ABM scheduler as an interactive job and
+    executes in one of its worker threads at full speed.
+    The event loop is never blocked, and GET /abm/simulate/{id}/progress,
+    GET /results/{id} and the stream reveal one step every step_delay_ms,
+    so clients still watch the run unfold after the compute has finished.
+
+    V2: the job is queued Ã¢â‚¬â€ simulation is NOT awaited inline.
+
+    An effective config that was already simulated (same cache key) is
+    answered from the result cache instead: the response carries a fresh
+    simulation_id, ``cache_hit: true``, the original run's id as
+    ``cached_from`` and the results, and the frames are replayed under the
+    new id so progress / stream clients work unchanged.
+    """
+    cfg, interpreted_params = _effective_abm_config(config)
+
+    # Result cache: identical effective config -> stored result, no re-run
+    key = cache_key(cfg)
+    cached = result_cache.get(key) if config.use_cache else None
+    if cached is not None:
+        # Replay under a new id so the original run's frames stay untouched
+        cached_from, record = cached
+        simulation_id = str(uuid.uuid4())
+        abm_simulation_store[simulation_id] = record
+        replay_result(simulation_id, record["results"])
+        return {
+            "simulation_id":      simulation_id,
+            "status":             "completed",
+            "cache_hit":          True,
+            "cached_from":        cached_from,
+            "interpreted_params": interpreted_params,
+            "results":            record["results"],
+        }
+
+    simulation_id = str(uuid.uuid4())
+    # V2: fire-and-forget onto the scheduler Ã¢â‚¬â€ endpoint returns immediately
+    position = _submit_abm_job(
+        request, simulation_id, INTERACTIVE, config.n_steps * config.n_runs,
+        _run_abm_job, cfg, interpreted_params, key,
     )
 
     # Return ONLY the sim_id Ã¢â‚¬â€ no results yet (they stream via polling)
     return {
         "simulation_id":    simulation_id,
         "status":           "started",
+        "cache_hit":        False,
+        "queue_position":   position,
         "interpreted_params": interpreted_params,
         # NOTE: no "results" key Ã¢â‚¬â€ frontend must poll, not read inline
     }
 
 
+@app.post("/abm/variants")
+async def run_abm_variant_batch(batch: ABMVariantBatch, request: Request):
+    """Start a common-random-numbers batch: ``base`` plus each of ``variants``.
+
+    Every variant runs the same replicate seeds as the base, so the
+    ``paired_vs_baseline`` differences in the result need far fewer seeds
+    to rank variants than independent /abm/simulate runs.  Poll
+    /abm/simulate/{id}/progress and read /abm/results/{id} as for a run.
+    """
+    if not batch.variants:
+        raise HTTPException(status_code=422, detail="variants must not be empty")
+    if batch.base.n_districts != 1:
+        raise HTTPException(status_code=422, detail="variant batches run single-district models only (n_districts=1)")
+    base = batch.base.dict()
+    configs = [batch.base] + [
+        ABMSimulationConfig(**{
+            **base,
+            **variant.dict(exclude={"name"}, exclude_none=True),
+        })
+        for variant in batch.variants
+    ]
+    effective = [_effective_abm_config(config) for config in configs]
+    cfgs = [cfg for cfg, _ in effective]
+    interpreted = [params for _, params in effective]
+    names = ["baseline"] + [variant.name for variant in batch.variants]
+
+    simulation_id = str(uuid.uuid4())
+    position = _submit_abm_job(
+        request, simulation_id, BULK, batch.base.n_steps * batch.base.n_runs * len(cfgs),
+        _run_variant_job, cfgs, names, interpreted,
+    )
+    return {
+        "simulation_id":      simulation_id,
+        "status":             "started",
+        "queue_position":     position,
+        "variants":           names,
+        "interpreted_params": interpreted,
+    }
+
+
+@app.post("/abm/fork")
+async def run_abm_fork_batch(fork: ABMForkRequest, request: Request):
+    """Run ``base`` to ``fork_step`` once per seed, then each branch from there.
+
+    Branches change levers and/or scenario text (interpreted as for
+    /abm/simulate) from ``fork_step`` on; the prefix is computed once, not
+    once per branch.  The checkpoint of every seed at ``fork_step`` is kept
+    in the snapshot store, so a later fork of the same prefix skips it
+    entirely.  Mesa engine only.  Follow progress as for a variant batch.
+    """
+    if not fork.branches:
+        raise HTTPException(status_code=422, detail="branches must not be empty")
+    if fork.base.engine != "mesa":
+        raise HTTPException(status_code=422, detail="forking needs engine='mesa'")
+    if fork.base.n_districts != 1:
+        raise HTTPException(status_code=422, detail="forking runs single-district models only (n_districts=1)")
+    if not 0 < fork.fork_step < fork.base.n_steps:
+        raise HTTPException(
+            status_code=422,
+            detail=f"fork_step must be between 1 and n_steps - 1 ({fork.base.n_steps - 1})",
+        )
+    base = fork.base.dict()
+    configs = [fork.base] + [
+        ABMSimulationConfig(**{**base, **branch.dict(exclude={"name"}, exclude_none=True)})
+        for branch in fork.branches
+    ]
+    effective = [_effective_abm_config(config) for config in configs]
+    cfgs = [cfg for cfg, _ in effective]
+    interpreted = [params for _, params in effective]
+    names = ["baseline"] + [branch.name for branch in fork.branches]
+    try:
+        overrides = [fork_overrides(cfgs[0], cfg) for cfg in cfgs]
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    n_steps, n_runs = fork.base.n_steps, fork.base.n_runs
+    simulation_id = str(uuid.uuid4())
+    position = _submit_abm_job(
+        request, simulation_id, BULK,
+        n_runs * (fork.fork_step + len(cfgs) * (n_steps - fork.fork_step)),
+        _run_fork_job, cfgs, names, fork.fork_step, interpreted,
+    )
+    return {
+        "simulation_id":      simulation_id,
+        "status":             "started",
+        "queue_position":     position,
+        "fork_step":          fork.fork_step,
+        "branches":           names,
+        "overrides":          overrides,
+        "interpreted_params": interpreted,
+    }
+
+
+@app.get("/abm/snapshots")
+async def abm_snapshot_stats():
+    """Snapshot-store occupancy and warm-start hit counters."""
+    return snapshot_store.stats()
+
+
+# Upper bound on requested variants (named + grid points) in one sweep.
+_SWEEP_MAX_VARIANTS = 256
+
+
+@app.post("/abm/sweep")
+async def run_abm_sweep(sweep: ABMSweepRequest, request: Request):
+    """Start a parameter sweep as one job and rank the variants server-side.
+
+    ``variants`` and the cartesian product of ``grid`` are applied on top of
+    ``base``.  Variants whose effective config is identical (same cache
+    key) — to each other or to the base — share one run, so only unique
+    configs are simulated.  They run as a single common-random-numbers batch
+    at full speed under one simulation_id: follow it on
+    /abm/simulate/{id}/stream or /progress.  The result ranks every
+    requested variant by the weighted composite score of its metric deltas
+    (see abm_sweep.composite_score).
+    """
+    if sweep.base.n_districts != 1:
+        raise HTTPException(status_code=422, detail="sweeps run single-district models only (n_districts=1)")
+    lever_fields = set(ABMVariant(name="").dict()) - {"name"}
+    unknown = sorted(set(sweep.grid) - lever_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"grid keys must be among {sorted(lever_fields)}, got {unknown}",
+        )
+    requested = list(sweep.variants) + [
+        ABMVariant(name=variant_name(point), **point) for point in expand_grid(sweep.grid)
+    ]
+    if not requested:
+        raise HTTPException(status_code=422, detail="variants or grid must not be empty")
+    if len(requested) > _SWEEP_MAX_VARIANTS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"sweep has {len(requested)} variants; the limit is {_SWEEP_MAX_VARIANTS}",
+        )
+
+    base = sweep.base.dict()
+    if base["metrics"] is not None:
+        # Ranking reads these whatever else the caller asked for.
+        base["metrics"] = list(base["metrics"]) + list(RANKING_METRICS)
+    base_cfg, _ = _effective_abm_config(ABMSimulationConfig(**base))
+    cfgs, run_of_key = [base_cfg], {cache_key(base_cfg): 0}
+    variants = []
+    for variant in requested:
+        cfg, interpreted = _effective_abm_config(ABMSimulationConfig(**{
+            **base,
+            **variant.dict(exclude={"name"}, exclude_none=True),
+        }))
+        key = cache_key(cfg)
+        if key not in run_of_key:
+            run_of_key[key] = len(cfgs)
+            cfgs.append(cfg)
+        variants.append({
+            "name":               variant.name,
+            "scenario":           cfg["scenario"],
+            "run":                run_of_key[key],
+            "interpreted_params": interpreted,
+        })
+
+    simulation_id = str(uuid.uuid4())
+    steps_per_run = sweep.base.n_steps * sweep.base.n_runs
+    position = _submit_abm_job(
+        request, simulation_id, BULK, steps_per_run * len(cfgs),
+        _run_sweep_job, cfgs, variants, sweep.weights.dict(),
+    )
+    return {
+        "simulation_id":  simulation_id,
+        "status":         "started",
+        "queue_position": position,
+        "n_variants":    len(variants),
+        "n_unique_runs": len(cfgs),
+        # Runs execute in order, each taking steps_per_run progress steps.
+        "steps_per_run": steps_per_run,
+        "variants":      variants,
+    }
+
+
 @app.get("/abm/results/{simulation_id}")
 async def get_abm_results(simulation_id: str):
     if simulation_id in abm_simulation_store:
@@ -349,9 +892,180 @@ async def get_abm_results(simulation_id: str):
     raise HTTPException(status_code=404, detail="ABM simulation not found")
 
 
+@app.get("/abm/cache")
+async def abm_cache_stats():
+    """Result-cache counters and memory-tier occupancy."""
+    return result_cache.stats()
+
+
 @app.get("/abm/simulate/{simulation_id}/progress")
 async def abm_progress(simulation_id: str):
-    return get_progress(simulation_id)
+    progress = get_progress(simulation_id)
+    position = abm_scheduler.position(simulation_id)
+    if position is not None:
+        return {**progress, "status": "queued", "queue_position": position}
+    return progress
+
+
+@app.delete("/abm/simulate/{simulation_id}")
+async def cancel_abm_simulation(simulation_id: str):
+    """Cancel a queued or running ABM job (simulation, variant batch or sweep).
+
+    A queued job is dropped at once.  A running one stops cooperatively
+    before its next model step; its live state is then released and its
+    progress reports ``cancelled``.  A run whose compute has finished but
+    whose frames are still being revealed (display pacing) is stopped the
+    same way: pacing and live state are dropped at once.  With shared run
+    state, a job owned by another service worker is flagged and stops at
+    its next step check.
+    """
+    state = abm_scheduler.cancel(simulation_id)
+    if state is None:
+        status = get_progress(simulation_id)["status"]
+        if status == "unknown":
+            raise HTTPException(status_code=404, detail="ABM simulation not found")
+        if status == "running" and (_progress.get(simulation_id) or {}).get("status") == "complete":
+            # Only pacing is left: no job or step loop will see a cancel flag.
+            discard_run(simulation_id)
+            return {"simulation_id": simulation_id, "status": "cancelled"}
+        if SHARED_STATE and status in ("queued", "running"):
+            request_cancel(simulation_id)
+            return {"simulation_id": simulation_id, "status": "cancelling"}
+        return {"simulation_id": simulation_id, "status": status}
+    if state == "queued":
+        discard_run(simulation_id)
+        abm_simulation_store[simulation_id] = {"status": "cancelled"}
+        return {"simulation_id": simulation_id, "status": "cancelled"}
+    return {"simulation_id": simulation_id, "status": "cancelling"}
+
+
+@app.get("/stats/memory")
+async def memory_stats():
+    """Byte accounting of every in-process store and the result cache.
+
+    Stores kept in the shared SQLite run state report their on-disk bytes
+    and are left out of ``total_bytes``.
+    """
+    stores = {
+        **run_store_stats(),
+        simulation_store.name:     simulation_store.stats(),
+        abm_simulation_store.name: abm_simulation_store.stats(),
+    }
+    cache = result_cache.stats()
+    return {
+        "total_bytes":  sum(
+            s["bytes"] for s in stores.values() if s.get("backend") != "sqlite"
+        ) + cache["memory_bytes"],
+        "stores":       stores,
+        "result_cache": cache,
+    }
+
+
+@app.get("/abm/scheduler")
+async def abm_scheduler_stats():
+    """Worker occupancy and queue length of this service worker's ABM scheduler."""
+    return abm_scheduler.stats()
+
+
+# Frames per SSE "frames" event; a consumer that fell further behind gets
+# the backlog over several events instead of one unbounded message.
+_STREAM_MAX_FRAMES = 500
+# Comment line sent on idle streams so proxies keep the connection open.
+_STREAM_HEARTBEAT_S = 15.0
+# run_notifier only wakes streams in the worker that runs the job; with
+# shared run state, streams served by other workers poll this often.
+_STREAM_SHARED_POLL_S = 0.25
+
+
+def _sse(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _abm_event_stream(simulation_id: str, since_step: int):
+    """Yield SSE events for one run until it completes or fails.
+
+    Woken by run_notifier after every step; each wake-up sends all frames
+    produced since the last event, so a slow consumer receives bigger
+    batches rather than holding back the simulation thread.  Runs without
+    a frame log (variant batches, sweeps) send ``progress`` events instead.
+    Every ``frames`` event carries its ``next_since_step`` as the SSE id, so
+    a reconnecting EventSource resumes from it via Last-Event-ID.
+    """
+    waiter = run_notifier.subscribe(simulation_id)
+    _, wake = waiter
+    cursor = since_step
+    last_steps = None
+    idle_s = 0.0
+    try:
+        while True:
+            wake.clear()
+            progress = get_progress(simulation_id)
+            payload = get_live_frames(simulation_id, cursor, limit=_STREAM_MAX_FRAMES)
+            if payload is None and progress["status"] == "complete":
+                live = _live_results.get(simulation_id) or {}
+                yield _sse("complete", {**progress, "results": live.get("results")})
+                return
+            if payload is None and progress["status"] == "running" \
+                    and progress["steps_done"] != last_steps:
+                last_steps = progress["steps_done"]
+                yield _sse("progress", progress)
+            if payload is not None and payload["next_since_step"] > cursor:
+                results = payload.pop("results", None)
+                cursor = payload["next_since_step"]
+                yield _sse("frames", payload, event_id=cursor)
+                if results is not None:
+                    yield _sse("complete", {**progress, "results": results})
+                    return
+                continue
+            if progress["status"] in ("error", "cancelled"):
+                yield _sse(progress["status"], progress)
+                return
+            if payload is not None and "results" in payload:
+                yield _sse("complete", {**progress, "results": payload["results"]})
+                return
+            # Computed frames held back by display pacing are due at a known
+            # time; wake for them as well as for new steps.
+            reveal = reveal_delay(simulation_id)
+            timeout = _STREAM_HEARTBEAT_S if reveal is None else min(reveal, _STREAM_HEARTBEAT_S)
+            if SHARED_STATE:
+                timeout = min(timeout, _STREAM_SHARED_POLL_S)
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=timeout)
+                idle_s = 0.0
+            except asyncio.TimeoutError:
+                idle_s = 0.0 if reveal is not None else idle_s + timeout
+                if idle_s >= _STREAM_HEARTBEAT_S:
+                    idle_s = 0.0
+                    yield ": keep-alive\n\n"
+    finally:
+        run_notifier.unsubscribe(simulation_id, waiter)
+
+
+@app.get("/abm/simulate/{simulation_id}/stream")
+async def abm_stream(
+    simulation_id: str,
+    since_step: int = 0,
+    last_event_id: Optional[str] = Header(None),
+):
+    """Server-Sent Events push channel for a running ABM simulation.
+
+    Replaces polling /progress + /results: emits ``frames`` events (progress
+    plus the new step frames, same shape as /results?since_step=N),
+    then one ``complete`` event carrying the final aggregate, or ``error``.
+    Reconnect with ``since_step`` set to the last ``next_since_step`` seen;
+    a ``Last-Event-ID`` header (sent by EventSource on its own reconnects)
+    takes precedence over ``since_step``.
+    """
+    if get_progress(simulation_id)["status"] == "unknown":
+        raise HTTPException(status_code=404, detail="ABM simulation not found")
+    if last_event_id is not None and last_event_id.strip().isdigit():
+        since_step = int(last_event_id)
+    return StreamingResponse(
+        _abm_event_stream(simulation_id, max(0, since_step)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.get("/simulations")
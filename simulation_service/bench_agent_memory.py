@@ -0,0 +1,82 @@
+"""Memory per agent for each ABM storage mode.
+
+Builds one model per mode — Mesa agents, compact (array-backed) agents and
+the NumPy engine — at the same population, optionally steps it, and
+reports the Python heap it holds (tracemalloc) divided by its agent count
+(workers + firms + households).
+
+    python bench_agent_memory.py --workers 100000 --steps 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+try:
+    from .abm_model import CivicABMModel
+    from .abm_vectorized import VectorizedCivicABMModel
+except ImportError:
+    from abm_model import CivicABMModel
+    from abm_vectorized import VectorizedCivicABMModel
+
+MODES = {
+    "mesa":    lambda **kw: CivicABMModel(agent_storage="mesa", **kw),
+    "compact": lambda **kw: CivicABMModel(agent_storage="compact", **kw),
+    "numpy":   lambda **kw: VectorizedCivicABMModel(**kw),
+}
+
+
+def measure(mode: str, n_workers: int, n_firms: int, n_households: int, n_steps: int) -> dict:
+    """Heap held by one model of ``mode`` after construction and ``n_steps`` steps."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    model = MODES[mode](
+        n_workers=n_workers, n_firms=n_firms, n_households=n_households,
+        seed=0, record_capacity=max(1, n_steps),
+    )
+    built = time.perf_counter()
+    for _ in range(n_steps):
+        model.step()
+    finished = time.perf_counter()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n_agents = n_workers + n_firms + n_households
+    del model
+    return {
+        "mode":            mode,
+        "agents":          n_agents,
+        "bytes":           current,
+        "bytes_per_agent": current / n_agents,
+        "peak_bytes":      peak,
+        "build_s":         built - started,
+        "step_s":          (finished - built) / n_steps if n_steps else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=50_000)
+    parser.add_argument("--firms", type=int, default=None, help="default: workers / 50")
+    parser.add_argument("--households", type=int, default=None, help="default: workers * 3 / 8")
+    parser.add_argument("--steps", type=int, default=0)
+    parser.add_argument("--modes", nargs="+", choices=sorted(MODES), default=list(MODES))
+    args = parser.parse_args()
+    n_firms = args.firms if args.firms is not None else max(1, args.workers // 50)
+    n_households = args.households if args.households is not None else args.workers * 3 // 8
+
+    print(f"{'mode':<8} {'agents':>9} {'bytes/agent':>12} {'held MB':>9} {'peak MB':>9} "
+          f"{'build s':>8} {'step s':>8}")
+    for mode in args.modes:
+        r = measure(mode, args.workers, n_firms, n_households, args.steps)
+        print(f"{r['mode']:<8} {r['agents']:>9} {r['bytes_per_agent']:>12.1f} "
+              f"{r['bytes'] / 1e6:>9.1f} {r['peak_bytes'] / 1e6:>9.1f} "
+              f"{r['build_s']:>8.2f} {r['step_s']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,49 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
 from model import CivicModel
 import pandas as pd
 import concurrent.futures
 
+# Description keywords -> adjustments to the legacy CivicModel levers,
+# checked in order (a later strictness rule wins).
+_DESCRIPTION_RULES = (
+    (("infra", "road", "bridge", "construction"), "infra_spending", 50000),
+    (("subsidy", "cash", "poor"), "subsidy", 200),
+    (("education", "school", "training"), "training_budget", 20000),
+    (("job", "employment", "work"), "job_creation_rate", 0.05),
+)
+_STRICTNESS_RULES = (
+    (("strict", "police"), 0.9),
+    (("relaxed", "freedom"), 0.2),
+)
+
+
+@dataclass(frozen=True)
+class DescriptionProfile:
+    """What a free-text description changes, compiled once per distinct text."""
+    increments: Tuple[Tuple[str, float], ...] = ()
+    strictness: Optional[float] = None
+
+
+@lru_cache(maxsize=256)
+def compile_description(description):
+    """Simple heuristic parser: scan the description once per distinct text."""
+    if not description:
+        return DescriptionProfile()
+    desc_lower = description.lower()
+    increments = tuple(
+        (field, amount) for keywords, field, amount in _DESCRIPTION_RULES
+        if any(k in desc_lower for k in keywords)
+    )
+    strictness = None
+    for keywords, value in _STRICTNESS_RULES:
+        if any(k in desc_lower for k in keywords):
+            strictness = value
+    return DescriptionProfile(increments, strictness)
+
+
 def run_single_simulation(config):
     """
     Runs a single simulation based on config and returns the results.
@@ -13,35 +55,24 @@ def run_single_simulation(config):
     description = config.get('description', '')
     
     # Default values
+    levers = {
+        'infra_spending': config.get('infra_spending', 0),
+        'subsidy': config.get('subsidy', 0),
+        'training_budget': config.get('training_budget', 0),
+        'job_creation_rate': config.get('job_creation_rate', 0.05),
+    }
     strictness = config.get('strictness', 0.5)
-    infra_spending = config.get('infra_spending', 0)
-    subsidy = config.get('subsidy', 0)
-    training_budget = config.get('training_budget', 0)
-    job_creation_rate = config.get('job_creation_rate', 0.05)
-    
-    if description:
-        # Simple heuristic parser
-        desc_lower = description.lower()
-        if "infra" in desc_lower or "road" in desc_lower or "bridge" in desc_lower or "construction" in desc_lower:
-            infra_spending += 50000
-        if "subsidy" in desc_lower or "cash" in desc_lower or "poor" in desc_lower:
-            subsidy += 200
-        if "education" in desc_lower or "school" in desc_lower or "training" in desc_lower:
-            training_budget += 20000
-        if "job" in desc_lower or "employment" in desc_lower or "work" in desc_lower:
-            job_creation_rate += 0.05
-        if "strict" in desc_lower or "police" in desc_lower:
-            strictness = 0.9
-        if "relaxed" in desc_lower or "freedom" in desc_lower:
-            strictness = 0.2
+
+    profile = compile_description(description)
+    for field, amount in profile.increments:
+        levers[field] += amount
+    if profile.strictness is not None:
+        strictness = profile.strictness
 
     model = CivicModel(
         N=N, 
         strictness=strictness,
-        infra_spending=infra_spending,
-        subsidy=subsidy,
-        training_budget=training_budget,
-        job_creation_rate=job_creation_rate
+        **levers
     )
     
     for i in range(steps):
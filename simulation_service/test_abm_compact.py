@@ -0,0 +1,28 @@
+"""Compact agent storage of the Mesa engine (run with pytest)."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+try:
+    from .abm_model import CivicABMModel
+except ImportError:
+    from abm_model import CivicABMModel
+
+POPULATION = dict(n_workers=200, n_firms=8, n_households=70)
+
+
+def _run_model(n_steps: int, agent_storage: str) -> CivicABMModel:
+    model = CivicABMModel(seed=5, record_capacity=n_steps, agent_storage=agent_storage, **POPULATION)
+    for _ in range(n_steps):
+        model.step()
+    return model
+
+
+@pytest.mark.parametrize("n_steps", [1, 25])
+def test_compact_storage_matches_mesa_agents(n_steps):
+    mesa = _run_model(n_steps, "mesa")
+    compact = _run_model(n_steps, "compact")
+
+    np.testing.assert_array_equal(compact.recorder.view(), mesa.recorder.view())
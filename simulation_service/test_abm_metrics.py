@@ -0,0 +1,23 @@
+"""Metric selection of ABM runs (run with pytest)."""
+
+from __future__ import annotations
+
+import pytest
+
+try:
+    from .abm_runner import run_abm_multi_seed
+except ImportError:
+    from abm_runner import run_abm_multi_seed
+
+RUN = dict(n_workers=200, n_firms=8, n_households=70, n_steps=12, n_runs=3, seed=11, step_delay_ms=0)
+
+
+@pytest.mark.parametrize("engine", ["mesa", "numpy"])
+@pytest.mark.parametrize("metrics", [["avg_income"], ["env_score", "migration_count"], ["avg_welfare"]])
+def test_metric_selection_keeps_recorded_values(engine, metrics):
+    full = run_abm_multi_seed({**RUN, "engine": engine})
+    selected = run_abm_multi_seed({**RUN, "engine": engine, "metrics": metrics})
+
+    assert set(metrics) <= set(selected["mean_by_step"])
+    for name, series in selected["mean_by_step"].items():
+        assert series == full["mean_by_step"][name]
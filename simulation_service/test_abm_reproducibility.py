@@ -0,0 +1,24 @@
+"""Bit-identity guarantees of the ABM engines (run with pytest)."""
+
+from __future__ import annotations
+
+try:
+    from .abm_runner import run_abm_multi_seed, shutdown_process_pool
+except ImportError:
+    from abm_runner import run_abm_multi_seed, shutdown_process_pool
+
+RUN = dict(n_workers=200, n_firms=8, n_households=70, n_steps=12, n_runs=3, seed=11, step_delay_ms=0)
+
+
+def test_seed_gives_same_runs_in_thread_process_and_ensemble():
+    try:
+        thread = run_abm_multi_seed({**RUN, "engine": "numpy"})
+        process = run_abm_multi_seed({**RUN, "engine": "numpy", "execution": "process"})
+    finally:
+        shutdown_process_pool()
+    ensemble = run_abm_multi_seed({**RUN, "engine": "ensemble"})
+
+    assert [run["seed"] for run in thread["runs"]] == [run["seed"] for run in ensemble["runs"]]
+    for result in (process, ensemble):
+        assert result["mean_by_step"] == thread["mean_by_step"]
+        assert result["runs"] == thread["runs"]
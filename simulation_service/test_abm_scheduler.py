@@ -0,0 +1,63 @@
+"""Job scheduling and cancellation of ABM runs (run with pytest)."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+# app.py imports its modules flat, so the test must share those copies.
+import abm_runner
+import app as appmod
+from abm_scheduler import BULK, JobScheduler
+
+
+def _wait_for(condition, timeout_s: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(appmod, "DB_PATH", tmp_path / "results.db")
+    with TestClient(appmod.app) as c:
+        yield c
+
+
+def test_position_follows_dispatch_rules():
+    release = threading.Event()
+    scheduler = JobScheduler(max_workers=2, max_running_per_client=1, max_bulk_running=1)
+    try:
+        scheduler.submit("a1", release.wait, client_id="A")
+        _wait_for(lambda: scheduler.position("a1") is None)
+        scheduler.submit("b1", release.wait, client_id="B", priority=BULK)
+        _wait_for(lambda: scheduler.position("b1") is None)
+        # Both workers busy.  A's next job waits for a1, the bulk job for b1,
+        # so C's job (queued last) starts first.
+        scheduler.submit("a2", release.wait, client_id="A")
+        scheduler.submit("b2", release.wait, client_id="B", priority=BULK)
+        scheduler.submit("c1", release.wait, client_id="C")
+        assert scheduler.position("a2") == 1
+        assert scheduler.position("c1") == 2
+        assert scheduler.position("b2") == 3
+    finally:
+        release.set()
+        scheduler.shutdown()
+
+
+def test_delete_during_pacing_cancels_and_releases(client):
+    body = {"n_steps": 20, "n_runs": 1, "step_delay_ms": 500, "engine": "numpy", "use_cache": False}
+    sim_id = client.post("/abm/simulate", json=body).json()["simulation_id"]
+    # Compute finishes almost at once; pacing keeps the run "running".
+    _wait_for(lambda: (abm_runner._progress.get(sim_id) or {}).get("status") == "complete")
+    assert client.get(f"/abm/simulate/{sim_id}/progress").json()["status"] == "running"
+
+    assert client.delete(f"/abm/simulate/{sim_id}").json()["status"] == "cancelled"
+    assert client.get(f"/abm/simulate/{sim_id}/progress").json()["status"] == "cancelled"
+    assert sim_id not in abm_runner._pacing
+    assert abm_runner._frame_logs.get(sim_id) is None
+    assert abm_runner._live_results.peek(sim_id) is None
@@ -0,0 +1,32 @@
+"""Snapshot and restore of ABM models (run with pytest)."""
+
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from .abm_model import CivicABMModel
+    from .abm_snapshot import restore_model, snapshot_model
+except ImportError:
+    from abm_model import CivicABMModel
+    from abm_snapshot import restore_model, snapshot_model
+
+POPULATION = dict(n_workers=200, n_firms=8, n_households=70)
+
+
+def _run_model(n_steps: int) -> CivicABMModel:
+    model = CivicABMModel(seed=5, record_capacity=n_steps, **POPULATION)
+    for _ in range(n_steps):
+        model.step()
+    return model
+
+
+def test_restored_snapshot_continues_identically():
+    straight = _run_model(20)
+
+    model = _run_model(8)
+    restored = restore_model(snapshot_model(model), record_capacity=20)
+    for _ in range(12):
+        restored.step()
+
+    np.testing.assert_array_equal(restored.recorder.view(), straight.recorder.view())